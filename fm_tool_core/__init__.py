@@ -6,10 +6,22 @@ Exposes `run_flow` so callers can simply:
     from fm_tool_core import run_flow
 """
 
+import os
 from importlib import import_module
-
-# Lazy-import to keep package initialization fast
-process_mod = import_module(".process_fm_tool", package=__name__)
-run_flow = process_mod.run_flow
+from typing import Any
 
 __all__ = ["run_flow"]
+
+
+def __getattr__(name: str) -> Any:
+    # Lazy-import (PEP 562) to keep package initialization fast: the
+    # processing module is only loaded when `run_flow` is first accessed.
+    if name == "run_flow":
+        run_flow = import_module(".process_fm_tool", package=__name__).run_flow
+        globals()["run_flow"] = run_flow
+        return run_flow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if os.getenv("FM_EAGER_IMPORT") == "1":  # pragma: no cover - CI guard
+    __getattr__("run_flow")
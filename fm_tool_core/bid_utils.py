@@ -2,18 +2,22 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Sequence
 from itertools import chain
+from numbers import Number
 from pathlib import Path
 from typing import Any, Iterable
 
-from .constants import VISIBLE_EXCEL
-from .excel_utils import pythoncom, xw
+from .excel_utils import (
+    _XL_CALC_MANUAL,
+    _get_openpyxl,
+    _get_xw,
+    excel_session,
+)
 
 ###############################################################################
 # Column layout: 25 columns (A → Y)                                           #
 ###############################################################################
-_COLUMNS = [
+_COLUMNS: tuple[str, ...] = (
     "LANE_ID",
     "ORIG_CITY",
     "ORIG_ST",
@@ -39,93 +43,217 @@ _COLUMNS = [
     "ADHOC_INFO10",
     "FM_MILES",
     "FM_TOLLS",
-]
+)
 
-_REQUIRED = {
-    "LANE_ID",
-    "ORIG_POSTAL_CD",
-    "DEST_POSTAL_CD",
-}
+_REQUIRED: frozenset[str] = frozenset(
+    {
+        "LANE_ID",
+        "ORIG_POSTAL_CD",
+        "DEST_POSTAL_CD",
+    }
+)
 
 _TARGET_SHEET = "RFP"  # ← changed from “BID”
 _HEADER_SHEET = "BID"
+_XL_FORMULAS = -4123
+_XL_BY_ROWS = 1
+_XL_PREVIOUS = 2
+# Above this many rows the block goes through an ADO recordset instead
+_RECORDSET_MIN_ROWS = 5000
+_AD_DOUBLE = 5
+_AD_VAR_WCHAR = 202
+_AD_FLD_IS_NULLABLE = 0x20
+_HEADER_ROW = 6  # ADHOC_INFO column names
+_LABEL_ROW = 7  # custom labels shown to the user
+
+
+_DROP = str.maketrans("", "", "_ ")  # deletion table for header matching
+
+
+def _norm(val: object) -> str:
+    return str(val).strip().upper().translate(_DROP)
+
+
+def _match_adhoc_headers(
+    row: list[Any], adhoc_headers: dict[str, str], log: logging.Logger
+) -> list[tuple[int, str]]:
+    """
+    Return ``(column, label)`` pairs for header cells in *row* that match a
+    key of *adhoc_headers*. Unmatched keys are logged.
+
+    The keys are normalised once up front; each header cell then costs a
+    single ``_norm`` call and one dict lookup.
+    """
+    lookup = {_norm(k): (k, v) for k, v in adhoc_headers.items()}
+    get = lookup.get
+    matched: set[str] = set()
+    hits: list[tuple[int, str]] = []
+    for i, cell_val in enumerate(row):
+        key = _norm(cell_val)
+        hit = get(key)
+        if hit is not None:
+            hits.append((i + 1, hit[1]))
+            matched.add(key)
+
+    unmatched = [k for key, (k, _) in lookup.items() if key not in matched]
+    if unmatched:
+        log.info(
+            "No matching column for custom headers %s",
+            ", ".join(unmatched),
+        )
+    return hits
+
+
+def _write_headers_xlwings(
+    wb, wb_path: Path, adhoc_headers: dict[str, str], log: logging.Logger
+) -> None:
+    try:
+        ws = wb.sheets[_HEADER_SHEET]
+    except Exception:
+        log.error("%s sheet not found in %s", _HEADER_SHEET, wb_path)
+        return
+    last = (
+        ws.api.Cells(_HEADER_ROW, ws.api.Columns.Count)
+        .End(_get_xw().constants.Direction.xlToLeft)
+        .Column
+    )
+    header_rng = ws.range((_HEADER_ROW, 1)).resize(1, last)
+    # ndim=1 always yields a flat list for a single row, even one cell wide
+    row = header_rng.options(ndim=1).value
+
+    written: list[str] = []
+    for col, label in _match_adhoc_headers(row, adhoc_headers, log):
+        ws.range((_LABEL_ROW, col)).value = label
+        cell = ws.range((_HEADER_ROW, col))
+        written.append(cell.get_address(False, False))
+    if written:
+        log.info("Custom headers written to %s", ", ".join(written))
 
 
 def update_adhoc_headers(
-    wb_path: Path, adhoc_headers: dict[str, str], log: logging.Logger
+    wb_path: Path,
+    adhoc_headers: dict[str, str],
+    log: logging.Logger,
+    session: tuple[Any, Any] | None = None,
 ) -> None:
-    """Write custom ADHOC_INFO labels to row 7 of the BID sheet."""
+    """
+    Write custom ADHOC_INFO labels to row 7 of the BID sheet.
+
+    Reuses the workbook of an open ``excel_session`` when *session* is given.
+    """
     log.info("Received custom headers: %s", adhoc_headers)
     if not adhoc_headers:
         return
-    if xw is None:
+    if session is not None:
+        _write_headers_xlwings(session[1], wb_path, adhoc_headers, log)
+        return
+    if _get_xw() is None:
         log.error("xlwings is required for header updates")
         return
-    pythoncom.CoInitialize()
-    app = xw.App(visible=VISIBLE_EXCEL, add_book=False)  # type: ignore
-    app.api.DisplayAlerts = False
-    wb = None
-    try:
-        wb = app.books.open(str(wb_path))
-        try:
-            ws = wb.sheets[_HEADER_SHEET]
-        except Exception:
-            log.error("%s sheet not found in %s", _HEADER_SHEET, wb_path)
-            return
-        last = (
-            ws.api.Cells(6, ws.api.Columns.Count)
-            .End(xw.constants.Direction.xlToLeft)
-            .Column
+    with excel_session(wb_path) as (_app, wb):
+        _write_headers_xlwings(wb, wb_path, adhoc_headers, log)
+
+
+def _first_empty_row(ws) -> int:
+    """Openpyxl twin of ``Cells(Rows.Count, 1).End(xlUp).Row + 1``."""
+    row = ws.max_row
+    while row > 1 and ws.cell(row=row, column=1).value in (None, ""):
+        row -= 1
+    return row + 1
+
+
+def _extend_tables(ws, start_row: int, end_row: int) -> None:
+    """Resize tables ending just above *start_row* once to reach *end_row*."""
+    from openpyxl.utils import get_column_letter  # type: ignore
+    from openpyxl.utils.cell import range_boundaries  # type: ignore
+
+    for table in ws.tables.values():
+        min_col, min_row, max_col, max_row = range_boundaries(table.ref)
+        if min_col != 1 or max_row != start_row - 1:
+            continue
+        ref = (
+            f"{get_column_letter(min_col)}{min_row}:"
+            f"{get_column_letter(max_col)}{end_row}"
         )
-        header_rng = ws.range((6, 1)).resize(1, last)
-        values = header_rng.value
-        if isinstance(values, Sequence) and not isinstance(values, str):
-            outer = list(values)
-            nested = (
-                bool(outer)
-                and isinstance(outer[0], Sequence)
-                and not isinstance(outer[0], str)
+        table.ref = ref
+        if table.autoFilter is not None:
+            table.autoFilter.ref = ref
+
+
+def _write_headers_openpyxl(
+    ws, adhoc_headers: dict[str, str], log: logging.Logger
+) -> None:
+    from openpyxl.utils import get_column_letter  # type: ignore
+
+    row = [c.value for c in ws[_HEADER_ROW]]
+    written: list[str] = []
+    for col, label in _match_adhoc_headers(row, adhoc_headers, log):
+        ws.cell(row=_LABEL_ROW, column=col, value=label)
+        written.append(f"{get_column_letter(col)}{_HEADER_ROW}")
+    if written:
+        log.info("Custom headers written to %s", ", ".join(written))
+
+
+def _insert_rows_openpyxl(
+    wb_path: Path,
+    data: list[list[Any]],
+    log: logging.Logger,
+    adhoc_headers: dict[str, str] | None,
+) -> None:
+    """Append *data* to the RFP sheet by editing the file directly."""
+    wb = _get_openpyxl().load_workbook(
+        wb_path, keep_vba=wb_path.suffix.lower() == ".xlsm"
+    )
+    try:
+        if adhoc_headers:
+            log.info("Received custom headers: %s", adhoc_headers)
+            if _HEADER_SHEET in wb.sheetnames:
+                _write_headers_openpyxl(wb[_HEADER_SHEET], adhoc_headers, log)
+            else:
+                log.error("%s sheet not found in %s", _HEADER_SHEET, wb_path)
+
+        if _TARGET_SHEET not in wb.sheetnames:
+            log.error("%s sheet not found in %s", _TARGET_SHEET, wb_path)
+        else:
+            ws = wb[_TARGET_SHEET]
+            start_row = _first_empty_row(ws)
+            if start_row > ws.max_row:
+                # Nothing below the data: append streams whole rows
+                append = ws.append
+                for values in data:
+                    append(values)
+            else:
+                cell = ws.cell
+                for r, values in enumerate(data, start=start_row):
+                    for c, val in enumerate(values, start=1):
+                        cell(row=r, column=c, value=val)
+            _extend_tables(ws, start_row, start_row + len(data) - 1)
+            log.info(
+                "Wrote %d rows × %d cols to %s sheet",
+                len(data),
+                len(_COLUMNS),
+                _TARGET_SHEET,
             )
-            row = list(outer[0]) if nested else outer
-
-            def _norm(val: object) -> str:
-                return str(val).strip().upper().replace("_", "").replace(" ", "")
-
-            norm_map = {_norm(k): v for k, v in adhoc_headers.items()}
-            orig_map = {_norm(k): k for k in adhoc_headers}
-            matched: set[str] = set()
-            written: list[str] = []
-            for i, cell_val in enumerate(row):
-                addr = ws.range((6, i + 1)).get_address(False, False)
-                key = _norm(cell_val)
-                if key in norm_map:
-                    ws.range((7, i + 1)).value = norm_map[key]
-                    matched.add(key)
-                    written.append(addr)
-
-            unmatched = [orig for key, orig in orig_map.items() if key not in matched]
-            if written:
-                log.info("Custom headers written to %s", ", ".join(written))
-            if unmatched:
-                log.info(
-                    "No matching column for custom headers %s",
-                    ", ".join(unmatched),
-                )
-        wb.save()
+        wb.save(wb_path)
     finally:
-        if wb is not None:
-            try:
-                wb.close()
-            except Exception:
-                pass
-        try:
-            app.kill()
-        except Exception:
-            pass
-        try:
-            pythoncom.CoUninitialize()
-        except Exception:
-            pass
+        wb.close()
+
+
+def _project_rows(rows: Iterable[dict[str, Any]]) -> list[list[Any]]:
+    """
+    Keep records carrying every required field (``None`` and ``""`` count
+    as missing) and lay them out in ``_COLUMNS`` order, blanking missing
+    values.
+    """
+    cols = _COLUMNS
+    required = _REQUIRED
+    data: list[list[Any]] = []
+    append = data.append
+    for rec in rows:
+        get = rec.get
+        if all(get(k) not in (None, "") for k in required):
+            append([get(col) or "" for col in cols])
+    return data
 
 
 def insert_bid_rows(
@@ -133,12 +261,20 @@ def insert_bid_rows(
     rows: Iterable[dict[str, Any]],
     log: logging.Logger,
     adhoc_headers: dict[str, str] | None = None,
+    *,
+    requires_excel_recalc: bool = False,
+    session: tuple[Any, Any] | None = None,
 ) -> None:
     """
     Bulk-insert BID/RFP *rows* into the RFP sheet of *wb_path*.
 
     If *adhoc_headers* is provided, header labels matching its keys are
     replaced with the corresponding values before inserting any data rows.
+
+    Rows are written with openpyxl so no Excel process is started. Pass
+    *requires_excel_recalc* to go through Excel (xlwings) instead, e.g. when
+    the workbook must be recalculated by Excel on save, or an open
+    ``excel_session`` as *session* to write through its workbook.
     """
     row_iter = iter(rows)
     try:
@@ -149,62 +285,178 @@ def insert_bid_rows(
 
     rows = chain([first], row_iter)
 
-    data: list[list[Any]] = []
-    for rec in rows:
-        if _REQUIRED.issubset(k for k in rec if rec[k] is not None):
-            data.append([rec.get(col) or "" for col in _COLUMNS])
-
+    data = _project_rows(rows)
     if not data:
         log.info("No RFP rows to insert after validation")
         return
 
-    if xw is None:
+    if session is None and not requires_excel_recalc:
+        if _get_openpyxl() is not None:
+            _insert_rows_openpyxl(wb_path, data, log, adhoc_headers)
+            return
+
+    if session is not None:
+        _insert_rows_xlwings(session, wb_path, data, log, adhoc_headers)
+        return
+
+    if _get_xw() is None:
         log.error("xlwings is required for RFP inserts")
         return
 
-    if adhoc_headers:
-        update_adhoc_headers(wb_path, adhoc_headers, log)
+    with excel_session(wb_path) as sess:
+        _insert_rows_xlwings(sess, wb_path, data, log, adhoc_headers)
 
-    pythoncom.CoInitialize()
-    app = xw.App(visible=VISIBLE_EXCEL, add_book=False)  # type: ignore
-    app.api.DisplayAlerts = False
-    wb = None
-    try:
-        wb = app.books.open(str(wb_path))
-        try:
-            ws = wb.sheets[_TARGET_SHEET]
-        except Exception:
-            log.error("%s sheet not found in %s", _TARGET_SHEET, wb_path)
-            return
 
-        # First empty row in column A
-        start_row = ws.api.Cells(ws.api.Rows.Count, 1).End(-4162).Row + 1
-        n_rows = len(data)
-        n_cols = len(_COLUMNS)
+def _last_used_row(ws_api) -> int:
+    """
+    Last row with content in column A, at least ``1``.
 
-        # One-shot write
-        ws.range((start_row, 1)).resize(n_rows, n_cols).value = data
-        wb.save()
-        log.info(
-            "Wrote %d rows × %d cols to %s sheet",
-            n_rows,
-            n_cols,
-            _TARGET_SHEET,
-        )
-    finally:
-        if wb is not None:
+    An empty column reports row 1, like ``End(xlUp)`` does, so data still
+    starts below the header row.
+
+    A single backwards ``Find`` from the top of the column; unlike
+    ``Cells(Rows.Count, 1).End(xlUp)`` it needs no ``Rows.Count`` round trip
+    and doesn't walk up from row 1,048,576.
+    """
+    hit = ws_api.Columns(1).Find(
+        What="*",
+        LookIn=_XL_FORMULAS,
+        SearchOrder=_XL_BY_ROWS,
+        SearchDirection=_XL_PREVIOUS,
+    )
+    return 1 if hit is None else max(int(hit.Row), 1)
+
+
+def _extend_list_objects(ws_api, start_row: int, end_row: int) -> None:
+    """COM twin of ``_extend_tables``: one ``ListObject.Resize`` per table."""
+    tables = ws_api.ListObjects
+    for i in range(1, tables.Count + 1):
+        table = tables(i)
+        rng = table.Range
+        top = rng.Row
+        if rng.Column != 1 or top + rng.Rows.Count - 1 != start_row - 1:
+            continue
+        last = ws_api.Cells(end_row, rng.Columns.Count)
+        table.Resize(ws_api.Range(ws_api.Cells(top, 1), last))
+
+
+def _column_type(values: Iterable[Any]) -> int | None:
+    """ADO field type holding every value of a column, or ``None``."""
+    present = [v for v in values if v != ""]
+    if all(type(v) is not bool and isinstance(v, Number) for v in present):
+        return _AD_DOUBLE
+    if all(isinstance(v, str) for v in present):
+        return _AD_VAR_WCHAR
+    return None
+
+
+def _open_recordset(data: list[list[Any]]) -> Any | None:
+    """
+    Load *data* into a disconnected ADO recordset for ``CopyFromRecordset``.
+
+    Columns holding only numbers (or blanks) become ``adDouble`` fields,
+    columns holding only text ``adVarWChar``; blanks are stored as NULL so
+    the cells stay empty. A column mixing types would have its numbers
+    written as text, so such blocks (and any ADO failure) return ``None``
+    and go through the SAFEARRAY write, which keeps each cell's type.
+    """
+    kinds = [_column_type(values) for values in zip(*data)]
+    if None in kinds:
+        return None
+    try:
+        from win32com.client import Dispatch  # type: ignore
+    except ImportError:
+        return None
+
+    rs = None
+    try:
+        rs = Dispatch("ADODB.Recordset")
+        for name, kind, values in zip(_COLUMNS, kinds, zip(*data)):
+            size = 0
+            if kind == _AD_VAR_WCHAR:
+                size = max(len(v) for v in values) or 1
+            rs.Fields.Append(name, kind, size, _AD_FLD_IS_NULLABLE)
+        rs.Open()
+        fields = list(_COLUMNS)
+        for values in data:
+            rs.AddNew(
+                fields,
+                [
+                    None if v == "" else float(v) if kind == _AD_DOUBLE else v
+                    for v, kind in zip(values, kinds)
+                ],
+            )
+        rs.MoveFirst()
+    except Exception:
+        if rs is not None:
             try:
-                wb.close()
+                rs.Close()
             except Exception:
                 pass
-        try:
-            app.kill()
-        except Exception:
-            pass
-        try:
-            pythoncom.CoUninitialize()
-        except Exception:
-            pass
+        return None
+    return rs
+
+
+def _load_numpy():
+    # numpy lets xlwings marshal the whole block as a single SAFEARRAY;
+    # imported on first use, not at module import, to keep cold start cheap
+    try:
+        import numpy as np  # type: ignore
+    except ImportError:
+        np = None  # type: ignore
+    return np
+
+
+def _insert_rows_xlwings(
+    session: tuple[Any, Any],
+    wb_path: Path,
+    data: list[list[Any]],
+    log: logging.Logger,
+    adhoc_headers: dict[str, str] | None,
+) -> None:
+    app, wb = session
+    if adhoc_headers:
+        update_adhoc_headers(wb_path, adhoc_headers, log, session=session)
+
+    try:
+        ws = wb.sheets[_TARGET_SHEET]
+    except Exception:
+        log.error("%s sheet not found in %s", _TARGET_SHEET, wb_path)
+        return
+
+    start_row = _last_used_row(ws.api) + 1
+    n_rows = len(data)
+    n_cols = len(_COLUMNS)
+
+    rs = _open_recordset(data) if n_rows >= _RECORDSET_MIN_ROWS else None
+    calc, redraw = app.api.Calculation, app.api.ScreenUpdating
+    app.api.ScreenUpdating = False
+    app.api.Calculation = _XL_CALC_MANUAL
+    try:
+        # grow the table once up front rather than relying on Excel to
+        # auto-expand it (that option can be off, and it is row by row)
+        _extend_list_objects(ws.api, start_row, start_row + n_rows - 1)
+        if rs is not None:
+            # Excel pulls the rows itself; no giant VARIANT to marshal
+            try:
+                ws.api.Cells(start_row, 1).CopyFromRecordset(rs)
+            finally:
+                rs.Close()
+        else:
+            # One-shot write; an object ndarray is packed into one SAFEARRAY
+            np = _load_numpy()
+            block = np.array(data, dtype=object) if np is not None else data
+            rng = ws.range((start_row, 1)).resize(n_rows, n_cols)
+            rng.options(ndim=2).value = block
+    finally:
+        app.api.Calculation = calc
+        app.api.ScreenUpdating = redraw
+    log.info(
+        "Wrote %d rows × %d cols to %s sheet",
+        n_rows,
+        n_cols,
+        _TARGET_SHEET,
+    )
 
 
 __all__ = ["insert_bid_rows", "update_adhoc_headers", "_COLUMNS"]
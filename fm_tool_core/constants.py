@@ -1,18 +1,35 @@
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
+from typing import Any
 
 READY_NAME = "PY_READY_FLAG"
 READY_OK = "READY"
 READY_ERR = "ERROR"
+# Named Win32 events the macro may set instead of (or besides) the flag.
+# Each run suffixes them with a token stored in the READY_EVENT_NAME
+# defined name, e.g. "FM_READY_OK_<token>", so concurrent runs stay apart.
+READY_EVENT_OK = "FM_READY_OK"
+READY_EVENT_ERR = "FM_READY_ERR"
+READY_EVENT_NAME = "PY_READY_EVENT"
 
 READY_TO = 600  # seconds
 OPEN_TO = 60
 POLL_SLEEP = 0.25
 RETRY_SLEEP = 2
+# Excel circuit breaker: trip after this many failed macro runs in a row,
+# then fail fast for the cooldown before letting one probe run through
+BREAKER_THRESHOLD = int(os.getenv("FM_BREAKER_THRESHOLD", "3"))
+BREAKER_COOLDOWN = float(os.getenv("FM_BREAKER_COOLDOWN", "300"))
+
+
+@functools.cache
+def log_dir() -> Path:
+    """Log directory from ``LOG_DIR``, resolved on first use only."""
+    return Path(os.getenv("LOG_DIR", "../Logs")).resolve()
 
-LOG_DIR = Path(os.getenv("LOG_DIR", "../Logs")).resolve()
 
 SP_USERNAME = os.getenv("SP_USERNAME")
 SP_PASS = os.getenv("SP_PASS")
@@ -20,6 +37,21 @@ ROOT_SP_SITE = "https://ksmcpa.sharepoint.com/teams/ksmta"
 
 SCAC_VALIDATION_SHEET = "HOME"
 VISIBLE_EXCEL = os.getenv("FM_SHOW_EXCEL", "0") == "1"
+# Run each macro in a spawned worker process instead of a thread, isolating
+# Excel crashes and letting separate processes drive their own instances
+MACRO_SUBPROCESS = os.getenv("FM_MACRO_SUBPROCESS", "0") == "1"
+# Join the multithreaded apartment where possible (falls back to STA on
+# threads that already hold one), so COM calls skip STA message marshaling
+COM_MTA = os.getenv("FM_COM_MTA", "0") == "1"
+# Re-deflate finished workbooks at level 9 before upload; costs CPU, so it
+# only pays off when the SharePoint upload is the bottleneck
+RECOMPRESS = os.getenv("FM_RECOMPRESS", "0") == "1"
+# Upload over any existing SharePoint file instead of probing for it first
+# and skipping the upload when it is already there
+ALWAYS_OVERWRITE = os.getenv("FM_OVERWRITE", "0") == "1"
+# Files above this many bytes go up as a chunked upload session of this
+# chunk size; set in MB through SP_CHUNK_MB
+SP_CHUNK = int(os.getenv("SP_CHUNK_MB", "10")) * 1024 * 1024
 
 SMTP_SERVER = os.getenv("SMTP_SERVER")
 SMTP_PORT = os.getenv("SMTP_PORT")
@@ -28,20 +60,41 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SMTP_FROM = os.getenv("SMTP_FROM")
 BID_WEBHOOK_URI = os.getenv("BID_WEBHOOK_URI")
 
-__all__ = [
+# Kept importable as a constant; evaluated lazily via ``__getattr__``.
+_LAZY = {"LOG_DIR": log_dir}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        return _LAZY[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [  # noqa: F822 - LOG_DIR is served by __getattr__
     "READY_NAME",
     "READY_OK",
     "READY_ERR",
+    "READY_EVENT_OK",
+    "READY_EVENT_ERR",
+    "READY_EVENT_NAME",
     "READY_TO",
     "OPEN_TO",
     "POLL_SLEEP",
     "RETRY_SLEEP",
+    "BREAKER_THRESHOLD",
+    "BREAKER_COOLDOWN",
     "LOG_DIR",
+    "log_dir",
     "SP_USERNAME",
     "SP_PASS",
     "ROOT_SP_SITE",
     "SCAC_VALIDATION_SHEET",
     "VISIBLE_EXCEL",
+    "MACRO_SUBPROCESS",
+    "COM_MTA",
+    "RECOMPRESS",
+    "ALWAYS_OVERWRITE",
+    "SP_CHUNK",
     "SMTP_SERVER",
     "SMTP_PORT",
     "SMTP_USERNAME",
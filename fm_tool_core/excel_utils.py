@@ -3,16 +3,31 @@
 from __future__ import annotations
 
 import logging
+import os
+import pickle
+import random
 import shutil
+import signal
+import sys
 import threading
+import tempfile
 import time
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Iterator, Sequence
 
 from .constants import (
+    BREAKER_COOLDOWN,
+    BREAKER_THRESHOLD,
+    COM_MTA,
+    MACRO_SUBPROCESS,
     OPEN_TO,
     POLL_SLEEP,
     READY_ERR,
+    READY_EVENT_ERR,
+    READY_EVENT_NAME,
+    READY_EVENT_OK,
     READY_NAME,
     READY_OK,
     READY_TO,
@@ -20,53 +35,349 @@ from .constants import (
     VISIBLE_EXCEL,
 )
 from .exceptions import FlowError
+from .log_utils import LogFormatter
 
-# psutil for killing orphans
-try:
-    import psutil  # type: ignore
-except ImportError:
+# Heavy optional dependencies (xlwings, pywin32, psutil) are imported on
+# first use rather than at module import: ``import xlwings`` alone pulls in
+# pywin32 and probes the COM registry, which dominates cold start. They are
+# still exposed as module attributes (``excel_utils.xw`` etc.) through the
+# module-level ``__getattr__`` below, so callers and tests can keep using
+# or patching them. Set ``FM_EAGER_IMPORT=1`` to resolve them at import.
 
-    class _PS:
-        @staticmethod
-        def process_iter(attrs=None):
-            return []
 
-    psutil = _PS()
+def _load_psutil():
+    # psutil for killing orphans
+    try:
+        import psutil  # type: ignore
+    except ImportError:
 
-# xlwings for COM
-try:
-    import xlwings as xw  # type: ignore
-except ImportError:
-    xw = None  # type: ignore
+        class _PS:
+            @staticmethod
+            def process_iter(attrs=None):
+                return []
 
-# win32com for message pumping & CoInitialize
-try:
-    from win32com.client import pythoncom  # type: ignore
-except ImportError:
+        psutil = _PS()
+    return psutil
 
-    class _PC:
-        @staticmethod
-        def PumpWaitingMessages():
-            pass
 
-        @staticmethod
-        def CoInitialize():
-            pass
+def _load_xw():
+    # xlwings for COM
+    try:
+        import xlwings as xw  # type: ignore
+    except ImportError:
+        xw = None  # type: ignore
+    return xw
 
-        @staticmethod
-        def CoUninitialize():
-            pass
 
-    pythoncom = _PC()
+def _load_pythoncom():
+    # win32com for message pumping & CoInitialize
+    if COM_MTA:
+        # read by pythoncom's import-time CoInitializeEx (0 = MULTITHREADED)
+        sys.coinit_flags = 0  # type: ignore[attr-defined]
+    try:
+        from win32com.client import pythoncom  # type: ignore
+    except ImportError:
+
+        class _PC:
+            @staticmethod
+            def PumpWaitingMessages():
+                pass
+
+            @staticmethod
+            def CoInitialize():
+                pass
+
+            @staticmethod
+            def CoUninitialize():
+                pass
+
+        pythoncom = _PC()
+    return pythoncom
+
+
+def _load_openpyxl():
+    # openpyxl for reading cached cell values without starting Excel
+    try:
+        import openpyxl  # type: ignore
+    except ImportError:
+        openpyxl = None  # type: ignore
+    return openpyxl
+
+
+_LAZY = {
+    "xw": _load_xw,
+    "pythoncom": _load_pythoncom,
+    "psutil": _load_psutil,
+    "openpyxl": _load_openpyxl,
+}
+
+
+def _lazy(name: str) -> Any:
+    """Return the optional module *name*, importing it on first access."""
+    g = globals()
+    if name not in g:
+        g[name] = _LAZY[name]()
+    return g[name]
+
+
+def _get_xw():
+    return _lazy("xw")
+
+
+def _get_pythoncom():
+    return _lazy("pythoncom")
+
+
+def _get_psutil():
+    return _lazy("psutil")
+
+
+def _get_openpyxl():
+    return _lazy("openpyxl")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_XL_CALC_MANUAL = -4135
+_XL_CALC_DONE = 0  # Application.CalculationState: nothing pending
 
 # COM error codes to retry on
 RPC_E_CALL_FAILED = -2147023170
 RPC_E_SERVER_UNAVAILABLE = -2147023174
 
 
+_com_state = threading.local()
+
+
+def _co_initialize(pythoncom) -> None:
+    """Enter the MTA when ``FM_COM_MTA`` is set, else (or failing that) STA."""
+    if COM_MTA and hasattr(pythoncom, "CoInitializeEx"):
+        try:
+            pythoncom.CoInitializeEx(pythoncom.COINIT_MULTITHREADED)
+            return
+        except Exception:
+            pass  # RPC_E_CHANGED_MODE: this thread is already an STA
+    pythoncom.CoInitialize()
+
+
+@contextmanager
+def com_apartment() -> Iterator[None]:
+    """
+    Keep COM initialised on the current thread for the duration of the block.
+
+    Only the outermost block on a thread calls ``CoInitialize`` /
+    ``CoUninitialize``; nested blocks (a session opened inside a row that
+    already holds the apartment, say) reuse it instead of re-entering.
+    """
+    pythoncom = _get_pythoncom()
+    depth = getattr(_com_state, "depth", 0)
+    if depth == 0:
+        _co_initialize(pythoncom)
+    _com_state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _com_state.depth = depth
+        if depth == 0:
+            app = _com_state.__dict__.pop("app", None)
+            if app is not None:
+                try:
+                    app.kill()
+                except Exception:
+                    pass
+            try:
+                pythoncom.CoUninitialize()
+            except Exception:
+                pass
+
+
+def _get_app():
+    """
+    Return this thread's shared hidden Excel, starting one if needed.
+
+    The instance lives until the outermost ``com_apartment`` block exits,
+    so helpers called within one row (the pre-macro session and both
+    validation reads) pay for Excel start-up once. COM proxies are bound
+    to their apartment, hence one instance per thread rather than per
+    process. A dead instance (e.g. reaped by ``kill_orphan_excels``) is
+    replaced transparently.
+    """
+    app = getattr(_com_state, "app", None)
+    if app is not None and _app_responsive(app):
+        return app
+    xw = _get_xw()
+    if xw is None:
+        raise FlowError("xlwings is required", work_completed=False)
+    app = xw.App(visible=VISIBLE_EXCEL, add_book=False)  # type: ignore
+    app.api.DisplayFullScreen = False
+    app.api.DisplayAlerts = False
+    app.api.ScreenUpdating = False
+    if getattr(_com_state, "depth", 0):
+        _com_state.app = app
+    return app
+
+
+@contextmanager
+def excel_session(
+    wb_path: Path,
+    *,
+    save: bool = True,
+) -> Iterator[tuple[Any, Any]]:
+    """
+    Open *wb_path* in the thread's shared Excel and yield ``(app, wb)``.
+
+    Lets several edits share one Excel start-up instead of each helper
+    launching and killing its own instance. The workbook is saved when the
+    block exits cleanly (unless *save* is false) and always closed; Excel
+    itself is torn down with the enclosing ``com_apartment``.
+    """
+    with com_apartment():
+        app = _get_app()
+        wb = None
+        try:
+            wb = app.books.open(str(wb_path), update_links=False)
+            yield app, wb
+            if save:
+                wb.save()
+        finally:
+            if wb is not None:
+                try:
+                    wb.close()
+                except Exception:
+                    pass
+
+
+_TH32CS_SNAPPROCESS = 0x2
+_PROCESS_TERMINATE = 0x1
+
+
+def _snapshot_kill_excels() -> bool:
+    """
+    Kill every excel.exe listed in one Toolhelp process snapshot.
+
+    The snapshot is walked in-process, so there is no ``taskkill`` child to
+    spawn and no per-process handle like psutil's scan. Returns False when
+    the Win32 API isn't available.
+    """
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    except (ImportError, AttributeError, OSError, ValueError):
+        return False
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_void_p),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", ctypes.c_long),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", ctypes.c_wchar * 260),
+        ]
+
+    # Full signatures, so HANDLEs aren't truncated to a C int on 64-bit
+    entry_p = ctypes.POINTER(PROCESSENTRY32W)
+    signatures = {
+        "CreateToolhelp32Snapshot": (
+            [wintypes.DWORD, wintypes.DWORD],
+            wintypes.HANDLE,
+        ),
+        "Process32FirstW": ([wintypes.HANDLE, entry_p], wintypes.BOOL),
+        "Process32NextW": ([wintypes.HANDLE, entry_p], wintypes.BOOL),
+        "OpenProcess": (
+            [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD],
+            wintypes.HANDLE,
+        ),
+        "TerminateProcess": ([wintypes.HANDLE, wintypes.UINT], wintypes.BOOL),
+        "CloseHandle": ([wintypes.HANDLE], wintypes.BOOL),
+    }
+    for fn_name, (argtypes, restype) in signatures.items():
+        fn = getattr(kernel32, fn_name)
+        fn.argtypes = argtypes
+        fn.restype = restype
+    snap = kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+    if not snap or snap == ctypes.c_void_p(-1).value:
+        return False
+    pids: list[int] = []
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(entry)
+        ok = kernel32.Process32FirstW(snap, ctypes.byref(entry))
+        while ok:
+            if entry.szExeFile.lower() == "excel.exe":
+                pids.append(entry.th32ProcessID)
+            ok = kernel32.Process32NextW(snap, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snap)
+
+    for pid in pids:
+        handle = kernel32.OpenProcess(_PROCESS_TERMINATE, False, pid)
+        if not handle:
+            logging.warning(f"Could not kill excel.exe (pid={pid})")
+            continue
+        try:
+            if kernel32.TerminateProcess(handle, 1):
+                logging.info(f"Killed excel.exe (pid={pid})")
+            else:
+                logging.warning(f"Could not kill excel.exe (pid={pid})")
+        finally:
+            kernel32.CloseHandle(handle)
+    return True
+
+
+_PROC_ROOT = "/proc"
+
+
+def _proc_kill_excels() -> bool:
+    """
+    Kill every Excel process found by reading ``/proc/<pid>/comm``.
+
+    Each PID costs one small read instead of psutil building a ``Process``
+    per entry. Returns False when there is no ``/proc`` to scan.
+    """
+    try:
+        entries = os.scandir(_PROC_ROOT)
+    except OSError:
+        return False
+    with entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f"{entry.path}/comm") as fh:
+                    comm = fh.read().strip()
+            except OSError:
+                continue  # process exited mid-scan
+            if not comm.lower().startswith("excel"):
+                continue
+            pid = int(entry.name)
+            try:
+                os.kill(pid, signal.SIGKILL)
+                logging.info(f"Killed excel.exe (pid={pid})")
+            except OSError:
+                logging.warning(f"Could not kill excel.exe (pid={pid})")
+    return True
+
+
 def kill_orphan_excels():
     """Force-kill any lingering excel.exe processes."""
-    for p in psutil.process_iter(attrs=["name"]):
+    # One Toolhelp snapshot on Windows, a /proc scan on Linux; psutil's
+    # full process scan remains the fallback elsewhere.
+    if sys.platform == "win32" and _snapshot_kill_excels():
+        return
+    if sys.platform.startswith("linux") and _proc_kill_excels():
+        return
+    for p in _get_psutil().process_iter(attrs=["name"]):
         name = p.info.get("name", "")
         if name and name.lower().startswith("excel"):
             try:
@@ -76,6 +387,85 @@ def kill_orphan_excels():
                 logging.warning(f"Could not kill excel.exe (pid={p.pid})")
 
 
+def _track_pid(pids: dict[int, float | None], pid: int) -> None:
+    """Record *pid* in *pids* together with its process start time."""
+    try:
+        pids[pid] = _get_psutil().Process(pid).create_time()
+    except Exception:
+        pids[pid] = None
+
+
+def _kill_pids(pids: dict[int, float | None]) -> None:
+    """
+    Kill the Excel processes we started, without scanning for others.
+
+    PIDs are reused once a process exits, so each one must still belong to
+    an Excel process and, where recorded, have the same start time.
+    """
+    psutil = _get_psutil()
+    for pid, started in list(pids.items()):
+        try:
+            proc = psutil.Process(pid)
+            reused = started is not None and proc.create_time() != started
+            if reused or not proc.name().lower().startswith("excel"):
+                logging.info(f"pid {pid} no longer our Excel – left alone")
+                continue
+            proc.kill()
+            logging.info(f"Killed excel.exe (pid={pid})")
+        except Exception:
+            logging.warning(f"Could not kill excel.exe (pid={pid})")
+    pids.clear()
+
+
+# Templates up to this size are kept in memory once read, keyed by path and
+# invalidated when their mtime or size changes.
+_TEMPLATE_CACHE_MAX = 64 * 1024 * 1024
+_template_cache: dict[str, tuple[tuple[int, int], bytes]] = {}
+_template_lock = threading.Lock()
+
+
+def _template_blob(src: Path) -> bytes | None:
+    """Contents of *src* from the cache (read on a miss), or None if large."""
+    st = src.stat()
+    if st.st_size > _TEMPLATE_CACHE_MAX:
+        return None
+    key, stamp = str(src), (st.st_mtime_ns, st.st_size)
+    with _template_lock:
+        hit = _template_cache.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    blob = src.read_bytes()
+    with _template_lock:
+        _template_cache[key] = (stamp, blob)
+    return blob
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy file contents only; the macro doesn't care about template mtimes.
+
+    Rows usually share a template (often on a network share), so files up
+    to ``_TEMPLATE_CACHE_MAX`` are read once and written out from memory.
+    Beyond that, ``CopyFileExW`` keeps the copy inside the kernel on
+    Windows; elsewhere ``shutil.copyfile`` uses ``sendfile`` and friends.
+    """
+    blob = _template_blob(src)
+    if blob is not None:
+        dst.write_bytes(blob)
+        return
+    if sys.platform == "win32":
+        import ctypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        if not kernel32.CopyFileExW(str(src), str(dst), None, None, None, 0):
+            err = ctypes.get_last_error()
+            if err == 5:  # ERROR_ACCESS_DENIED
+                raise PermissionError(err, ctypes.FormatError(err), str(dst))
+            raise ctypes.WinError(err)
+        return
+    shutil.copyfile(src, dst)
+
+
 def copy_template(src: str, dst_root: str, new_name: str, log: logging.Logger) -> Path:
     src_path = Path(src)
     if not src_path.exists():
@@ -84,31 +474,211 @@ def copy_template(src: str, dst_root: str, new_name: str, log: logging.Logger) -
     dst_root.mkdir(parents=True, exist_ok=True)
     dst_path = dst_root / new_name
     try:
-        shutil.copy2(src_path, dst_path)
+        _fast_copy(src_path, dst_path)
     except PermissionError:
         log.warning("Destination locked; unlinking and retrying copy")
         try:
             dst_path.unlink()
         except Exception:
             pass
-        shutil.copy2(src_path, dst_path)
+        _fast_copy(src_path, dst_path)
     return dst_path
 
 
-def wait_ready(wb, log: logging.Logger):
+# Parts written back with their original compression method rather than
+# at level 9: re-deflating the VBA project gains little. They are still
+# decompressed and compressed again; the signature covers the content only
+_KEEP_COMPRESSION = ("xl/vbaProject.bin", "xl/vbaProjectSignature.bin")
+
+
+def recompress_xlsm(path: Path) -> bool:
+    """
+    Rewrite the workbook's ZIP container at deflate level 9.
+
+    The VBA project parts keep their original compression. The file is
+    only replaced (atomically) if the result is smaller; returns whether
+    it was.
+    """
+    fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        with zipfile.ZipFile(path) as src, zipfile.ZipFile(tmp, "w") as dst:
+            for info in src.infolist():
+                data = src.read(info)
+                if info.filename in _KEEP_COMPRESSION:
+                    dst.writestr(info, data)
+                else:
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    dst.writestr(info, data, compresslevel=9)
+        if tmp.stat().st_size >= path.stat().st_size:
+            return False
+        os.replace(tmp, path)
+        return True
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+# With an event sink attached the READY flag is re-read whenever Excel
+# reports a change or recalculation, plus this often as a safety net (a
+# defined name changing raises no workbook event of its own).
+READY_FALLBACK = 1.0
+
+
+class _ReadySink:
+    """Workbook event sink that wakes ``wait_ready`` on sheet activity."""
+
+    event: threading.Event
+
+    def OnSheetChange(self, sh, target):
+        self.event.set()
+
+    def OnSheetCalculate(self, sh):
+        self.event.set()
+
+
+def _ready_sink(wb) -> _ReadySink | None:
+    """Attach a :class:`_ReadySink` to *wb*, or ``None`` if unsupported."""
+    try:
+        from win32com.client import WithEvents  # type: ignore
+    except ImportError:
+        return None
+    try:
+        sink = WithEvents(wb.api, _ReadySink)
+    except Exception:
+        return None
+    sink.event = threading.Event()
+    return sink
+
+
+def _read_ready_flag(wb, cache: dict[str, Any] | None = None) -> str:
+    """
+    Return the READY flag's value.
+
+    *cache* keeps the resolved ``Name`` between polls, so each read is one
+    ``RefersTo`` call instead of a Names lookup plus the read. A name that
+    stops resolving (e.g. deleted by VBA) is looked up afresh next time.
+    """
+    cache = {} if cache is None else cache
+    try:
+        name = cache.get("name")
+        if name is None:
+            name = cache["name"] = wb.names[READY_NAME]
+        ref = name.refers_to
+    except Exception:
+        cache.pop("name", None)
+        return "<not-set>"
+    if ref.startswith("="):
+        ref = ref[1:]
+    return ref.strip('"')
+
+
+def _ready_signals(wb) -> list[Any] | None:
+    """
+    Create the named events the macro on *wb* sets when it finishes.
+
+    The names carry a token unique to this process and run, written to
+    *wb* as the ``READY_EVENT_NAME`` defined name for the macro to build
+    ``<READY_EVENT_OK>_<token>`` from; parallel rows, subprocess macros and
+    concurrent payloads therefore never see each other's signals. Returns
+    the ``[ok, err]`` handles, or ``None`` without pywin32. Templates that
+    don't signal them still work through the READY flag fallback.
+    """
+    try:
+        import win32event  # type: ignore
+    except ImportError:
+        return None
+    token = f"{os.getpid()}_{os.urandom(4).hex()}"
+    handles = [
+        win32event.CreateEvent(None, True, False, f"{base}_{token}")
+        for base in (READY_EVENT_OK, READY_EVENT_ERR)
+    ]
+    try:
+        wb.names.add(READY_EVENT_NAME, f'="{token}"')
+    except Exception:
+        for handle in handles:
+            handle.Close()
+        return None
+    return handles
+
+
+def _drop_ready_name(wb) -> None:
+    """Remove the per-run ``READY_EVENT_NAME`` name again, if present."""
+    try:
+        wb.names[READY_EVENT_NAME].delete()
+    except Exception:
+        pass
+
+
+def _wait_signals(handles: list[Any], timeout: float) -> str | None:
+    """
+    Block until a READY event is set, a window message arrives or *timeout*.
+
+    Messages are pumped so COM (and the workbook event sink) keep running.
+    """
+    import win32event  # type: ignore
+
+    rc = win32event.MsgWaitForMultipleObjects(
+        handles, False, int(timeout * 1000), win32event.QS_ALLINPUT
+    )
+    if rc == win32event.WAIT_OBJECT_0:
+        return READY_OK
+    if rc == win32event.WAIT_OBJECT_0 + 1:
+        return READY_ERR
+    if rc == win32event.WAIT_OBJECT_0 + len(handles):
+        _get_pythoncom().PumpWaitingMessages()
+    return None
+
+
+def _pump_wait(seconds: float) -> None:
+    """
+    Wait *seconds* in ``MsgWaitForMultipleObjects``, dispatching window
+    messages as they arrive so COM stays responsive; plain sleep off Windows.
+    """
+    try:
+        import win32event  # type: ignore
+    except ImportError:
+        time.sleep(seconds)
+        return
+    deadline = time.time() + seconds
+    left = seconds
+    while left > 0:
+        rc = win32event.MsgWaitForMultipleObjects(
+            [], False, int(left * 1000), win32event.QS_ALLINPUT
+        )
+        if rc != win32event.WAIT_OBJECT_0:
+            return
+        _get_pythoncom().PumpWaitingMessages()
+        left = deadline - time.time()
+
+
+# Plain polling backs off from POLL_SLEEP to this cap; macros usually run
+# for many seconds, so fast re-reads of the flag are wasted COM calls.
+_POLL_SLEEP_CAP = 2.0
+
+
+def wait_ready(wb, log: logging.Logger, signals: list[Any] | None = None):
+    sink = _ready_sink(wb)
+    event_driven = sink is not None or signals is not None
+    interval = READY_FALLBACK if event_driven else POLL_SLEEP
     start = time.time()
     last_log = -1
+    last_read = float("-inf")
+    fired = True
+    signalled: str | None = None
+    flag_cache: dict[str, Any] = {}
+    info_on = log.isEnabledFor(logging.INFO)
+    delay = POLL_SLEEP
     while True:
-        try:
-            ref = wb.names[READY_NAME].refers_to
-            if ref.startswith("="):
-                ref = ref[1:]
-            flag = ref.strip('"')
-        except Exception:
-            flag = "<not-set>"
-        elapsed = int(time.time() - start)
-        if elapsed != last_log:
-            log.info(f"Polling flag: {flag} (t={elapsed}s)")
+        now = time.time()
+        if signalled is not None:
+            flag = signalled
+        elif fired or now - last_read >= interval:
+            flag = _read_ready_flag(wb, flag_cache)
+            last_read = now
+        elapsed = int(now - start)
+        if info_on and elapsed != last_log:
+            log.info("Polling flag: %s (t=%ss)", flag, elapsed)
             last_log = elapsed
         if flag == READY_OK:
             return
@@ -116,18 +686,51 @@ def wait_ready(wb, log: logging.Logger):
             raise FlowError("VBA signaled ERROR", work_completed=False)
         if elapsed >= READY_TO:
             raise FlowError("Timeout waiting for READY flag", work_completed=False)
-        time.sleep(POLL_SLEEP)
+        if signals is not None:
+            signalled = _wait_signals(signals, interval)
+            fired = sink is not None and sink.event.is_set()
+            if fired:
+                sink.event.clear()
+        elif sink is not None:
+            _get_pythoncom().PumpWaitingMessages()
+            fired = sink.event.wait(0.05)
+            sink.event.clear()
+        else:
+            time.sleep(delay)
+            delay = min(delay * 1.5, _POLL_SLEEP_CAP)
 
 
-def _open_excel_with_timeout(path: Path, log: logging.Logger):
+def _backoff_delay(
+    attempt: int,
+    base: float,
+    cap: float,
+    jitter: float = 0.5,
+) -> float:
+    """
+    Exponential back-off for retry *attempt* (0-based), capped at *cap* and
+    stretched by up to ``jitter`` so parallel retries don't hit COM in step.
+    """
+    return min(cap, base * 2**attempt) * (1 + random.uniform(0, jitter))
+
+
+def _open_excel_with_timeout(
+    path: Path,
+    log: logging.Logger,
+    pids: dict[int, float | None] | None = None,
+):
+    """Start Excel and open *path*, recording the new PID in *pids*."""
+    xw = _get_xw()
     if xw is None:
         raise FlowError("xlwings is required", work_completed=False)
     log.info("Creating Excel App …")
     app = xw.App(visible=True, add_book=False)  # type: ignore
+    if pids is not None:
+        _track_pid(pids, app.pid)
     app.api.DisplayFullScreen = False
     app.api.Application.DisplayAlerts = False
     log.info("Opening workbook …")
     t0 = time.time()
+    attempt = 0
     while True:
         try:
             book = app.books.open(str(path))
@@ -142,8 +745,8 @@ def _open_excel_with_timeout(path: Path, log: logging.Logger):
                 raise FlowError(
                     f"Excel failed to open workbook: {e}", work_completed=False
                 )
-            pythoncom.PumpWaitingMessages()
-            time.sleep(0.5)
+            _pump_wait(_backoff_delay(attempt, base=0.25, cap=2.0))
+            attempt += 1
 
 
 def safe_run_macro(wb, macro_name: str, args: tuple, log: logging.Logger):
@@ -154,72 +757,420 @@ def safe_run_macro(wb, macro_name: str, args: tuple, log: logging.Logger):
     wb.macro(macro_name)(*args)
 
 
-def _run_macro_impl(wb_path: Path, args: tuple, log: logging.Logger):
-    app, wb = _open_excel_with_timeout(wb_path, log)
+def _close_excel(app, wb) -> None:
+    for op in (wb.close, app.kill):
+        try:
+            op()
+        except Exception:
+            pass
+
+
+def _app_responsive(app) -> bool:
+    """True if the Excel instance behind *app* still answers COM calls."""
+    try:
+        return bool(app.api.Ready)
+    except Exception:
+        return False
+
+
+def _run_macro_on(
+    wb,
+    args: tuple,
+    log: logging.Logger,
+    coords: list[tuple[int, int]] | None = None,
+) -> list[Any] | None:
+    """Run the macro on *wb* and save it, then read *coords* if given."""
+    signals = _ready_signals(wb)
     try:
         safe_run_macro(wb, "PopulateAndRunReport", args, log)
-        wait_ready(wb, log)
-        wb.api.Application.CalculateFull()
-        wb.save()
-        log.info("Workbook saved")
+        wait_ready(wb, log, signals)
     finally:
-        for op in (wb.close, app.kill):
+        if signals is not None:
+            _drop_ready_name(wb)  # the token must not ship with the book
+        for handle in signals or ():
+            handle.Close()
+    # The macro normally leaves the workbook calculated; only force a full
+    # recalc when Excel still reports pending or in-progress work
+    app = wb.api.Application
+    if app.CalculationState != _XL_CALC_DONE:
+        app.CalculateFull()
+    wb.save()
+    log.info("Workbook saved")
+    return _read_cells_on(wb, coords) if coords else None
+
+
+def _reopen_book(app, wb, wb_path: Path) -> tuple[Any, Any] | None:
+    """Close *wb* without saving and open *wb_path* again in *app*."""
+    try:
+        wb.close()  # xlwings closes without saving
+        return app, app.books.open(str(wb_path))
+    except Exception:
+        _close_excel(app, wb)
+        return None
+
+
+def _run_macro_attempts(
+    wb_path: Path,
+    args: tuple,
+    log: logging.Logger,
+    state: dict[str, Any],
+    retries: int,
+    backoff: float,
+) -> None:
+    """
+    Run the macro up to *retries* times, keeping Excel running between
+    attempts.
+
+    The macro writes its results and the READY flag into the book, so a
+    transient ``RPC_E_CALL_FAILED`` closes the partly updated book unsaved
+    and re-runs on a fresh open of *wb_path* in the same Excel, as long as
+    it still responds; only ``RPC_E_SERVER_UNAVAILABLE``, an unresponsive
+    instance or a failed reopen pays for a fresh Excel start, and an RPC
+    error while starting Excel is retried the same way. Retries back off
+    exponentially from *backoff* seconds with jitter; any other error fails
+    fast. ``state["started"]`` is stamped per attempt for the caller's
+    watchdog and ``state["pids"]`` collects the Excel instances started
+    here; ``state["values"]`` receives the cells read for
+    ``state["coords"]``. The caller has already cleared orphans; an
+    abandoned instance of ours is killed by pid, leaving Excel started by
+    other rows alone. One that only comes up after the watchdog gave up is
+    closed here straight away.
+    """
+    pids: dict[int, float | None] = state["pids"]
+    session: tuple[Any, Any] | None = None
+    try:
+        for attempt in range(1, retries + 1):
+            state["started"] = time.time()
             try:
-                op()
-            except Exception:
-                pass
+                if session is None:
+                    if pids:
+                        _kill_pids(pids)  # the instance we just abandoned
+                    session = _open_excel_with_timeout(wb_path, log, pids)
+                    if state["aborted"]:  # watchdog gave up during start-up
+                        raise FlowError(
+                            "Timeout running macro",
+                            work_completed=False,
+                        )
+                state["values"] = _run_macro_on(
+                    session[1], args, log, state.get("coords")
+                )
+                return
+            except Exception as err:
+                hr = getattr(err, "hresult", None)
+                log.error(f"Attempt {attempt}/{retries} failed: {err}")
+                if (
+                    hr not in (RPC_E_CALL_FAILED, RPC_E_SERVER_UNAVAILABLE)
+                    or attempt == retries
+                    or state["aborted"]
+                ):
+                    raise
+                if session is None:
+                    pass  # Excel failed to start or open the book: start anew
+                elif hr == RPC_E_CALL_FAILED and _app_responsive(session[0]):
+                    log.info("Excel still responsive – reopening workbook")
+                    session = _reopen_book(*session, wb_path)
+                else:
+                    _close_excel(*session)
+                    session = None
+                delay = _backoff_delay(attempt - 1, base=backoff, cap=30.0)
+                log.warning(
+                    "RPC error (hresult=%s); retrying macro in %.1fs",
+                    hr,
+                    delay,
+                )
+                time.sleep(delay)
+    finally:
+        if session is not None:
+            _close_excel(*session)
+            pids.clear()
+        elif pids:
+            _kill_pids(pids)  # started, but never opened the book
+
+
+# Circuit breaker shared by every macro run in the process: "closed" runs
+# normally, "open" fails fast until the cooldown ends, "half_open" lets a
+# single probe through whose outcome closes or re-opens the circuit;
+# ``probe`` is the thread running it, so other callers keep failing fast.
+_breaker: dict[str, Any] = {
+    "state": "closed",
+    "fails": 0,
+    "opened_at": 0.0,
+    "probe": None,
+}
+_breaker_lock = threading.Lock()
+_breaker_local = threading.local()
 
 
-def run_excel_macro(wb_path: Path, args: tuple, log: logging.Logger):
+def _breaker_enter(log: logging.Logger) -> None:
+    with _breaker_lock:
+        state = _breaker["state"]
+        if state == "closed":
+            return
+        me = threading.get_ident()
+        if state == "half_open":
+            if _breaker["probe"] == me:
+                return  # the probe's own retries
+        elif time.time() - _breaker["opened_at"] >= BREAKER_COOLDOWN:
+            log.warning("Excel circuit half-open – probing with this run")
+            _breaker.update(state="half_open", probe=me)
+            return
+        raise FlowError(
+            "Excel circuit open after repeated macro failures",
+            work_completed=False,
+        )
+
+
+def _breaker_record(ok: bool, log: logging.Logger) -> None:
+    with _breaker_lock:
+        _breaker["probe"] = None
+        if ok:
+            _breaker.update(state="closed", fails=0)
+            return
+        _breaker["fails"] += 1
+        tripped = _breaker["fails"] >= BREAKER_THRESHOLD
+        if tripped or _breaker["state"] == "half_open":
+            log.error(
+                f"Excel circuit open for {BREAKER_COOLDOWN}s after "
+                f"{_breaker['fails']} failed macro runs"
+            )
+            _breaker.update(state="open", opened_at=time.time())
+
+
+def _breaker_note(ok: bool, log: logging.Logger) -> None:
+    """Record a macro outcome now, or for the enclosing ``breaker_scope``."""
+    if getattr(_breaker_local, "outcome", None) is None:
+        _breaker_record(ok, log)
+    else:
+        _breaker_local.outcome = (ok, log)
+
+
+@contextmanager
+def breaker_scope() -> Iterator[None]:
+    """
+    Count every macro run inside the block as one circuit breaker outcome.
+
+    A row's own retries would otherwise trip the breaker by themselves and
+    cap its retry budget at ``BREAKER_THRESHOLD``; within the block they
+    are only noted, and the last one is recorded when the block exits.
+    """
+    if getattr(_breaker_local, "outcome", None) is not None:
+        yield  # nested: the outer block records
+        return
+    _breaker_local.outcome = ()
+    try:
+        yield
+    finally:
+        outcome = _breaker_local.outcome
+        _breaker_local.outcome = None
+        if outcome:
+            _breaker_record(*outcome)
+
+
+def run_excel_macro(
+    wb_path: Path,
+    args: tuple,
+    log: logging.Logger,
+    cells: Sequence[tuple[str, str | int]] | None = None,
+) -> list[Any] | None:
     """
     Execute the macro with retries on RPC failures.
+
+    If *cells* (``(column, row)`` pairs) are given, their values are read
+    from the SCAC validation sheet before the workbook is closed and
+    returned, sparing the caller a second open.
+
+    Runs that fail even after their retries count towards the circuit
+    breaker (once per ``breaker_scope``); once it trips, calls fail fast
+    until ``BREAKER_COOLDOWN``.
+    With ``FM_MACRO_SUBPROCESS=1`` the run happens in a spawned process.
     """
-    backoff = 5.0
-    retries = 3
-    for attempt in range(1, retries + 1):
-        kill_orphan_excels()  # ensure a clean slate each attempt
-        exc: list[Exception] = []
+    _breaker_enter(log)
+    runner = _run_macro_subprocess if MACRO_SUBPROCESS else _run_excel_macro
+    try:
+        values = runner(wb_path, args, log, cells)
+    except BaseException:  # an interrupted probe must not hold the circuit
+        _breaker_note(False, log)
+        raise
+    _breaker_note(True, log)
+    return values
 
-        def _worker():
-            try:
-                pythoncom.CoInitialize()
-                _run_macro_impl(wb_path, args, log)
-            except Exception as e:
-                exc.append(e)
-            finally:
-                try:
-                    pythoncom.CoUninitialize()
-                except Exception:
-                    pass
 
-        th = threading.Thread(target=_worker, daemon=True)
-        th.start()
-
-        start = time.time()
-        while th.is_alive():
-            time.sleep(0.5)
-            if time.time() - start > READY_TO:
-                log.error(f"Macro exceeded {READY_TO}s – killing Excel")
-                kill_orphan_excels()
-                exc.append(FlowError("Timeout running macro", work_completed=False))
-                break
-
-        if not exc:
-            return  # success on this attempt
-
-        # an exception occurred
-        err = exc[0]
-        hr = getattr(err, "hresult", None)
-        log.error(f"Attempt {attempt}/{retries} failed: {err}")
-        if hr in (RPC_E_CALL_FAILED, RPC_E_SERVER_UNAVAILABLE) and attempt < retries:
-            log.warning(
-                f"Retrying macro after RPC error (hresult={hr}) in {backoff}s …"
-            )
-            time.sleep(backoff)
-            continue
+def _run_excel_macro(
+    wb_path: Path,
+    args: tuple,
+    log: logging.Logger,
+    cells: Sequence[tuple[str, str | int]] | None = None,
+    pids: dict[int, float | None] | None = None,
+) -> list[Any] | None:
+    state: dict[str, Any] = {
+        "started": time.time(),
+        "aborted": False,
+        "pids": {} if pids is None else pids,
+        "coords": _cell_coords(cells) if cells else None,
+        "values": None,
+    }
+    exc: list[Exception] = []
+    done = threading.Event()
+
+    def _worker():
+        # COM objects are bound to this thread, so every attempt runs here
+        try:
+            with com_apartment():
+                _run_macro_attempts(
+                    wb_path,
+                    args,
+                    log,
+                    state,
+                    retries=3,
+                    backoff=1.0,
+                )
+        except Exception as e:
+            exc.append(e)
+        finally:
+            done.set()
 
-        # no more retries or fatal error
-        raise err
+    th = threading.Thread(target=_worker, daemon=True)
+    th.start()
+
+    # Sleep until the worker finishes or the current attempt's deadline;
+    # a retry moves the deadline, so re-arm the wait until one of them hits
+    while not done.wait(max(0.0, state["started"] + READY_TO - time.time())):
+        if time.time() - state["started"] > READY_TO:
+            log.error(f"Macro exceeded {READY_TO}s – killing Excel")
+            state["aborted"] = True
+            if state["pids"]:
+                _kill_pids(state["pids"])
+            else:
+                # hung starting Excel, before its pid was known: a process
+                # scan would also kill other rows' Excel, so the worker is
+                # abandoned and closes its instance if one ever comes up
+                log.warning("Excel pid unknown – abandoning the worker")
+            raise FlowError("Timeout running macro", work_completed=False)
+    th.join(1)
+
+    if exc:
+        raise exc[0]
+    return state["values"]
+
+
+# Hard stop for a subprocess run: every attempt may use its full open and
+# READY budgets before the worker's own watchdog gives up.
+_SUBPROCESS_LIMIT = 3 * (OPEN_TO + READY_TO)
+
+
+class _ReportedPids(dict):
+    """Excel PIDs tracked in the macro worker, mirrored to the parent."""
+
+    def __init__(self, conn: Any, lock: threading.Lock) -> None:
+        super().__init__()
+        self._conn = conn
+        self._lock = lock
+
+    def __setitem__(self, pid: int, started: float | None) -> None:
+        super().__setitem__(pid, started)
+        with self._lock:
+            self._conn.send(("pid", pid, started))
+
+
+def _macro_process_entry(
+    wb_path: Path,
+    args: tuple,
+    log_name: str,
+    log_files: list[str],
+    conn: Any,
+    cells: Sequence[tuple[str, str | int]] | None = None,
+) -> None:
+    """Body of the ``FM_MACRO_SUBPROCESS`` worker; reports back on *conn*."""
+    log = logging.getLogger(log_name)
+    log.setLevel(logging.INFO)
+    fmt = LogFormatter()
+    for name in log_files:
+        handler = logging.FileHandler(name, encoding="utf-8")
+        handler.setFormatter(fmt)
+        log.addHandler(handler)
+    log.info(f"Macro worker started (pid={os.getpid()})")
+    values: list[Any] | None = None
+    error: Exception | None = None
+    lock = threading.Lock()
+    try:
+        pids = _ReportedPids(conn, lock)
+        values = _run_excel_macro(wb_path, args, log, cells, pids)
+    except Exception as exc:
+        error = exc
+        try:
+            pickle.dumps(exc)
+        except Exception:
+            error = FlowError(str(exc), work_completed=False)
+    with lock:
+        conn.send(("done", values, error))
+    conn.close()
+
+
+def _run_macro_subprocess(
+    wb_path: Path,
+    args: tuple,
+    log: logging.Logger,
+    cells: Sequence[tuple[str, str | int]] | None = None,
+) -> list[Any] | None:
+    """
+    Run the macro in a spawned process with its own COM apartment and Excel.
+
+    The worker keeps the usual retries and watchdog; it appends to the
+    run's log files, reports each Excel it starts and sends back the
+    *cells* values or the exception that ended it.
+    A crashed worker surfaces as a ``FlowError`` instead of taking this
+    process down with it; a hung or crashed one is killed along with the
+    Excel instances it reported, leaving other rows' Excel alone.
+    """
+    import multiprocessing
+    from multiprocessing.connection import wait
+
+    ctx = multiprocessing.get_context("spawn")
+    reader, writer = ctx.Pipe(duplex=False)
+    log_files: list[str] = []
+    for handler in log.handlers:
+        listener = getattr(handler, "listener", None)
+        for h in listener.handlers if listener else (handler,):
+            if isinstance(h, logging.FileHandler):
+                log_files.append(h.baseFilename)
+    proc = ctx.Process(
+        target=_macro_process_entry,
+        args=(wb_path, args, log.name, log_files, writer, cells),
+        daemon=True,
+    )
+    proc.start()
+    writer.close()  # the worker holds the only write end now
+    pids: dict[int, float | None] = {}
+    deadline = time.monotonic() + _SUBPROCESS_LIMIT
+    try:
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0 or not wait([reader, proc.sentinel], timeout=left):
+                limit = _SUBPROCESS_LIMIT
+                log.error(f"Macro worker ran over {limit}s – killing")
+                proc.kill()
+                _kill_pids(pids)
+                raise FlowError("Timeout running macro", work_completed=False)
+            try:
+                msg = reader.recv()
+            except EOFError:
+                proc.join(5)
+                _kill_pids(pids)
+                raise FlowError(
+                    f"Macro worker exited with code {proc.exitcode}",
+                    work_completed=False,
+                ) from None
+            if msg[0] == "pid":
+                pids[msg[1]] = msg[2]
+                continue
+            _, values, error = msg
+            break
+    finally:
+        reader.close()
+    proc.join(5)
+    if error is not None:
+        raise error
+    return values
 
 
 def write_home_fields(
@@ -228,17 +1179,40 @@ def write_home_fields(
     customer_name: str | None,
     customer_ids: Sequence[str] | None = None,
     adhoc_headers: dict[str, str] | None = None,
+    *,
+    session: tuple[Any, Any] | None = None,
 ) -> None:
-    """Write basic HOME sheet fields to *wb_path*."""
-    if xw is None:
-        raise FlowError("xlwings is required", work_completed=False)
-    pythoncom.CoInitialize()
-    app = xw.App(visible=VISIBLE_EXCEL, add_book=False)  # type: ignore
-    app.api.DisplayFullScreen = False
-    wb = None
+    """
+    Write basic HOME sheet fields to *wb_path*.
+
+    Pass an open ``excel_session`` as *session* to reuse its workbook; it is
+    then saved by the session rather than here.
+    """
+    if session is not None:
+        _write_home_fields_on(
+            *session, process_guid, customer_name, customer_ids, adhoc_headers
+        )
+        return
+    with excel_session(wb_path) as (app, wb):
+        _write_home_fields_on(
+            app, wb, process_guid, customer_name, customer_ids, adhoc_headers
+        )
+
+
+def _write_home_fields_on(
+    app,
+    wb,
+    process_guid: str | None,
+    customer_name: str | None,
+    customer_ids: Sequence[str] | None,
+    adhoc_headers: dict[str, str] | None,
+) -> None:
+    ws = wb.sheets["HOME"]
+    # No redraws or recalcs between the writes; one recalc on restore
+    calc, redraw = app.api.Calculation, app.api.ScreenUpdating
+    app.api.ScreenUpdating = False
+    app.api.Calculation = _XL_CALC_MANUAL
     try:
-        wb = app.books.open(str(wb_path))
-        ws = wb.sheets["HOME"]
         if process_guid is not None:
             try:
                 ws.range("BID").value = process_guid
@@ -247,55 +1221,150 @@ def write_home_fields(
         # Populate the entire merged customer name range to preserve validation
         ws.range("D8:H8").value = customer_name
         if customer_ids:
-            cells = ["D10", "E10", "F10", "G10", "H10"]
-            for cell, cid in zip(cells, customer_ids):
-                ws.range(cell).value = cid
+            # A flat list fills D10 rightwards in a single call
+            ws.range("D10").value = list(customer_ids[:5])
         headers = adhoc_headers or {}
-        for i in range(1, 11):
-            ws.range(f"AR{35 + i}").value = headers.get(f"ADHOC_INFO{i}", "")
-        wb.save()
+        ws.range("AR36:AR45").value = [
+            [headers.get(f"ADHOC_INFO{i}", "")] for i in range(1, 11)
+        ]
     finally:
-        if wb is not None:
-            try:
-                wb.close()
-            except Exception:
-                pass
-        try:
-            app.kill()
-        except Exception:
-            pass
-        try:
-            pythoncom.CoUninitialize()
-        except Exception:
-            pass
+        app.api.Calculation = calc
+        app.api.ScreenUpdating = redraw
 
 
-def read_cell(wb_path: Path, col: str, row: str) -> Any:
-    if xw is None:
-        raise FlowError("xlwings is required", work_completed=False)
-    pythoncom.CoInitialize()
-    app = xw.App(visible=VISIBLE_EXCEL, add_book=False)  # type: ignore
-    app.api.DisplayFullScreen = False
+def _col_index(col: str) -> int:
+    """1-based column number for letters such as ``"AB"``."""
+    n = 0
+    for ch in col.strip().upper():
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+# Above this many cells a bounding block costs more than separate reads
+_READ_BLOCK_MAX = 10_000
+
+
+def _cell_coords(
+    cells: Sequence[tuple[str, str | int]],
+) -> list[tuple[int, int]]:
+    return [(int(row), _col_index(col)) for col, row in cells]
+
+
+def _read_cells_on(wb, coords: list[tuple[int, int]]) -> list[Any]:
+    """
+    Read *coords* (``(row, column)`` numbers) from the open *wb*'s SCAC
+    validation sheet.
+
+    Nearby cells are fetched with a single ``.value`` read of their
+    bounding range and picked out of the returned matrix.
+    """
+    ws = wb.sheets[SCAC_VALIDATION_SHEET]
+    if len(coords) == 1:
+        return [ws.range(coords[0]).value]
+    r0 = min(r for r, _ in coords)
+    c0 = min(c for _, c in coords)
+    n_rows = max(r for r, _ in coords) - r0 + 1
+    n_cols = max(c for _, c in coords) - c0 + 1
+    if n_rows * n_cols > _READ_BLOCK_MAX:
+        return [ws.range(rc).value for rc in coords]
+    rng = ws.range((r0, c0)).resize(n_rows, n_cols)
+    block = rng.options(ndim=2).value
+    return [block[r - r0][c - c0] for r, c in coords]
+
+
+def _read_cells_openpyxl(
+    wb_path: Path,
+    coords: list[tuple[int, int]],
+) -> list[Any] | None:
+    """
+    Read *coords* from the values Excel cached when it last saved the book.
+
+    Returns ``None`` when openpyxl is unavailable, the file can't be parsed
+    or any cell has no cached value (e.g. a formula never calculated).
+    """
+    openpyxl = _get_openpyxl()
+    if openpyxl is None:
+        return None
+    try:
+        wb = openpyxl.load_workbook(wb_path, read_only=True, data_only=True)
+    except Exception:
+        return None
     try:
-        wb = app.books.open(str(wb_path))
-        return wb.sheets[SCAC_VALIDATION_SHEET].range(f"{col}{row}").value
+        r0 = min(r for r, _ in coords)
+        c0 = min(c for _, c in coords)
+        rows = list(
+            wb[SCAC_VALIDATION_SHEET].iter_rows(
+                min_row=r0,
+                max_row=max(r for r, _ in coords),
+                min_col=c0,
+                max_col=max(c for _, c in coords),
+                values_only=True,
+            )
+        )
+        values = [rows[r - r0][c - c0] for r, c in coords]
+    except Exception:
+        return None
     finally:
-        for op in (wb.close, app.kill):
-            try:
-                op()
-            except Exception:
-                pass
+        wb.close()
+    if any(v is None for v in values):
+        return None
+    return values
+
+
+def read_cells(
+    wb_path: Path,
+    cells: Sequence[tuple[str, str | int]],
+) -> list[Any]:
+    """
+    Return the values of *cells* (``(column, row)`` pairs) on the SCAC
+    validation sheet, opening the workbook once.
+
+    The book is opened read-only with link updates and event macros
+    (``Workbook_Open`` and friends) suppressed, since only stored values
+    are needed.
+
+    The values cached in the file are tried first with openpyxl; Excel is
+    only started when one of them is missing.
+    """
+    coords = _cell_coords(cells)
+    cached = _read_cells_openpyxl(wb_path, coords)
+    if cached is not None:
+        return cached
+    with com_apartment():
+        app = _get_app()
+        app.api.EnableEvents = False
+        wb = None
         try:
-            pythoncom.CoUninitialize()
-        except Exception:
-            pass
+            opts = {"update_links": False, "read_only": True}
+            wb = app.books.open(str(wb_path), **opts)
+            return _read_cells_on(wb, coords)
+        finally:
+            if wb is not None:
+                try:
+                    wb.close()
+                except Exception:
+                    pass
+            app.api.EnableEvents = True
+
+
+def read_cell(wb_path: Path, col: str, row: str) -> Any:
+    return read_cells(wb_path, [(col, row)])[0]
+
 
+if os.getenv("FM_EAGER_IMPORT") == "1":  # pragma: no cover - CI guard
+    for _name in _LAZY:
+        _lazy(_name)
 
 __all__ = [
+    "com_apartment",
+    "excel_session",
     "kill_orphan_excels",
     "copy_template",
+    "recompress_xlsm",
     "wait_ready",
     "run_excel_macro",
+    "breaker_scope",
     "write_home_fields",
     "read_cell",
+    "read_cells",
 ]
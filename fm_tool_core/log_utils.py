@@ -0,0 +1,32 @@
+# log_utils.py
+
+from __future__ import annotations
+
+import logging
+import time
+
+
+class LogFormatter(logging.Formatter):
+    """
+    The run-log format, with ``asctime`` rendered once per second.
+
+    Bursts of records within the same second reuse the last timestamp
+    string instead of calling ``strftime`` for each one.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            "%(asctime)s | %(levelname)s | %(message)s", "%Y-%m-%dT%H:%M:%SZ"
+        )
+        self._last: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        last_sec, text = self._last
+        if sec != last_sec:
+            text = time.strftime(self.datefmt, self.converter(sec))
+            self._last = (sec, text)
+        return text
+
+
+__all__ = ["LogFormatter"]
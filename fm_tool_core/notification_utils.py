@@ -2,11 +2,15 @@ from __future__ import annotations
 
 """Helpers for sending notifications via SMTP or webhooks."""
 
+import atexit
+import base64
 import logging
 import os
-from email.message import EmailMessage
+from email.message import EmailMessage, MIMEPart
 from pathlib import Path
 import smtplib
+import threading
+import time
 from typing import Any
 
 try:  # pragma: no cover - optional dependency
@@ -21,9 +25,97 @@ log = logging.getLogger(__name__)
 from .constants import BID_WEBHOOK_URI
 
 
+# One SMTP connection (TLS + login) is kept per process and reused by every
+# notification; it is rebuilt if the server drops it or the config changes.
+_smtp_lock = threading.Lock()
+_smtp: smtplib.SMTP | None = None
+_smtp_key: tuple[str, int, str | None, str | None] | None = None
+
+# After this many consecutive send failures emails are skipped for
+# _SMTP_COOLDOWN seconds, so an SMTP outage can't stall every run.
+_SMTP_MAX_FAILS = 3
+_SMTP_COOLDOWN = 60.0
+_smtp_fails = 0
+_smtp_skip_until = 0.0
+
+# Keep-alive HTTP session for webhook POSTs
+_http = requests.Session() if requests is not None else None
+
+# Attachments are read in multiples of 57 bytes so each chunk base64-encodes
+# to whole 76-char lines and chunks can be concatenated as-is.
+_ATTACH_CHUNK = 57 * 1024
+
+
+def _connect(
+    server: str, port: int, user: str | None, password: str | None
+) -> smtplib.SMTP:
+    timeout = float(os.getenv("SMTP_TIMEOUT", "2"))
+    smtp = smtplib.SMTP(server, port, timeout=timeout)
+    if user and password:
+        try:
+            smtp.starttls()
+        except Exception:
+            pass
+        try:
+            smtp.login(user, password)
+        except Exception as exc:
+            log.warning("SMTP login failed: %s", exc)
+    # SMTP_TIMEOUT only bounds reaching the server; sending a message with
+    # a large log attached gets the longer per-operation send timeout.
+    sock = getattr(smtp, "sock", None)
+    if sock is not None:
+        sock.settimeout(float(os.getenv("SMTP_SEND_TIMEOUT", "30")))
+    return smtp
+
+
+def _drop_smtp() -> None:
+    """Close the pooled connection; caller holds ``_smtp_lock``."""
+    global _smtp
+    if _smtp is not None:
+        try:
+            _smtp.quit()
+        except Exception:
+            pass
+        _smtp = None
+
+
+def _close_smtp() -> None:
+    with _smtp_lock:
+        _drop_smtp()
+
+
+atexit.register(_close_smtp)
+
+
+def _attach_file(msg: EmailMessage, path: Path) -> None:
+    """Attach *path* to *msg*, base64-encoding it chunk by chunk.
+
+    Unlike ``add_attachment(path.read_bytes())`` the raw file is never held
+    in memory alongside its encoded copy. The encoded text itself stays
+    buffered: ``smtplib.send_message`` flattens the whole message into one
+    bytes object before sending, so there is nothing to stream it into.
+    The file is not gzipped either; it is the run log, which recipients
+    open straight from the mail.
+    """
+
+    with path.open("rb") as fh:
+        encoded = "".join(
+            base64.encodebytes(chunk).decode("ascii")
+            for chunk in iter(lambda: fh.read(_ATTACH_CHUNK), b"")
+        )
+    part = MIMEPart()
+    part["Content-Type"] = "application/octet-stream"
+    part["Content-Transfer-Encoding"] = "base64"
+    part.add_header("Content-Disposition", "attachment", filename=path.name)
+    part.set_payload(encoded)
+    msg.make_mixed()
+    msg.attach(part)
+
+
 def _send(msg: EmailMessage) -> None:
     """Send *msg* using environment configured SMTP settings."""
 
+    global _smtp, _smtp_key, _smtp_fails, _smtp_skip_until
     server = os.getenv("SMTP_SERVER")
     port = os.getenv("SMTP_PORT")
     user = os.getenv("SMTP_USERNAME")
@@ -33,20 +125,36 @@ def _send(msg: EmailMessage) -> None:
         log.warning("SMTP_SERVER or SMTP_PORT not configured")
         return
 
-    try:
-        with smtplib.SMTP(server, int(port), timeout=10) as smtp:
-            if user and password:
+    with _smtp_lock:
+        if time.monotonic() < _smtp_skip_until:
+            log.warning("SMTP failing repeatedly – email skipped")
+            return
+        try:
+            key = (server, int(port), user, password)
+            if _smtp_key != key:
+                _drop_smtp()
+            for attempt in (1, 2):
+                if _smtp is None:
+                    _smtp = _connect(*key)
+                    _smtp_key = key
                 try:
-                    smtp.starttls()
+                    _smtp.send_message(msg)
+                    _smtp_fails = 0
+                    return
+                except smtplib.SMTPServerDisconnected:
+                    # idle connection timed out server-side; reconnect once
+                    _smtp = None
+                    if attempt == 2:
+                        raise
                 except Exception:
-                    pass
-                try:
-                    smtp.login(user, password)
-                except Exception as exc:
-                    log.warning("SMTP login failed: %s", exc)
-            smtp.send_message(msg)
-    except Exception as exc:
-        log.warning("Email send failed: %s", exc)
+                    _drop_smtp()
+                    raise
+        except Exception as exc:
+            log.warning("Email send failed: %s", exc)
+            _smtp_fails += 1
+            if _smtp_fails >= _SMTP_MAX_FAILS:
+                _smtp_skip_until = time.monotonic() + _SMTP_COOLDOWN
+                _smtp_fails = 0
 
 
 def send_success_email(
@@ -77,13 +185,7 @@ def send_success_email(
 
     path = Path(attachment_path)
     try:
-        data = path.read_bytes()
-        msg.add_attachment(
-            data,
-            maintype="application",
-            subtype="octet-stream",
-            filename=path.name,
-        )
+        _attach_file(msg, path)
     except Exception as exc:
         log.warning("Could not attach %s: %s", path, exc)
 
@@ -133,7 +235,7 @@ def send_bid_webhook(
         payload.update(extra)
 
     try:
-        resp = requests.post(BID_WEBHOOK_URI, json=payload, timeout=10)
+        resp = _http.post(BID_WEBHOOK_URI, json=payload, timeout=10)
         if resp.status_code >= 400:
             log.warning(
                 "Webhook POST failed: %s %s",
@@ -21,50 +21,77 @@ Excel, SharePoint, logging and CLI behaviour remain unchanged.
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 import time
-import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, List
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, Iterator, List, TypeVar
 from urllib.parse import urlparse, quote
 
-# ───────────────────────────── psutil (optional) ───────────────────────────
-try:
-    import psutil  # type: ignore
-except Exception as _e:  # pragma: no cover
-    psutil = None  # type: ignore
-    logging.basicConfig(level=logging.WARNING)
-    logging.warning("psutil missing – CPU checks disabled (%s)", _e)
-
 # ────────────────────────────── pyodbc (optional) ──────────────────────────
 try:
     import pyodbc  # type: ignore
+
+    # the run keeps its own connection open; the ODBC pool would only pin
+    # idle connections for the life of the process
+    pyodbc.pooling = False
 except ImportError as _e:  # pragma: no cover
     pyodbc = None  # type: ignore
     logging.basicConfig(level=logging.WARNING)
     logging.warning("pyodbc missing – SQL disabled (%s)", _e)
 
+# ────────────────────────────── orjson (optional) ──────────────────────────
+try:
+    import orjson  # type: ignore
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:  # stdlib json is the fallback, not a degraded mode
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+
 try:
     from .bid_utils import _COLUMNS, update_adhoc_headers
 except Exception as _e:  # pragma: no cover
-    _COLUMNS = []  # type: ignore
+    _COLUMNS = ()  # type: ignore
     update_adhoc_headers = lambda *a, **k: None  # type: ignore
     logging.basicConfig(level=logging.WARNING)
     logging.warning("BID utils unavailable: %s", _e)
-from .constants import LOG_DIR, RETRY_SLEEP
+from .constants import ALWAYS_OVERWRITE, RECOMPRESS, RETRY_SLEEP, log_dir
 from .excel_utils import (
+    _get_psutil,
+    breaker_scope,
+    com_apartment,
     copy_template,
+    excel_session,
     kill_orphan_excels,
-    read_cell,
+    recompress_xlsm,
     run_excel_macro,
     write_home_fields,
 )
 from .exceptions import FlowError
-from .sharepoint_utils import sp_ctx, sharepoint_file_exists, sharepoint_upload
+from .log_utils import LogFormatter
+from .sharepoint_utils import (
+    sp_ctx,
+    sp_list_files,
+    sharepoint_file_exists,
+    sharepoint_upload,
+)
 from .notification_utils import (
     send_failure_email,
     send_success_email,
@@ -93,26 +120,67 @@ def _sql_conn_str() -> str:
     return _SQL_CONN_STR
 
 
+# Build it at import when the env is already loaded (run_payload.py loads
+# .env first); otherwise the first connect builds it as before.
+if pyodbc is not None:
+    try:
+        _sql_conn_str()
+    except RuntimeError:
+        pass
+
+
+# One connection serves every SQL helper of a run; run_flow closes it.
+_SQL_LOCK = threading.Lock()
+_SQL_CONN: Any = None
+
+
+@contextmanager
+def _sql_cursor() -> Iterator[Any]:
+    """Yield a cursor on the shared connection, connecting on first use."""
+    global _SQL_CONN
+    with _SQL_LOCK:
+        if _SQL_CONN is None:
+            _SQL_CONN = pyodbc.connect(_sql_conn_str(), timeout=10)
+        try:
+            with _SQL_CONN.cursor() as cur:
+                yield cur
+        except Exception:
+            # the connection may be broken; reconnect on next use
+            _drop_sql_conn()
+            raise
+
+
+def _drop_sql_conn() -> None:
+    global _SQL_CONN
+    if _SQL_CONN is not None:
+        try:
+            _SQL_CONN.close()
+        except Exception:
+            pass
+        _SQL_CONN = None
+
+
+def _close_sql() -> None:
+    """Close the run's shared SQL connection, if one was opened."""
+    with _SQL_LOCK:
+        _drop_sql_conn()
+
+
 def _exec_proc(proc: str, params: tuple[Any, ...], log: logging.Logger) -> None:
     """Execute a stored procedure (no-op if pyodbc is unavailable)."""
     if pyodbc is None:
         log.info("(SQL disabled) would EXEC %s %s", proc, params)
         return
-    conn = None
     try:
-        conn = pyodbc.connect(_sql_conn_str(), timeout=10)
-        with conn.cursor() as cur:
-            log.info("EXEC %s %s", proc, ", ".join(repr(p) for p in params))
-            cur.execute(f"EXEC {proc} " + ", ".join("?" for _ in params), params)
-            conn.commit()
+        with _sql_cursor() as cur:
+            log.info("EXEC %s %s", proc, params)
+            sql = f"EXEC {proc} " + ", ".join("?" * len(params))
+            cur.execute(sql, params)
+            while cur.nextset():  # step through the EXEC's results/errors
+                pass
+            cur.connection.commit()
     except Exception as exc:
         log.warning("Stored procedure %s failed: %s", proc, exc)
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
 
 def _update_status(scac: str, state: str, log: logging.Logger) -> None:
@@ -134,17 +202,23 @@ def _reset_status(scac: str, state: str, log: logging.Logger) -> None:  # noqa:
 
 # ───────────────────────────── HELPER FUNCTIONS ────────────────────────────
 def _fifo_sort(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Keep FIFO order based on first timestamp-like key, else input order."""
+    """
+    Keep FIFO order based on first timestamp-like key, else input order.
+
+    The key is picked from the first row (payload rows share one shape).
+    ``sorted(key=...)`` already parses each timestamp once; rows without a
+    parsable one share a single fallback so they keep their input order.
+    """
+    if len(rows) < 2:
+        return rows
+    first = rows[0]
     key = next(
-        (
-            k
-            for k in ("QUEUE_TS", "CREATED_UTC", "CREATED_AT")
-            if all(k in r for r in rows)
-        ),
+        (k for k in ("QUEUE_TS", "CREATED_UTC", "CREATED_AT") if k in first),
         None,
     )
     if not key:
         return rows
+    now = time.time()
 
     def _ts(v: Any) -> float:
         if isinstance(v, datetime):
@@ -156,9 +230,69 @@ def _fifo_sort(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                 return datetime.fromisoformat(v.rstrip("Z")).timestamp()
             except ValueError:
                 pass
-        return time.time()
+        return now
+
+    return sorted(rows, key=lambda r: _ts(r.get(key)))
+
 
-    return sorted(rows, key=lambda r: _ts(r[key]))
+# Last CPU sample as (monotonic time, percent). A caller arriving within
+# _CPU_MIN_INTERVAL of it reuses it: shorter non-blocking windows are noisy.
+_cpu_last: tuple[float, float] | None = None
+_CPU_MIN_INTERVAL = 0.5
+# Previous (idle, total) counters for _direct_cpu_percent
+_cpu_times_prev: tuple[float, float] | None = None
+
+
+def _read_cpu_times() -> tuple[float, float] | None:
+    """
+    System-wide ``(idle, total)`` CPU time straight from the kernel.
+
+    ``GetSystemTimes`` on Windows (kernel time includes idle), the first
+    line of ``/proc/stat`` on Linux; None where neither is available.
+    """
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            idle, kernel, user = (wintypes.FILETIME() for _ in range(3))
+            if not ctypes.windll.kernel32.GetSystemTimes(
+                ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)
+            ):
+                return None
+        except (ImportError, AttributeError, OSError):
+            return None
+
+        def _ticks(ft) -> int:
+            return (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+
+        return float(_ticks(idle)), float(_ticks(kernel) + _ticks(user))
+    try:
+        with open("/proc/stat", encoding="ascii") as fh:
+            fields = [float(v) for v in fh.readline().split()[1:9]]
+    except (OSError, ValueError):
+        return None
+    if len(fields) < 5:
+        return None
+    # user nice system idle iowait irq softirq steal (guest is in user)
+    return fields[3] + fields[4], sum(fields)
+
+
+def _direct_cpu_percent(interval: float | None = None) -> float:
+    """``psutil.cpu_percent`` work-alike over ``_read_cpu_times``."""
+    global _cpu_times_prev
+    prev = _cpu_times_prev
+    if interval:
+        prev = _read_cpu_times()
+        time.sleep(interval)
+    cur = _read_cpu_times()
+    _cpu_times_prev = cur
+    if prev is None or cur is None:
+        return 0.0
+    total = cur[1] - prev[1]
+    if total <= 0:
+        return 0.0
+    return max(0.0, 100.0 * (1.0 - (cur[0] - prev[0]) / total))
 
 
 def wait_for_cpu(
@@ -167,20 +301,42 @@ def wait_for_cpu(
     backoff: float = 5.0,
     log: logging.Logger | None = None,
 ) -> None:
-    """Block until overall CPU utilisation drops below *max_percent*."""
-    if psutil is None:
+    """
+    Block until overall CPU utilisation drops below *max_percent*.
+
+    Samples are non-blocking and cover the time since the previous one, so
+    only the process's first call spends *interval* taking a baseline, and
+    a sample younger than ``_CPU_MIN_INTERVAL`` is reused as is. While the
+    host is busy, re-checks back off from *interval* doubling up to
+    *backoff* seconds. The kernel's CPU counters are read directly where
+    possible; psutil is the fallback.
+    """
+    global _cpu_last
+    if _read_cpu_times() is not None:
+        cpu_percent = _direct_cpu_percent
+    else:
+        # psutil is shared with excel_utils and imported on first use there
+        cpu_percent = getattr(_get_psutil(), "cpu_percent", None)
+    if cpu_percent is None:
         if log:
-            log.info("(psutil missing – skipping CPU wait)")
+            log.info("(no CPU counters – skipping CPU wait)")
         return
-    while True:
-        cpu = psutil.cpu_percent(interval)
-        if cpu < max_percent:
-            if log:
-                log.info("CPU load at %.1f%% < %.1f%%, proceeding", cpu, max_percent)
-            return
+    last = _cpu_last
+    if last is not None and time.monotonic() - last[0] < _CPU_MIN_INTERVAL:
+        cpu = last[1]
+    else:
+        cpu = cpu_percent(None if last else interval)
+        _cpu_last = (time.monotonic(), cpu)
+    delay = interval
+    while cpu >= max_percent:
         if log:
-            log.warning("High CPU (%.1f%%) – sleeping %ss", cpu, backoff)
-        time.sleep(backoff)
+            log.warning("High CPU (%.1f%%) – sleeping %ss", cpu, delay)
+        time.sleep(delay)
+        delay = min(delay * 2, backoff)
+        cpu = cpu_percent(None)
+        _cpu_last = (time.monotonic(), cpu)
+    if log:
+        log.info("CPU load at %.1f%% < %.1f%%, proceeding", cpu, max_percent)
 
 
 def _detect_payload_type(rows: List[Dict[str, Any]]) -> str:
@@ -197,6 +353,30 @@ def _detect_payload_type(rows: List[Dict[str, Any]]) -> str:
     return "NIT" if val == "NIT" else "PIT"
 
 
+# Per-run memo of the BID lookups, keyed by (helper, process_guid); every
+# row (and retry) of a payload shares one GUID. Cleared when run_flow ends.
+_RUN_CACHE: Dict[tuple[str, str], Any] = {}
+_T = TypeVar("_T")
+
+
+def _run_cached(
+    fn: Callable[[str, logging.Logger], _T],
+) -> Callable[[str, logging.Logger], _T]:
+    """Memoize a ``(process_guid, log)`` fetch for the rest of the run."""
+
+    @functools.wraps(fn)
+    def wrapper(process_guid: str, log: logging.Logger) -> _T:
+        key = (fn.__name__, process_guid)
+        if key in _RUN_CACHE:
+            return _RUN_CACHE[key]
+        result = fn(process_guid, log)
+        if result:  # empty may be a failed query – let a retry ask again
+            _RUN_CACHE[key] = result
+        return result
+
+    return wrapper
+
+
 def _fetch_bid_rows(process_guid: str, log: logging.Logger) -> List[Dict[str, Any]]:
     """
     Return BID rows for *process_guid*.
@@ -207,10 +387,8 @@ def _fetch_bid_rows(process_guid: str, log: logging.Logger) -> List[Dict[str, An
         log.info("(SQL disabled) would fetch BID rows for %s", process_guid)
         return []
 
-    conn = None
     try:
-        conn = pyodbc.connect(_sql_conn_str(), timeout=10)
-        with conn.cursor() as cur:
+        with _sql_cursor() as cur:
             cur.execute(
                 """
                 SELECT LANE_ID, ORIG_CITY, ORIG_ST, ORIG_POSTAL_CD,
@@ -229,24 +407,17 @@ def _fetch_bid_rows(process_guid: str, log: logging.Logger) -> List[Dict[str, An
     except Exception as exc:
         log.warning("Failed to fetch BID rows: %s", exc)
         return []
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
 
+@_run_cached
 def _fetch_adhoc_headers(process_guid: str, log: logging.Logger) -> Dict[str, str]:
     """Return ADHOC_INFO* labels for *process_guid*."""
     if pyodbc is None:
         log.info("(SQL disabled) would fetch ad-hoc headers for %s", process_guid)
         return {}
 
-    conn = None
     try:
-        conn = pyodbc.connect(_sql_conn_str(), timeout=10)
-        with conn.cursor() as cur:
+        with _sql_cursor() as cur:
             cur.execute(
                 "SELECT PROCESS_JSON FROM dbo.MAPPING_AGENT_PROCESSES "
                 "WHERE PROCESS_GUID = ?",
@@ -256,7 +427,7 @@ def _fetch_adhoc_headers(process_guid: str, log: logging.Logger) -> Dict[str, st
             if not row or not row[0]:
                 return {}
             try:
-                data = json.loads(row[0])
+                data = _json_loads(row[0])
             except Exception as exc:
                 log.warning("Malformed PROCESS_JSON: %s", exc)
                 return {}
@@ -273,24 +444,17 @@ def _fetch_adhoc_headers(process_guid: str, log: logging.Logger) -> Dict[str, st
     except Exception as exc:
         log.warning("Failed to fetch ad-hoc headers: %s", exc)
         return {}
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
 
+@_run_cached
 def _fetch_customer_ids(process_guid: str, log: logging.Logger) -> List[str]:
     """Return up to five CUSTOMER_IDs for *process_guid*."""
     if pyodbc is None:
         log.info("(SQL disabled) would fetch CUSTOMER_ID for %s", process_guid)
         return []
 
-    conn = None
     try:
-        conn = pyodbc.connect(_sql_conn_str(), timeout=10)
-        with conn.cursor() as cur:
+        with _sql_cursor() as cur:
             cur.execute(
                 "SELECT TOP 1 CUSTOMER_ID FROM dbo.RFP_OBJECT_DATA "
                 "WHERE PROCESS_GUID = ?",
@@ -305,15 +469,134 @@ def _fetch_customer_ids(process_guid: str, log: logging.Logger) -> List[str]:
     except Exception as exc:
         log.warning("Failed to fetch CUSTOMER_ID: %s", exc)
         return []
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
 
 # ───────────────────────────── ROW WORKER ──────────────────────────────────
+# SharePoint contexts cached per upload worker thread (a ClientContext
+# queues requests internally, so one is never shared between threads).
+_upload_state = threading.local()
+
+
+def _init_upload_worker() -> None:
+    _upload_state.ctx = {}
+
+
+def _site_ctx(site: str):
+    cache = getattr(_upload_state, "ctx", None)
+    if cache is None:
+        return sp_ctx(site)
+    if site not in cache:
+        cache[site] = sp_ctx(site)
+    return cache[site]
+
+
+@functools.cache
+def _sp_folder(site: str, sub_folder: str) -> str:
+    """Server-relative folder for *sub_folder* under the *site* URL."""
+    site_path = urlparse(site).path
+    sub_folder = sub_folder.replace("\\", "/").lstrip("/")
+    return str(PurePosixPath(site_path) / sub_folder)
+
+
+# File names per (site, folder) listed once per run, so rows sharing a
+# destination skip their own existence probe; None marks a failed listing.
+# Names are casefolded, as SharePoint compares them case-insensitively.
+_sp_listing: Dict[tuple[str, str], set[str] | None] = {}
+_sp_listing_lock = threading.Lock()
+# (site, folder) pairs that two or more of the run's rows upload to; a
+# folder only one row uses gets a single-file probe instead of a listing.
+_sp_shared: set[tuple[str, str]] = set()
+
+
+def _shared_folders(rows: List[Dict[str, Any]]) -> set[tuple[str, str]]:
+    """(site, folder) destinations that at least two *rows* upload to."""
+    seen: set[tuple[str, str]] = set()
+    shared: set[tuple[str, str]] = set()
+    for row in rows:
+        site = row.get("CLIENT_DEST_SITE")
+        sub_folder = row.get("CLIENT_DEST_FOLDER_PATH")
+        if site is None or sub_folder is None:
+            continue
+        key = (site, _sp_folder(site, sub_folder))
+        (shared if key in seen else seen).add(key)
+    return shared
+
+
+def _remote_exists(ctx, site: str, folder: str, file_name: str) -> bool:
+    key = (site, folder)
+    if key not in _sp_shared:
+        return sharepoint_file_exists(ctx, f"{folder}/{file_name}")
+    with _sp_listing_lock:
+        known = key in _sp_listing
+        names = _sp_listing.get(key)
+    if not known:
+        try:
+            names = {n.casefold() for n in sp_list_files(ctx, folder)}
+        except Exception:
+            names = None  # e.g. folder missing – probe files one by one
+        with _sp_listing_lock:
+            names = _sp_listing.setdefault(key, names)
+    if names is None:
+        return sharepoint_file_exists(ctx, f"{folder}/{file_name}")
+    return file_name.casefold() in names
+
+
+def _upload_row(
+    row: Dict[str, Any],
+    dst_path: Path,
+    log: logging.Logger,
+) -> None:
+    """Upload *dst_path* to the row's SharePoint folder unless it exists."""
+    file_name = Path(row["NEW_EXCEL_FILENAME"]).name
+    site = row["CLIENT_DEST_SITE"]
+    ctx = _site_ctx(site)
+    folder = _sp_folder(site, row["CLIENT_DEST_FOLDER_PATH"])
+    rel_file = f"{folder}/{file_name}"
+    log.info("Uploading to %s", rel_file)
+    if not ALWAYS_OVERWRITE and _remote_exists(ctx, site, folder, file_name):
+        log.info("SharePoint file exists – skipping upload (not an error)")
+    else:
+        if RECOMPRESS:
+            try:
+                if recompress_xlsm(dst_path):
+                    log.info("Recompressed %s before upload", dst_path.name)
+            except Exception as exc:
+                log.warning("Recompression skipped: %s", exc)
+        sharepoint_upload(ctx, folder, file_name, dst_path)
+        log.info("Uploaded %s", rel_file)
+        with _sp_listing_lock:
+            names = _sp_listing.get((site, folder))
+            if names is not None:
+                names.add(file_name.casefold())
+
+
+def _upload_with_retry(
+    row: Dict[str, Any],
+    dst_path: Path,
+    log: logging.Logger,
+    max_retry: int,
+) -> None:
+    """
+    Run :func:`_upload_row` up to *max_retry* times.
+
+    A pooled upload runs outside :func:`_process_with_retry`, so it gets
+    its own retry loop with the same back-off as a row.
+    """
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            return _upload_row(row, dst_path, log)
+        except Exception as err:
+            last_err = err
+            log.exception("upload failure")
+        if attempts >= max_retry:
+            raise FlowError(
+                f"Max retries reached: {last_err}", work_completed=False
+            ) from last_err
+        time.sleep(RETRY_SLEEP)
+
+
 def process_row(
     row: Dict[str, Any],
     upload: bool,
@@ -321,8 +604,16 @@ def process_row(
     run_id: str,
     log: logging.Logger,
     bid_guid: str | None = None,
-) -> bool:
-    """Process one FM payload row. Returns True on success."""
+    upload_pool: ThreadPoolExecutor | None = None,
+    upload_retries: int = 1,
+) -> Future | None:
+    """
+    Process one FM payload row.
+
+    With an *upload_pool* the SharePoint upload is handed to it, tried up
+    to *upload_retries* times, and its future returned, so the next row's
+    Excel work can start meanwhile; otherwise the upload runs inline.
+    """
     op_code = row["SCAC_OPP"]
     template_src = row["TOOL_TEMPLATE_FILEPATH"]
 
@@ -341,13 +632,21 @@ def process_row(
             log.info("Applying ad-hoc headers: %s", adhoc)
         else:
             log.info("No ad-hoc headers found")
-    write_home_fields(dst_path, bid_guid, row.get("CUSTOMER_NAME"), cust_ids, adhoc)
-    if bid_guid is not None:
-        update_adhoc_headers(dst_path, adhoc, log)
+    # One Excel start-up covers both pre-macro edits of the workbook
+    with excel_session(dst_path) as session:
+        write_home_fields(
+            dst_path,
+            bid_guid,
+            row.get("CUSTOMER_NAME"),
+            cust_ids,
+            adhoc,
+            session=session,
+        )
+        if bid_guid is not None:
+            update_adhoc_headers(dst_path, adhoc, log, session=session)
 
     log.info("Waiting for CPU to drop")
     wait_for_cpu(log=log)
-    kill_orphan_excels()
 
     try:
         log.info("Opening workbook …")
@@ -358,56 +657,93 @@ def process_row(
         )
         if bid_guid is not None:
             macro_args += (bid_guid,)
-        run_excel_macro(dst_path, macro_args, log)
-        log.info("Running macro PopulateAndRunReport …")
-
-        log.info("Reading validation …")
-        op_val = read_cell(
-            dst_path, row["SCAC_VALIDATION_COLUMN"], row["SCAC_VALIDATION_ROW"]
-        )
-        oa_val = read_cell(
-            dst_path,
+        scac_cell = (row["SCAC_VALIDATION_COLUMN"], row["SCAC_VALIDATION_ROW"])
+        oa_cell = (
             row["ORDERAREAS_VALIDATION_COLUMN"],
             row["ORDERAREAS_VALIDATION_ROW"],
         )
+        # validation cells are read on the macro's workbook before it closes
+        op_val, oa_val = run_excel_macro(
+            dst_path, macro_args, log, cells=[scac_cell, oa_cell]
+        )
         log.info(
-            "Validation: %s=%s, %s=%s",
-            f"{row['SCAC_VALIDATION_COLUMN']}{row['SCAC_VALIDATION_ROW']}",
+            "Validation: %s%s=%s, %s%s=%s",
+            *scac_cell,
             op_val,
-            f"{row['ORDERAREAS_VALIDATION_COLUMN']}{row['ORDERAREAS_VALIDATION_ROW']}",
+            *oa_cell,
             oa_val,
         )
 
         if op_val != op_code or oa_val == row["ORDERAREAS_VALIDATION_VALUE"]:
             raise FlowError("Validation failed", work_completed=False)
 
-        if upload:
-            file_name = Path(row["NEW_EXCEL_FILENAME"]).name
-            ctx = sp_ctx(row["CLIENT_DEST_SITE"])
-            site_path = urlparse(row["CLIENT_DEST_SITE"]).path
-            folder = (
-                Path(site_path) / row["CLIENT_DEST_FOLDER_PATH"].lstrip("/")
-            ).as_posix()
-            rel_file = f"{folder}/{file_name}"
-            log.info("Uploading to %s", rel_file)
-            if sharepoint_file_exists(ctx, rel_file):
-                log.info("SharePoint file exists – skipping upload (not an error)")
-            else:
-                sharepoint_upload(ctx, folder, file_name, dst_path)
-                log.info("Uploaded %s", rel_file)
+        pending: Future | None = None
+        if upload and upload_pool is not None:
+            pending = upload_pool.submit(
+                _upload_with_retry, row, dst_path, log, upload_retries
+            )
+        elif upload:
+            _upload_row(row, dst_path, log)
 
         log.info("Local file retained at %s", dst_path)
-        return True
+        return pending
     except Exception:
         log.exception("process_row failure")
         raise
-    finally:
-        # Comment back in to delete excel files at end of process
-        # dst_path.unlink(missing_ok=True)
-        kill_orphan_excels()
+    # Comment back in to delete excel files at end of process
+    # finally:
+    #     dst_path.unlink(missing_ok=True)
 
 
 # ───────────────────────────── RUN FLOW ────────────────────────────────────
+# Notifications are independent network I/O (SMTP, webhook POST); they run
+# here while the final SQL status update and Excel cleanup proceed.
+_notify_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notify")
+
+
+def _row_workers(requested: int, n_rows: int) -> int:
+    """Rows to process at once: *requested*, capped by physical cores."""
+    cpu_count = getattr(_get_psutil(), "cpu_count", None)
+    cores = (cpu_count(logical=False) if cpu_count else None) or os.cpu_count()
+    return max(1, min(requested, cores or 1, n_rows))
+
+
+def _process_with_retry(
+    row: Dict[str, Any],
+    row_args: tuple,
+    max_retry: int,
+    *,
+    kill_on_fail: bool = True,
+) -> Future | None:
+    """
+    Run ``process_row(row, *row_args)`` up to *max_retry* times.
+
+    Each attempt holds its own COM apartment, so rows may run on separate
+    threads, each driving its own Excel. *kill_on_fail* reaps orphan Excel
+    processes after a failed attempt; rows running side by side skip it.
+    The attempts count as a single outcome for the Excel circuit breaker.
+    """
+    log: logging.Logger = row_args[3]
+    attempts = 0
+    with breaker_scope():
+        while True:
+            attempts += 1
+            try:
+                # one COM apartment for every Excel step of the row
+                with com_apartment():
+                    return process_row(row, *row_args)
+            except Exception as err:
+                last_err = err
+                log.exception("process_row failure")
+                if kill_on_fail:
+                    kill_orphan_excels()
+            if attempts >= max_retry:
+                raise FlowError(
+                    f"Max retries reached: {last_err}", work_completed=False
+                ) from last_err
+            time.sleep(RETRY_SLEEP)
+
+
 def run_flow(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Entry point when invoked by the PowerShell wrapper."""
     if "parameters" in payload and isinstance(payload["parameters"], dict):
@@ -418,25 +754,38 @@ def run_flow(payload: Dict[str, Any]) -> Dict[str, Any]:
     root_folder = payload["item/In_strDestinationProcessingFolder"]
     enable_upload = payload.get("item/In_boolEnableSharePointUpload", True)
     max_retry = int(payload.get("item/In_intMaxRetry", 1))
+    upload_workers = int(
+        payload.get("item/In_intUploadParallelism", min(8, len(rows))),
+    )
+    row_workers = _row_workers(
+        int(payload.get("item/In_intRowParallelism", 1)), len(rows)
+    )
     bid_guid = payload.get("BID-Payload")
     notify_email = row0.get("NOTIFY_EMAIL") or os.getenv("NOTIFY_EMAIL")
 
-    run_id = uuid.uuid4().hex[:8]
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    log_file = LOG_DIR / f"{datetime.utcnow():%Y-%m-%d-%H-%M-%S}_{run_id}.log"
+    run_id = os.urandom(4).hex()
+    logs = log_dir()
+    logs.mkdir(parents=True, exist_ok=True)
+    log_file = logs / f"{datetime.utcnow():%Y-%m-%d-%H-%M-%S}_{run_id}.log"
 
     log = logging.getLogger("fm_tool")
     log.handlers.clear()
     log.setLevel(logging.INFO)
-    fmt = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(message)s", "%Y-%m-%dT%H:%M:%SZ"
-    )
-    for h in (
+    fmt = LogFormatter()
+    sinks = (
         logging.StreamHandler(sys.stderr),
         logging.FileHandler(log_file, encoding="utf-8"),
-    ):
+    )
+    for h in sinks:
         h.setFormatter(fmt)
-        log.addHandler(h)
+    # workers only enqueue records; a listener thread does the console and
+    # file I/O so logging never blocks the row loop
+    log_q: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_q, *sinks)
+    q_handler = logging.handlers.QueueHandler(log_q)
+    q_handler.listener = listener  # type: ignore[attr-defined]
+    log.addHandler(q_handler)
+    listener.start()
 
     log.info("----- FM Tool run %s -----", run_id)
 
@@ -451,40 +800,102 @@ def run_flow(payload: Dict[str, Any]) -> Dict[str, Any]:
     _update_status(scac, f"{payload_type}-BEGIN", log)
 
     success = False
+    pending: list[Future] = []
+    upload_pool = None
+    if enable_upload:
+        upload_pool = ThreadPoolExecutor(
+            max_workers=max(1, upload_workers),
+            thread_name_prefix="upload",
+            initializer=_init_upload_worker,
+        )
+        _sp_shared.update(_shared_folders(rows))
+    uploads: list[Future] = []
+    # Excel left over from an earlier run; after this the process table is
+    # only walked again when a row fails and at the end of the run
+    kill_orphan_excels()
+    row_args = (
+        enable_upload,
+        root_folder,
+        run_id,
+        log,
+        bid_guid,
+        upload_pool,
+        max_retry,
+    )
     try:
-        for row in rows:
-            attempts = 0
-            last_err: Exception | None = None
-            while True:
-                attempts += 1
+        if row_workers > 1:
+            log.info("Processing up to %d rows at a time", row_workers)
+            with ThreadPoolExecutor(
+                max_workers=row_workers, thread_name_prefix="row"
+            ) as row_pool:
+                # a failed row must not reap the other rows' Excel instances
+                futures = [
+                    row_pool.submit(
+                        _process_with_retry,
+                        row,
+                        row_args,
+                        max_retry,
+                        kill_on_fail=False,
+                    )
+                    for row in rows
+                ]
                 try:
-                    process_row(row, enable_upload, root_folder, run_id, log, bid_guid)
+                    for fut in as_completed(futures):
+                        upload = fut.result()
+                        if upload is not None:
+                            uploads.append(upload)
+                        success = True
+                except BaseException:
+                    for fut in futures:
+                        fut.cancel()
+                    raise
+        else:
+            # one apartment around every row keeps this thread's hidden
+            # Excel (see _get_app) warm from row to row
+            with com_apartment():
+                for row in rows:
+                    upload = _process_with_retry(row, row_args, max_retry)
+                    if upload is not None:
+                        uploads.append(upload)
                     success = True
-                    break
-                except Exception as err:
-                    last_err = err
-                    log.exception("process_row failure")
-                if attempts >= max_retry:
-                    raise FlowError(
-                        f"Max retries reached: {last_err}", work_completed=False
-                    ) from last_err
-                time.sleep(RETRY_SLEEP)
+
+        try:
+            for fut in as_completed(uploads):
+                fut.result()  # surface the first failed upload
+        except BaseException:
+            # a row whose file never reached SharePoint is not complete
+            success = False
+            raise
 
         log.info("SUCCESS")
         if notify_email:
+            # drain queued records so the attached log file is complete
+            listener.stop()
+            listener.start()
             fname = Path(row0["NEW_EXCEL_FILENAME"]).name
             site = row0.get("CLIENT_DEST_SITE", "").rstrip("/")
             folder = row0.get("CLIENT_DEST_FOLDER_PATH", "").strip("/")
             raw_url = f"{site}/{folder}/{fname}"
             sp_url = quote(raw_url, safe=":/")
-            send_success_email(notify_email, fname, sp_url, str(log_file))
-            if bid_guid:
-                send_bid_webhook(
+            pending.append(
+                _notify_pool.submit(
+                    send_success_email,
                     notify_email,
                     fname,
                     sp_url,
-                    "FM Tool processing succeeded",
-                    {"SCAC": scac, "BID_GUID": bid_guid},
+                    str(log_file),
+                )
+            )
+            if bid_guid:
+                pending.append(
+                    _notify_pool.submit(
+                        send_bid_webhook,
+                        notify_email,
+                        fname,
+                        sp_url,
+                        "FM Tool processing succeeded",
+                        {"SCAC": scac, "BID_GUID": bid_guid},
+                    )
                 )
         return {
             "Out_strWorkExceptionMessage": "",
@@ -495,7 +906,9 @@ def run_flow(payload: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as exc:
         log.exception("Run failed")
         if notify_email:
-            send_failure_email(notify_email, str(exc))
+            pending.append(
+                _notify_pool.submit(send_failure_email, notify_email, str(exc))
+            )
         return {
             "Out_strWorkExceptionMessage": str(exc),
             "Out_boolWorkcompleted": success,
@@ -508,8 +921,22 @@ def run_flow(payload: Dict[str, Any]) -> Dict[str, Any]:
             _update_status(scac, f"{payload_type}-COMPLETE", log)
         except Exception:
             log.exception("Failed to mark %s-COMPLETE in SQL", payload_type)
+        if upload_pool is not None:
+            upload_pool.shutdown(wait=True)
+        _close_sql()
+        _RUN_CACHE.clear()
+        _sp_listing.clear()
+        _sp_shared.clear()
         kill_orphan_excels()
+        for fut in pending:
+            try:
+                fut.result()
+            except Exception:
+                log.exception("Notification failed")
         log.info("Log saved to %s", log_file)
+        listener.stop()
+        for h in sinks:
+            h.close()
 
 
 # ------------------------------ CLI ---------------------------------------
@@ -525,7 +952,7 @@ def _cli() -> None:
         if args.json_file == "-"
         else Path(args.json_file).read_text(encoding="utf-8")
     )
-    print(json.dumps(run_flow(json.loads(raw)), indent=2))
+    print(_json_dumps(run_flow(_json_loads(raw))))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import mmap
+import os
+from contextlib import nullcontext
 from pathlib import Path
 
 try:  # pragma: no cover - optional dependency
@@ -15,7 +18,7 @@ except Exception:  # pragma: no cover - library may be absent
         pass
 
 
-from .constants import ROOT_SP_SITE, SP_PASS, SP_USERNAME
+from .constants import ROOT_SP_SITE, SP_CHUNK, SP_PASS, SP_USERNAME
 from .exceptions import FlowError
 
 
@@ -35,28 +38,54 @@ def sp_ctx(site_url: str | None = None):
 
 def sp_exists(ctx, rel_url: str) -> bool:
     try:
-        ctx.web.get_file_by_server_relative_url(rel_url).get().execute_query()
+        # project a single property rather than hydrating all file metadata
+        f = ctx.web.get_file_by_server_relative_url(rel_url)
+        f.select(["Exists"]).get().execute_query()
         return True
     except Exception:
         return False
 
 
+def sp_list_files(ctx, folder: str) -> set[str]:
+    """Names of the files in *folder*, fetched in a single request."""
+    files = ctx.web.get_folder_by_server_relative_url(folder).files
+    files.select(["Name"]).get().execute_query()
+    return {f.name for f in files}
+
+
 def sp_upload(ctx, folder: str, fname: str, local: Path):
     tgt = ctx.web.get_folder_by_server_relative_url(folder)
     with local.open("rb") as f:
-        content = f.read()
-    try:
-        tgt.upload_file(fname, content).execute_query()
-    except ClientRequestException as exc:
-        raise FlowError(
-            f"SharePoint upload failed: {exc}", work_completed=False
-        ) from exc
-    except Exception as exc:  # pragma: no cover - optional
-        if requests is not None and isinstance(exc, requests.HTTPError):
+        try:
+            if os.fstat(f.fileno()).st_size > SP_CHUNK:
+                # streamed from the handle one chunk at a time; argument
+                # order as in office365-rest-python-client 2.5.6
+                tgt.files.create_upload_session(
+                    f, SP_CHUNK, file_name=fname
+                ).execute_query()
+            else:
+                with _mapped(f) as content:
+                    tgt.upload_file(fname, content).execute_query()
+        except ClientRequestException as exc:
             raise FlowError(
                 f"SharePoint upload failed: {exc}", work_completed=False
             ) from exc
-        raise
+        except Exception as exc:  # pragma: no cover - optional
+            if requests is not None and isinstance(exc, requests.HTTPError):
+                raise FlowError(
+                    f"SharePoint upload failed: {exc}", work_completed=False
+                ) from exc
+            raise
+
+
+def _mapped(f):
+    """
+    Map *f* read-only rather than reading it into a bytes copy; the HTTP
+    layer streams the request body straight from the mapping.
+    """
+    if os.fstat(f.fileno()).st_size == 0:
+        return nullcontext(b"")  # empty files can't be mapped
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 
 # Backwards compatible aliases used by tests
@@ -66,6 +95,7 @@ sharepoint_file_exists = sp_exists
 __all__ = [
     "sp_ctx",
     "sp_exists",
+    "sp_list_files",
     "sp_upload",
     "sharepoint_upload",
     "sharepoint_file_exists",
@@ -31,6 +31,8 @@ def _setup_pyodbc(monkeypatch, json_str):
         types.SimpleNamespace(connect=lambda *a, **k: Conn()),
     )
     monkeypatch.setattr(mod, "_sql_conn_str", lambda: "conn")
+    monkeypatch.setattr(mod, "_SQL_CONN", None)
+    monkeypatch.setattr(mod, "_RUN_CACHE", {})
 
 
 def test_fetch_adhoc_headers_success(monkeypatch, caplog):
@@ -69,3 +71,66 @@ def test_fetch_adhoc_headers_bad_json(monkeypatch, caplog):
         res = mod._fetch_adhoc_headers("guid", log)
     assert res == {}
     assert "Malformed PROCESS_JSON" in caplog.text
+
+
+def test_sql_connection_shared_until_closed(monkeypatch):
+    _setup_pyodbc(monkeypatch, '{"ADHOC_INFO1": "A"}')
+    opened = []
+    connect = mod.pyodbc.connect
+    monkeypatch.setattr(
+        mod.pyodbc, "connect", lambda *a, **k: opened.append(1) or connect()
+    )
+    log = logging.getLogger("test")
+
+    mod._fetch_adhoc_headers("guid", log)
+    mod._fetch_customer_ids("guid", log)
+    assert len(opened) == 1
+
+    mod._close_sql()
+    mod._fetch_adhoc_headers("other", log)
+    assert len(opened) == 2
+
+
+def test_fetches_memoized_per_guid(monkeypatch):
+    _setup_pyodbc(monkeypatch, '{"ADHOC_INFO1": "A"}')
+    opened = []
+    connect = mod.pyodbc.connect
+    monkeypatch.setattr(
+        mod.pyodbc, "connect", lambda *a, **k: opened.append(1) or connect()
+    )
+    log = logging.getLogger("test")
+
+    first = mod._fetch_adhoc_headers("guid", log)
+    mod._close_sql()
+    assert mod._fetch_adhoc_headers("guid", log) == first
+    assert len(opened) == 1
+
+
+def test_exec_proc_on_shared_connection(monkeypatch):
+    _setup_pyodbc(monkeypatch, None)
+    sent = []
+
+    class Cur:
+        connection = types.SimpleNamespace(commit=lambda: None)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            return False
+
+        def execute(self, sql, params):
+            sent.append((sql, params))
+
+        def nextset(self):
+            return False
+
+    monkeypatch.setattr(
+        mod,
+        "_SQL_CONN",
+        types.SimpleNamespace(cursor=Cur, close=lambda: None),
+    )
+
+    mod._exec_proc("dbo.A", ("x", "y"), logging.getLogger("test"))
+
+    assert sent == [("EXEC dbo.A ?, ?", ("x", "y"))]
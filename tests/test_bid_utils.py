@@ -1,5 +1,13 @@
 import logging
+import subprocess
+import sys
 import types
+from unittest.mock import MagicMock
+
+from fm_tool_core import excel_utils
+
+# a sheet without Excel tables (ListObjects)
+NO_TABLES = types.SimpleNamespace(Count=0)
 
 
 class FakeHeaderApi:
@@ -20,9 +28,13 @@ class FakeRow6Range:
     def resize(self, _r: int, _c: int):
         return self
 
+    def options(self, ndim: int):
+        assert ndim == 1
+        return self
+
     @property
     def value(self):  # pragma: no cover - simple mock
-        return (tuple(self.sheet.row6),)
+        return list(self.sheet.row6)
 
     def get_address(self, *_args):  # pragma: no cover - simple mock
         return "A6"
@@ -54,11 +66,7 @@ class FakeCell:
 class MockBidSheet:
     def __init__(self):
         self.row6 = [f"Ad Hoc Info {i}" for i in range(1, 11)]
-<<<<<<< HEAD
-        self.row7 = ["" for _ in range(10)]
-=======
         self.row7 = [f"H{i}" for i in range(1, 11)]
->>>>>>> refs/remotes/origin/main
         self.api = FakeHeaderApi(len(self.row6))
 
     def range(self, addr: tuple[int, int]):  # pragma: no cover - simple mock
@@ -82,9 +90,7 @@ def test_insert_bid_rows_early_return(monkeypatch, tmp_path, caplog):
 
     from fm_tool_core import bid_utils
 
-    monkeypatch.setattr(
-        bid_utils, "xw", types.SimpleNamespace(App=fake_app), raising=False
-    )
+    monkeypatch.setattr(excel_utils, "xw", types.SimpleNamespace(App=fake_app))
 
     log = logging.getLogger("test")
     with caplog.at_level(logging.INFO):
@@ -99,14 +105,17 @@ def test_insert_bid_rows_writes_rows(monkeypatch, tmp_path, caplog):
     wb_path = tmp_path / "wb.xlsx"
     wb_path.touch()
     calls: list[str] = []
+    blocks: list = []
+    app_api = types.SimpleNamespace(
+        DisplayAlerts=False, Calculation=-4105, ScreenUpdating=True
+    )
 
     class FakeApi:
-        def __init__(self):
-            self.Rows = types.SimpleNamespace(Count=1)
+        ListObjects = NO_TABLES
 
-        def Cells(self, _row, _col):
+        def Columns(self, _col):
             return types.SimpleNamespace(
-                End=lambda _dir: types.SimpleNamespace(Row=1),
+                Find=lambda **_kw: types.SimpleNamespace(Row=1),
             )
 
     class FakeRange:
@@ -116,6 +125,9 @@ def test_insert_bid_rows_writes_rows(monkeypatch, tmp_path, caplog):
         def resize(self, _r, _c):
             return self
 
+        def options(self, **_kwargs):
+            return self
+
         @property
         def value(self):
             return self._value
@@ -123,6 +135,7 @@ def test_insert_bid_rows_writes_rows(monkeypatch, tmp_path, caplog):
         @value.setter
         def value(self, val):
             calls.append("write")
+            blocks.append(val)
             self._value = val
 
     class FakeSheet:
@@ -146,31 +159,29 @@ def test_insert_bid_rows_writes_rows(monkeypatch, tmp_path, caplog):
         return FakeBook()
 
     class FakeBooks:
-        def open(self, path):
+        def open(self, path, **_kw):
             return fake_open(path)
 
     class FakeApp:
         def __init__(self, *args, **kwargs):
-            self.api = types.SimpleNamespace(DisplayAlerts=False)
+            self.api = app_api
             self.books = FakeBooks()
 
         def kill(self):
             pass
 
     monkeypatch.setattr(
-        bid_utils,
+        excel_utils,
         "xw",
         types.SimpleNamespace(App=FakeApp),
-        raising=False,
     )
     monkeypatch.setattr(
-        bid_utils,
+        excel_utils,
         "pythoncom",
         types.SimpleNamespace(
             CoInitialize=lambda: None,
             CoUninitialize=lambda: None,
         ),
-        raising=False,
     )
 
     rows = [
@@ -182,8 +193,16 @@ def test_insert_bid_rows_writes_rows(monkeypatch, tmp_path, caplog):
     ]
     log = logging.getLogger("test")
     with caplog.at_level(logging.INFO):
-        bid_utils.insert_bid_rows(wb_path, rows, log)
+        bid_utils.insert_bid_rows(
+            wb_path,
+            rows,
+            log,
+            requires_excel_recalc=True,
+        )
     assert calls == ["write"]
+    assert blocks[0].shape == (1, len(bid_utils._COLUMNS))
+    assert blocks[0][0, 0] == "1"
+    assert app_api.Calculation == -4105
     assert any("RFP sheet" in r.message for r in caplog.records)
 
 
@@ -195,12 +214,11 @@ def test_insert_bid_rows_custom_headers(monkeypatch, tmp_path, caplog):
     calls: list[str] = []
 
     class FakeApiRFP:
-        def __init__(self):
-            self.Rows = types.SimpleNamespace(Count=1)
+        ListObjects = NO_TABLES
 
-        def Cells(self, _row, _col):
+        def Columns(self, _col):
             return types.SimpleNamespace(
-                End=lambda _dir: types.SimpleNamespace(Row=1),
+                Find=lambda **_kw: types.SimpleNamespace(Row=1),
             )
 
     class FakeDataRange:
@@ -210,6 +228,9 @@ def test_insert_bid_rows_custom_headers(monkeypatch, tmp_path, caplog):
         def resize(self, _r, _c):
             return self
 
+        def options(self, **_kwargs):
+            return self
+
         @property
         def value(self):
             return self._value
@@ -227,10 +248,7 @@ def test_insert_bid_rows_custom_headers(monkeypatch, tmp_path, caplog):
             return FakeDataRange()
 
     header_sheet = MockBidSheet()
-<<<<<<< HEAD
-=======
     header_sheet.row7 = [f"H{i}" for i in range(1, 11)]
->>>>>>> refs/remotes/origin/main
     data_sheet = FakeSheetRFP()
 
     class FakeBook:
@@ -247,19 +265,21 @@ def test_insert_bid_rows_custom_headers(monkeypatch, tmp_path, caplog):
         return FakeBook()
 
     class FakeBooks:
-        def open(self, path):
+        def open(self, path, **_kw):
             return fake_open(path)
 
     class FakeApp:
         def __init__(self, *args, **kwargs):
-            self.api = types.SimpleNamespace(DisplayAlerts=False)
+            self.api = types.SimpleNamespace(
+                DisplayAlerts=False, Calculation=-4105, ScreenUpdating=True
+            )
             self.books = FakeBooks()
 
         def kill(self):
             pass
 
     monkeypatch.setattr(
-        bid_utils,
+        excel_utils,
         "xw",
         types.SimpleNamespace(
             App=FakeApp,
@@ -267,16 +287,14 @@ def test_insert_bid_rows_custom_headers(monkeypatch, tmp_path, caplog):
                 Direction=types.SimpleNamespace(xlToLeft=1)
             ),
         ),
-        raising=False,
     )
     monkeypatch.setattr(
-        bid_utils,
+        excel_utils,
         "pythoncom",
         types.SimpleNamespace(
             CoInitialize=lambda: None,
             CoUninitialize=lambda: None,
         ),
-        raising=False,
     )
 
     rows = [
@@ -297,20 +315,126 @@ def test_insert_bid_rows_custom_headers(monkeypatch, tmp_path, caplog):
             "adhocinfo3": "X3",
             "ADHOCINFO11": "Z",
         },
+        requires_excel_recalc=True,
     )
     assert calls == ["write"]
     assert header_sheet.row7[0] == "X1"
     assert header_sheet.row7[2] == "X3"
-<<<<<<< HEAD
-    assert header_sheet.row7[1] == ""
-    assert "Received custom headers" in caplog.text
-    assert "Custom headers written to A6, C6" in caplog.text
-    assert "blank headers for B6" in caplog.text
-=======
     assert header_sheet.row7[1] == "H2"
     assert "Received custom headers" in caplog.text
     assert "Custom headers written to A6, C6" in caplog.text
->>>>>>> refs/remotes/origin/main
+    assert "No matching column for custom headers ADHOCINFO11" in caplog.text
+
+
+def test_project_rows_filters_and_orders():
+    from fm_tool_core import bid_utils
+
+    rows = [
+        {"DEST_POSTAL_CD": "2", "LANE_ID": "1", "ORIG_POSTAL_CD": "1"},
+        {"LANE_ID": "2", "ORIG_POSTAL_CD": "1"},
+        {"LANE_ID": "3", "ORIG_POSTAL_CD": None, "DEST_POSTAL_CD": "2"},
+        {"LANE_ID": "4", "ORIG_POSTAL_CD": "1", "DEST_POSTAL_CD": ""},
+    ]
+    data = bid_utils._project_rows(rows)
+    assert len(data) == 1
+    assert data[0][0] == "1"
+    assert data[0][6] == "2"
+    assert data[0][1] == ""
+    assert len(data[0]) == len(bid_utils._COLUMNS)
+
+
+def _make_workbook(path):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    rfp = wb.active
+    rfp.title = "RFP"
+    rfp.append(["Lane ID", "Orig City"])
+    rfp.append(["0", "Existing"])
+    bid = wb.create_sheet("BID")
+    for col in range(1, 11):
+        bid.cell(row=6, column=col, value=f"Ad Hoc Info {col}")
+        bid.cell(row=7, column=col, value=f"H{col}")
+    wb.save(path)
+
+
+def test_insert_bid_rows_openpyxl(monkeypatch, tmp_path, caplog):
+    from openpyxl import load_workbook
+
+    from fm_tool_core import bid_utils
+
+    def fake_app(*args, **kwargs):
+        raise AssertionError("Excel should not be started")
+
+    monkeypatch.setattr(excel_utils, "xw", types.SimpleNamespace(App=fake_app))
+
+    wb_path = tmp_path / "wb.xlsx"
+    _make_workbook(wb_path)
+    rows = [
+        {
+            "LANE_ID": "1",
+            "ORIG_CITY": "Austin",
+            "ORIG_POSTAL_CD": "11111",
+            "DEST_POSTAL_CD": "22222",
+        },
+        {"LANE_ID": "2", "ORIG_POSTAL_CD": None, "DEST_POSTAL_CD": "3"},
+    ]
+    log = logging.getLogger("test")
+    with caplog.at_level(logging.INFO):
+        bid_utils.insert_bid_rows(wb_path, rows, log)
+
+    ws = load_workbook(wb_path)["RFP"]
+    assert ws.max_row == 3
+    assert ws.cell(row=3, column=1).value == "1"
+    assert ws.cell(row=3, column=2).value == "Austin"
+    assert ws.cell(row=3, column=4).value == "11111"
+    assert "Wrote 1 rows × 25 cols to RFP sheet" in caplog.text
+
+
+def test_insert_bid_rows_openpyxl_extends_table(tmp_path):
+    from openpyxl import load_workbook
+    from openpyxl.worksheet.table import Table
+
+    from fm_tool_core import bid_utils
+
+    wb_path = tmp_path / "wb.xlsx"
+    _make_workbook(wb_path)
+    wb = load_workbook(wb_path)
+    wb["RFP"].add_table(Table(displayName="RFPData", ref="A1:B2"))
+    wb.save(wb_path)
+
+    rows = [
+        {"LANE_ID": str(i), "ORIG_POSTAL_CD": "1", "DEST_POSTAL_CD": "2"}
+        for i in range(3)
+    ]
+    bid_utils.insert_bid_rows(wb_path, rows, logging.getLogger("test"))
+
+    ws = load_workbook(wb_path)["RFP"]
+    assert ws.tables["RFPData"].ref == "A1:B5"
+    assert ws["A5"].value == "2"
+
+
+def test_insert_bid_rows_openpyxl_custom_headers(tmp_path, caplog):
+    from openpyxl import load_workbook
+
+    from fm_tool_core import bid_utils
+
+    wb_path = tmp_path / "wb.xlsx"
+    _make_workbook(wb_path)
+    rows = [{"LANE_ID": "1", "ORIG_POSTAL_CD": "1", "DEST_POSTAL_CD": "2"}]
+    log = logging.getLogger("test")
+    caplog.set_level(logging.INFO)
+    bid_utils.insert_bid_rows(
+        wb_path,
+        rows,
+        log,
+        adhoc_headers={"adhoc info2": "X2", "ADHOCINFO11": "Z"},
+    )
+
+    ws = load_workbook(wb_path)["BID"]
+    assert ws["A7"].value == "H1"
+    assert ws["B7"].value == "X2"
+    assert "Custom headers written to B6" in caplog.text
     assert "No matching column for custom headers ADHOCINFO11" in caplog.text
 
 
@@ -336,19 +460,21 @@ def test_update_adhoc_headers(monkeypatch, tmp_path, caplog):
         return FakeBook()
 
     class FakeBooks:
-        def open(self, path):
+        def open(self, path, **_kw):
             return fake_open(path)
 
     class FakeApp:
         def __init__(self, *args, **kwargs):
-            self.api = types.SimpleNamespace(DisplayAlerts=False)
+            self.api = types.SimpleNamespace(
+                DisplayAlerts=False, Calculation=-4105, ScreenUpdating=True
+            )
             self.books = FakeBooks()
 
         def kill(self):
             pass
 
     monkeypatch.setattr(
-        bid_utils,
+        excel_utils,
         "xw",
         types.SimpleNamespace(
             App=FakeApp,
@@ -356,24 +482,18 @@ def test_update_adhoc_headers(monkeypatch, tmp_path, caplog):
                 Direction=types.SimpleNamespace(xlToLeft=1)
             ),
         ),
-        raising=False,
     )
     monkeypatch.setattr(
-        bid_utils,
+        excel_utils,
         "pythoncom",
         types.SimpleNamespace(
             CoInitialize=lambda: None,
             CoUninitialize=lambda: None,
         ),
-        raising=False,
     )
 
     log = logging.getLogger("test")
-<<<<<<< HEAD
-
-=======
     sheet.row7 = [f"H{i}" for i in range(1, 11)]
->>>>>>> refs/remotes/origin/main
     caplog.set_level(logging.INFO)
     bid_utils.update_adhoc_headers(
         wb_path,
@@ -382,14 +502,210 @@ def test_update_adhoc_headers(monkeypatch, tmp_path, caplog):
     )
     assert sheet.row7[0] == "X1"
     assert sheet.row7[1] == "X2"
-<<<<<<< HEAD
-    assert sheet.row7[2] == ""
-    assert "Received custom headers" in caplog.text
-    assert "Custom headers written to A6, B6" in caplog.text
-    assert "blank headers for C6" in caplog.text
-=======
     assert sheet.row7[2] == "H3"
     assert "Received custom headers" in caplog.text
     assert "Custom headers written to A6, B6" in caplog.text
->>>>>>> refs/remotes/origin/main
     assert "No matching column for custom headers ADHOCINFO11" in caplog.text
+
+
+def test_insert_bid_rows_reuses_session(monkeypatch, tmp_path):
+    from fm_tool_core import bid_utils
+
+    def fake_app(*args, **kwargs):
+        raise AssertionError("session Excel should be reused")
+
+    monkeypatch.setattr(excel_utils, "xw", types.SimpleNamespace(App=fake_app))
+
+    written = []
+
+    class FakeRange:
+        def resize(self, _r, _c):
+            return self
+
+        def options(self, **_kwargs):
+            return self
+
+        @property
+        def value(self):  # pragma: no cover - simple mock
+            return None
+
+        @value.setter
+        def value(self, val):
+            written.append(val)
+
+    sheet = types.SimpleNamespace(
+        api=types.SimpleNamespace(
+            Columns=lambda _c: types.SimpleNamespace(
+                Find=lambda **_kw: types.SimpleNamespace(Row=1)
+            ),
+            ListObjects=NO_TABLES,
+        ),
+        range=lambda _addr: FakeRange(),
+    )
+    app = types.SimpleNamespace(
+        api=types.SimpleNamespace(Calculation=-4105, ScreenUpdating=True)
+    )
+    wb = types.SimpleNamespace(sheets={"RFP": sheet})
+    rows = [{"LANE_ID": "1", "ORIG_POSTAL_CD": "1", "DEST_POSTAL_CD": "2"}]
+
+    bid_utils.insert_bid_rows(
+        tmp_path / "wb.xlsx",
+        rows,
+        logging.getLogger("test"),
+        session=(app, wb),
+    )
+    assert len(written) == 1
+
+
+def test_last_used_row_single_find():
+    from fm_tool_core import bid_utils
+
+    seen = []
+
+    def find(**kw):
+        seen.append(kw)
+        return types.SimpleNamespace(Row=42.0)
+
+    ws_api = types.SimpleNamespace(
+        Columns=lambda _c: types.SimpleNamespace(Find=find),
+    )
+    assert bid_utils._last_used_row(ws_api) == 42
+    assert seen[0]["SearchDirection"] == bid_utils._XL_PREVIOUS
+
+    empty = types.SimpleNamespace(
+        Columns=lambda _c: types.SimpleNamespace(Find=lambda **_kw: None)
+    )
+    assert bid_utils._last_used_row(empty) == 1  # data starts at row 2
+
+
+def test_insert_bid_rows_large_block_uses_recordset(monkeypatch, tmp_path):
+    from fm_tool_core import bid_utils
+
+    copied = []
+    rs = types.SimpleNamespace(Close=MagicMock())
+    monkeypatch.setattr(bid_utils, "_RECORDSET_MIN_ROWS", 2)
+    monkeypatch.setattr(bid_utils, "_open_recordset", lambda _data: rs)
+
+    def cells(_r, _c):
+        return types.SimpleNamespace(CopyFromRecordset=copied.append)
+
+    sheet = types.SimpleNamespace(
+        api=types.SimpleNamespace(
+            Cells=cells,
+            Columns=lambda _c: types.SimpleNamespace(
+                Find=lambda **_kw: types.SimpleNamespace(Row=1)
+            ),
+            ListObjects=NO_TABLES,
+        ),
+        range=MagicMock(side_effect=AssertionError("SAFEARRAY path used")),
+    )
+    app = types.SimpleNamespace(
+        api=types.SimpleNamespace(Calculation=-4105, ScreenUpdating=True)
+    )
+    wb = types.SimpleNamespace(sheets={"RFP": sheet})
+    rows = [
+        {"LANE_ID": str(i), "ORIG_POSTAL_CD": "1", "DEST_POSTAL_CD": "2"}
+        for i in range(3)
+    ]
+
+    bid_utils.insert_bid_rows(
+        tmp_path / "wb.xlsx",
+        rows,
+        logging.getLogger("test"),
+        session=(app, wb),
+    )
+    assert copied == [rs]
+    rs.Close.assert_called_once_with()
+    assert app.api.Calculation == -4105
+
+
+def _modules_after_import(*names: str) -> list[str]:
+    code = (
+        "import sys, fm_tool_core.process_fm_tool; "
+        f"print(*(m for m in {names!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return out.stdout.split()
+
+
+def test_import_leaves_openpyxl_and_numpy_unloaded():
+    assert _modules_after_import("openpyxl", "numpy") == []
+
+
+def _fake_win32com(monkeypatch, rs):
+    client = types.SimpleNamespace(Dispatch=lambda _progid: rs)
+    win32com = types.SimpleNamespace(client=client)
+    monkeypatch.setitem(sys.modules, "win32com", win32com)
+    monkeypatch.setitem(sys.modules, "win32com.client", client)
+
+
+def test_open_recordset_keeps_cell_types(monkeypatch):
+    from fm_tool_core import bid_utils
+
+    rs = MagicMock()
+    _fake_win32com(monkeypatch, rs)
+    row = ["x"] * len(bid_utils._COLUMNS)
+    row[8] = 2
+    row[9] = ""
+
+    assert bid_utils._open_recordset([row, row]) is rs
+    kinds = [c.args[1] for c in rs.Fields.Append.call_args_list]
+    assert kinds[8] == bid_utils._AD_DOUBLE
+    assert kinds[0] == bid_utils._AD_VAR_WCHAR
+    values = rs.AddNew.call_args.args[1]
+    assert values[8] == 2.0 and values[9] is None and values[0] == "x"
+
+
+def test_open_recordset_falls_back_to_safearray(monkeypatch):
+    from fm_tool_core import bid_utils
+
+    rs = MagicMock()
+    _fake_win32com(monkeypatch, rs)
+    row = ["x"] * len(bid_utils._COLUMNS)
+    mixed = list(row)
+    mixed[8] = 2.5
+
+    # a number in a text column would come back as text
+    assert bid_utils._open_recordset([row, mixed]) is None
+    rs.Fields.Append.assert_not_called()
+
+    rs.Open.side_effect = Exception("provider missing")
+    assert bid_utils._open_recordset([row]) is None
+    rs.Close.assert_called_once_with()
+
+
+def test_extend_list_objects_resizes_table_above_block():
+    from fm_tool_core import bid_utils
+
+    def table(row, n_rows, col=1):
+        rng = types.SimpleNamespace(
+            Row=row,
+            Column=col,
+            Rows=types.SimpleNamespace(Count=n_rows),
+            Columns=types.SimpleNamespace(Count=4),
+        )
+        return types.SimpleNamespace(Range=rng, Resize=MagicMock())
+
+    above, elsewhere = table(1, 5), table(1, 5, col=8)
+    tables = [above, elsewhere]
+
+    class ListObjects:
+        Count = len(tables)
+
+        def __call__(self, i):  # COM collections are 1-based
+            return tables[i - 1]
+
+    ws_api = types.SimpleNamespace(
+        ListObjects=ListObjects(),
+        Cells=lambda r, c: (r, c),
+        Range=lambda a, b: (a, b),
+    )
+
+    bid_utils._extend_list_objects(ws_api, 6, 105)
+    above.Resize.assert_called_once_with(((1, 1), (105, 4)))
+    elsewhere.Resize.assert_not_called()
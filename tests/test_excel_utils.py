@@ -1,9 +1,40 @@
+import logging
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+import pytest
+
 from fm_tool_core import excel_utils
 
+# HOME ranges written as one block, and the cells each block covers
+_BLOCKS = {
+    "D10": ["D10", "E10", "F10", "G10", "H10"],
+    "AR36:AR45": [f"AR{36 + i}" for i in range(10)],
+}
+
+
+class _Block:
+    def __init__(self, cells, addrs):
+        self.cells = cells
+        self.addrs = addrs
+
+    @property
+    def value(self):  # pragma: no cover - simple mock
+        return [self.cells[a].value for a in self.addrs]
+
+    @value.setter
+    def value(self, val):
+        flat = [v[0] if isinstance(v, list) else v for v in val]
+        for addr, v in zip(self.addrs, flat):
+            self.cells[addr].value = v
+
+
+def _home_range(cells, addr):
+    if addr in _BLOCKS:
+        return _Block(cells, _BLOCKS[addr])
+    return cells[addr]
+
 
 def test_read_cell_initializes_and_uninitializes(monkeypatch):
     pc = SimpleNamespace(CoInitialize=MagicMock(), CoUninitialize=MagicMock())
@@ -44,8 +75,6 @@ def test_write_home_fields(monkeypatch, tmp_path):
         "F10": SimpleNamespace(value=None),
         "G10": SimpleNamespace(value=None),
         "H10": SimpleNamespace(value=None),
-<<<<<<< HEAD
-=======
         "AR36": SimpleNamespace(value=None),
         "AR37": SimpleNamespace(value=None),
         "AR38": SimpleNamespace(value=None),
@@ -56,16 +85,15 @@ def test_write_home_fields(monkeypatch, tmp_path):
         "AR43": SimpleNamespace(value=None),
         "AR44": SimpleNamespace(value=None),
         "AR45": SimpleNamespace(value=None),
->>>>>>> refs/remotes/origin/main
     }
 
     def range_side_effect(addr):
-        return cells[addr]
+        return _home_range(cells, addr)
 
     sheet = SimpleNamespace(range=MagicMock(side_effect=range_side_effect))
     wb = SimpleNamespace(sheets={"HOME": sheet}, save=MagicMock(), close=MagicMock())
     app = SimpleNamespace(
-        api=SimpleNamespace(),
+        api=SimpleNamespace(Calculation=-4105, ScreenUpdating=True),
         books=SimpleNamespace(open=MagicMock(return_value=wb)),
         kill=MagicMock(),
     )
@@ -74,12 +102,8 @@ def test_write_home_fields(monkeypatch, tmp_path):
     monkeypatch.setattr(excel_utils, "xw", xw_mock)
 
     ids = ["c1", "c2", "c3", "c4", "c5"]
-<<<<<<< HEAD
-    excel_utils.write_home_fields(tmp_path / "wb.xlsx", "pg", "cust", ids)
-=======
     headers = {"ADHOC_INFO1": "A1", "ADHOC_INFO5": "A5", "ADHOC_INFO10": "A10"}
     excel_utils.write_home_fields(tmp_path / "wb.xlsx", "pg", "cust", ids, headers)
->>>>>>> refs/remotes/origin/main
     assert cells["BID"].value == "pg"
     assert cells["D8:H8"].value == "cust"
     assert cells["D8:H8"].api.Validation is validation_obj
@@ -88,8 +112,6 @@ def test_write_home_fields(monkeypatch, tmp_path):
     assert cells["F10"].value == "c3"
     assert cells["G10"].value == "c4"
     assert cells["H10"].value == "c5"
-<<<<<<< HEAD
-=======
     assert cells["AR36"].value == "A1"
     assert cells["AR40"].value == "A5"
     assert cells["AR45"].value == "A10"
@@ -103,6 +125,8 @@ def test_write_home_fields(monkeypatch, tmp_path):
         "AR44",
     ]:
         assert cells[addr].value == ""
+    assert app.api.Calculation == -4105
+    assert app.api.ScreenUpdating is False  # as _get_app left it
     wb.save.assert_called_once_with()
     wb.close.assert_called_once_with()
     app.kill.assert_called_once_with()
@@ -129,14 +153,14 @@ def test_write_home_fields_missing_bid(monkeypatch, tmp_path):
         cells[f"AR{36 + i}"] = SimpleNamespace(value=None)
 
     def range_side_effect(addr):
-        if addr not in cells:
+        if addr not in cells and addr not in _BLOCKS:
             raise KeyError(addr)
-        return cells[addr]
+        return _home_range(cells, addr)
 
     sheet = SimpleNamespace(range=MagicMock(side_effect=range_side_effect))
     wb = SimpleNamespace(sheets={"HOME": sheet}, save=MagicMock(), close=MagicMock())
     app = SimpleNamespace(
-        api=SimpleNamespace(),
+        api=SimpleNamespace(Calculation=-4105, ScreenUpdating=True),
         books=SimpleNamespace(open=MagicMock(return_value=wb)),
         kill=MagicMock(),
     )
@@ -172,12 +196,12 @@ def test_write_home_fields_no_headers_blank(monkeypatch, tmp_path):
         cells[f"AR{36 + i}"] = SimpleNamespace(value=None)
 
     def range_side_effect(addr):
-        return cells[addr]
+        return _home_range(cells, addr)
 
     sheet = SimpleNamespace(range=MagicMock(side_effect=range_side_effect))
     wb = SimpleNamespace(sheets={"HOME": sheet}, save=MagicMock(), close=MagicMock())
     app = SimpleNamespace(
-        api=SimpleNamespace(),
+        api=SimpleNamespace(Calculation=-4105, ScreenUpdating=True),
         books=SimpleNamespace(open=MagicMock(return_value=wb)),
         kill=MagicMock(),
     )
@@ -191,9 +215,735 @@ def test_write_home_fields_no_headers_blank(monkeypatch, tmp_path):
     excel_utils.write_home_fields(tmp_path / "wb.xlsx", None, None, None, None)
     for addr in [f"AR{36 + i}" for i in range(10)]:
         assert cells[addr].value == ""
->>>>>>> refs/remotes/origin/main
     wb.save.assert_called_once_with()
     wb.close.assert_called_once_with()
     app.kill.assert_called_once_with()
     pc.CoInitialize.assert_called_once_with()
     pc.CoUninitialize.assert_called_once_with()
+
+
+def test_optional_modules_imported_lazily(monkeypatch):
+    loads = []
+    monkeypatch.setitem(excel_utils._LAZY, "xw", lambda: loads.append(1) or "xw")
+    monkeypatch.setitem(vars(excel_utils), "xw", None)
+    monkeypatch.delitem(vars(excel_utils), "xw")
+
+    assert not loads
+    assert excel_utils.xw == "xw"
+    assert excel_utils._get_xw() == "xw"
+    assert loads == [1]
+
+
+def test_write_home_fields_restores_screen_updating():
+    # the shared hidden Excel runs with redraws off; keep it that way
+    api = SimpleNamespace(Calculation=-4105, ScreenUpdating=False)
+    app = SimpleNamespace(api=api)
+    wb = SimpleNamespace(sheets={"HOME": MagicMock()})
+
+    excel_utils._write_home_fields_on(app, wb, None, "cust", None, None)
+
+    assert app.api.ScreenUpdating is False
+    assert app.api.Calculation == -4105
+
+
+def test_kill_orphan_excels_uses_snapshot_on_windows(monkeypatch):
+    snap = MagicMock(return_value=True)
+    monkeypatch.setattr(excel_utils.sys, "platform", "win32")
+    monkeypatch.setattr(excel_utils, "_snapshot_kill_excels", snap)
+    ps = SimpleNamespace(process_iter=MagicMock(return_value=[]))
+    monkeypatch.setattr(excel_utils, "psutil", ps)
+
+    excel_utils.kill_orphan_excels()
+
+    snap.assert_called_once_with()
+    ps.process_iter.assert_not_called()
+
+
+def test_kill_orphan_excels_scans_proc_on_linux(monkeypatch, tmp_path):
+    procs = {"101": "EXCEL.EXE", "102": "python3", "103": None}
+    for pid, comm in procs.items():
+        (tmp_path / pid).mkdir()
+        if comm:
+            (tmp_path / pid / "comm").write_text(comm + "\n")
+    (tmp_path / "self").mkdir()
+    killed = []
+    monkeypatch.setattr(excel_utils.sys, "platform", "linux")
+    monkeypatch.setattr(excel_utils, "_PROC_ROOT", str(tmp_path))
+    monkeypatch.setattr(excel_utils.os, "kill", lambda p, s: killed.append(p))
+    ps = SimpleNamespace(process_iter=MagicMock(return_value=[]))
+    monkeypatch.setattr(excel_utils, "psutil", ps)
+
+    excel_utils.kill_orphan_excels()
+
+    assert killed == [101]
+    ps.process_iter.assert_not_called()
+
+
+def test_snapshot_kill_declares_handle_signatures(monkeypatch):
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = MagicMock()
+    kernel32.CreateToolhelp32Snapshot.return_value = None  # snapshot failed
+    monkeypatch.setattr(ctypes, "WinDLL", lambda *_a, **_k: kernel32, False)
+
+    assert excel_utils._snapshot_kill_excels() is False
+    snapshot = kernel32.CreateToolhelp32Snapshot
+    assert snapshot.restype is wintypes.HANDLE
+    assert kernel32.OpenProcess.restype is wintypes.HANDLE
+    assert kernel32.CloseHandle.argtypes == [wintypes.HANDLE]
+    assert kernel32.TerminateProcess.argtypes[0] is wintypes.HANDLE
+
+
+def test_snapshot_kill_unavailable_off_windows():
+    if excel_utils.sys.platform == "win32":  # pragma: no cover
+        pytest.skip("exercises the non-Windows fallback")
+    assert excel_utils._snapshot_kill_excels() is False
+
+
+def test_wait_ready_polling_backs_off(monkeypatch):
+    flags = iter([""] * 12 + ["READY"])
+
+    class _Name:
+        @property
+        def refers_to(self):
+            return f'="{next(flags)}"'
+
+    wb = SimpleNamespace(names={excel_utils.READY_NAME: _Name()})
+    monkeypatch.setattr(excel_utils, "_ready_sink", lambda _wb: None)
+    sleep = MagicMock()
+    monkeypatch.setattr(excel_utils.time, "sleep", sleep)
+
+    excel_utils.wait_ready(wb, MagicMock())
+
+    delays = [c.args[0] for c in sleep.call_args_list]
+    assert len(delays) == 12
+    assert delays[0] == excel_utils.POLL_SLEEP
+    assert delays == sorted(delays)
+    assert delays[-1] == excel_utils._POLL_SLEEP_CAP
+
+
+def test_wait_ready_wakes_on_workbook_event(monkeypatch):
+    flags = iter(["", "READY"])
+
+    class _Name:
+        @property
+        def refers_to(self):
+            return f'="{next(flags)}"'
+
+    wb = SimpleNamespace(names={excel_utils.READY_NAME: _Name()})
+    sink = SimpleNamespace(event=excel_utils.threading.Event())
+    sink.event.set()
+    monkeypatch.setattr(excel_utils, "_ready_sink", lambda _wb: sink)
+    monkeypatch.setattr(
+        excel_utils,
+        "pythoncom",
+        SimpleNamespace(PumpWaitingMessages=sink.event.set),
+    )
+    monkeypatch.setattr(
+        excel_utils.time,
+        "sleep",
+        MagicMock(side_effect=AssertionError("polled")),
+    )
+
+    excel_utils.wait_ready(wb, MagicMock())
+
+
+def test_com_apartment_initialises_once_per_thread(monkeypatch):
+    pc = SimpleNamespace(CoInitialize=MagicMock(), CoUninitialize=MagicMock())
+    monkeypatch.setattr(excel_utils, "pythoncom", pc)
+
+    with excel_utils.com_apartment():
+        with excel_utils.com_apartment():
+            pc.CoInitialize.assert_called_once_with()
+        pc.CoUninitialize.assert_not_called()
+    pc.CoUninitialize.assert_called_once_with()
+
+
+def test_run_excel_macro_reopens_workbook_on_transient_rpc(monkeypatch):
+    fresh = SimpleNamespace(close=MagicMock())
+    app = SimpleNamespace(
+        api=SimpleNamespace(Ready=True),
+        kill=MagicMock(),
+        books=SimpleNamespace(open=MagicMock(return_value=fresh)),
+    )
+    wb = SimpleNamespace(close=MagicMock())
+    opener = MagicMock(return_value=(app, wb))
+    err = Exception("call failed")
+    err.hresult = excel_utils.RPC_E_CALL_FAILED
+    run = MagicMock(side_effect=[err, None])
+    monkeypatch.setattr(excel_utils, "_open_excel_with_timeout", opener)
+    monkeypatch.setattr(excel_utils, "_run_macro_on", run)
+    scan = MagicMock()
+    monkeypatch.setattr(excel_utils, "kill_orphan_excels", scan)
+    monkeypatch.setattr(excel_utils.time, "sleep", lambda _s: None)
+    pc = SimpleNamespace(CoInitialize=MagicMock(), CoUninitialize=MagicMock())
+    monkeypatch.setattr(excel_utils, "pythoncom", pc)
+
+    excel_utils.run_excel_macro(Path("wb.xlsm"), ("a",), MagicMock())
+
+    opener.assert_called_once()
+    scan.assert_not_called()  # process_row already cleared orphans
+    assert [c.args[0] for c in run.call_args_list] == [wb, fresh]
+    wb.close.assert_called_once_with()  # partly run book discarded unsaved
+    app.books.open.assert_called_once_with("wb.xlsm")
+    fresh.close.assert_called_once_with()
+    app.kill.assert_called_once_with()
+
+
+def test_run_excel_macro_times_out_without_polling(monkeypatch):
+    release = excel_utils.threading.Event()
+    monkeypatch.setattr(excel_utils, "READY_TO", 0.05)
+    monkeypatch.setattr(
+        excel_utils,
+        "_run_macro_attempts",
+        lambda *_a, **_k: release.wait(5),
+    )
+    killer = MagicMock()
+    monkeypatch.setattr(excel_utils, "kill_orphan_excels", killer)
+    monkeypatch.setattr(
+        excel_utils.time,
+        "sleep",
+        MagicMock(side_effect=AssertionError("polled")),
+    )
+
+    with pytest.raises(excel_utils.FlowError):
+        excel_utils.run_excel_macro(Path("wb.xlsm"), (), MagicMock())
+    release.set()
+    killer.assert_not_called()  # never a host-wide kill from one row
+
+
+def test_failed_excel_start_is_retried(monkeypatch):
+    app = SimpleNamespace(kill=MagicMock())
+    wb = SimpleNamespace(close=MagicMock())
+    err = Exception("server unavailable")
+    err.hresult = excel_utils.RPC_E_SERVER_UNAVAILABLE
+    opener = MagicMock(side_effect=[err, (app, wb)])
+    monkeypatch.setattr(excel_utils, "_open_excel_with_timeout", opener)
+    run = MagicMock(return_value=["ok"])
+    monkeypatch.setattr(excel_utils, "_run_macro_on", run)
+    scan = MagicMock()
+    monkeypatch.setattr(excel_utils, "kill_orphan_excels", scan)
+    monkeypatch.setattr(excel_utils.time, "sleep", lambda _s: None)
+    state = {"pids": {}, "aborted": False, "coords": None}
+
+    excel_utils._run_macro_attempts(
+        Path("wb.xlsm"), (), MagicMock(), state, retries=3, backoff=0
+    )
+    assert opener.call_count == 2
+    assert state["values"] == ["ok"]
+    scan.assert_not_called()
+
+
+def test_excel_started_after_timeout_is_closed(monkeypatch):
+    app = SimpleNamespace(kill=MagicMock())
+    wb = SimpleNamespace(close=MagicMock())
+    state = {"pids": {}, "aborted": False}
+
+    def _open(_path, _log, pids):
+        state["aborted"] = True  # watchdog fired while Excel was starting
+        pids[4242] = None
+        return app, wb
+
+    monkeypatch.setattr(excel_utils, "_open_excel_with_timeout", _open)
+    run = MagicMock()
+    monkeypatch.setattr(excel_utils, "_run_macro_on", run)
+
+    with pytest.raises(excel_utils.FlowError, match="Timeout"):
+        excel_utils._run_macro_attempts(
+            Path("wb.xlsm"), (), MagicMock(), state, retries=3, backoff=0
+        )
+    run.assert_not_called()
+    app.kill.assert_called_once_with()
+    assert state["pids"] == {}
+
+
+def test_ready_event_name_removed_before_save(monkeypatch):
+    order = []
+    name = SimpleNamespace(delete=lambda: order.append("delete"))
+    handle = SimpleNamespace(Close=lambda: order.append("close"))
+    done = excel_utils._XL_CALC_DONE
+    xl = SimpleNamespace(CalculationState=done)
+    wb = SimpleNamespace(
+        names={excel_utils.READY_EVENT_NAME: name},
+        api=SimpleNamespace(Application=xl),
+        save=lambda: order.append("save"),
+    )
+    monkeypatch.setattr(excel_utils, "_ready_signals", lambda _wb: [handle])
+    monkeypatch.setattr(excel_utils, "safe_run_macro", MagicMock())
+    monkeypatch.setattr(excel_utils, "wait_ready", MagicMock())
+
+    excel_utils._run_macro_on(wb, (), MagicMock())
+    assert order == ["delete", "close", "save"]
+
+
+def test_ready_signals_are_unique_per_run(monkeypatch):
+    created = []
+
+    def create_event(_sa, _manual_reset, _initial, name):
+        created.append(name)
+        return MagicMock()
+
+    win32event = SimpleNamespace(CreateEvent=create_event)
+    monkeypatch.setitem(excel_utils.sys.modules, "win32event", win32event)
+    books = [MagicMock(), MagicMock()]
+
+    for wb in books:
+        assert len(excel_utils._ready_signals(wb)) == 2
+
+    assert len(set(created)) == 4
+    for wb, (ok, err) in zip(books, (created[:2], created[2:])):
+        name, refers_to = wb.names.add.call_args.args
+        token = refers_to.strip('="')
+        assert name == excel_utils.READY_EVENT_NAME
+        assert ok == f"{excel_utils.READY_EVENT_OK}_{token}"
+        assert err == f"{excel_utils.READY_EVENT_ERR}_{token}"
+
+
+def test_wait_ready_returns_on_named_event(monkeypatch):
+    win32event = SimpleNamespace(
+        WAIT_OBJECT_0=0,
+        QS_ALLINPUT=0xFF,
+        MsgWaitForMultipleObjects=MagicMock(return_value=0),
+    )
+    monkeypatch.setitem(excel_utils.sys.modules, "win32event", win32event)
+    monkeypatch.setattr(excel_utils, "_ready_sink", lambda _wb: None)
+    reads = []
+    monkeypatch.setattr(
+        excel_utils,
+        "_read_ready_flag",
+        lambda _wb, _cache: reads.append(1) or "",
+    )
+
+    excel_utils.wait_ready(object(), MagicMock(), signals=["ok", "err"])
+
+    assert reads == [1]
+    win32event.MsgWaitForMultipleObjects.assert_called_once()
+
+
+def test_run_excel_macro_circuit_breaker(monkeypatch):
+    monkeypatch.setattr(
+        excel_utils,
+        "_breaker",
+        {"state": "closed", "fails": 0, "opened_at": 0.0, "probe": None},
+    )
+    monkeypatch.setattr(excel_utils, "BREAKER_THRESHOLD", 2)
+    monkeypatch.setattr(excel_utils, "BREAKER_COOLDOWN", 60)
+    inner = MagicMock(side_effect=excel_utils.FlowError("boom"))
+    monkeypatch.setattr(excel_utils, "_run_excel_macro", inner)
+    log = MagicMock()
+
+    for _ in range(2):
+        with pytest.raises(excel_utils.FlowError, match="boom"):
+            excel_utils.run_excel_macro(Path("wb.xlsm"), (), log)
+    with pytest.raises(excel_utils.FlowError, match="circuit open"):
+        excel_utils.run_excel_macro(Path("wb.xlsm"), (), log)
+    assert inner.call_count == 2
+
+    # after the cooldown one probe runs; success closes the circuit
+    excel_utils._breaker["opened_at"] -= 61
+    inner.side_effect = None
+    excel_utils.run_excel_macro(Path("wb.xlsm"), (), log)
+    assert excel_utils._breaker["state"] == "closed"
+    assert excel_utils._breaker["fails"] == 0
+
+
+def test_breaker_scope_counts_row_retries_once(monkeypatch):
+    monkeypatch.setattr(
+        excel_utils,
+        "_breaker",
+        {"state": "closed", "fails": 0, "opened_at": 0.0, "probe": None},
+    )
+    monkeypatch.setattr(excel_utils, "BREAKER_THRESHOLD", 2)
+    inner = MagicMock(side_effect=excel_utils.FlowError("boom"))
+    monkeypatch.setattr(excel_utils, "_run_excel_macro", inner)
+
+    with excel_utils.breaker_scope():
+        for _ in range(3):
+            with pytest.raises(excel_utils.FlowError, match="boom"):
+                excel_utils.run_excel_macro(Path("wb.xlsm"), (), MagicMock())
+
+    assert inner.call_count == 3  # retries not cut short by the breaker
+    assert excel_utils._breaker["fails"] == 1
+    assert excel_utils._breaker["state"] == "closed"
+
+
+def test_breaker_half_open_admits_one_probe(monkeypatch):
+    monkeypatch.setattr(
+        excel_utils,
+        "_breaker",
+        {"state": "open", "fails": 3, "opened_at": 0.0, "probe": None},
+    )
+    monkeypatch.setattr(excel_utils, "BREAKER_COOLDOWN", 60)
+    log = MagicMock()
+    rejected = []
+
+    def other_row():
+        try:
+            excel_utils._breaker_enter(log)
+        except excel_utils.FlowError:
+            rejected.append(True)
+
+    excel_utils._breaker_enter(log)  # this thread becomes the probe
+    excel_utils._breaker_enter(log)  # ... and may retry
+    th = excel_utils.threading.Thread(target=other_row)
+    th.start()
+    th.join()
+    assert rejected == [True]
+
+    excel_utils._breaker_record(True, log)
+    th = excel_utils.threading.Thread(target=other_row)
+    th.start()
+    th.join()
+    assert rejected == [True]
+    assert excel_utils._breaker["probe"] is None
+
+
+def test_backoff_delay_grows_and_caps(monkeypatch):
+    monkeypatch.setattr(excel_utils.random, "uniform", lambda _a, b: b)
+    backoff = excel_utils._backoff_delay
+    delays = [backoff(n, base=1.0, cap=30.0) for n in range(6)]
+    assert delays == [1.5, 3.0, 6.0, 12.0, 24.0, 45.0]
+
+
+def test_read_cell_reuses_excel_within_apartment(monkeypatch):
+    pc = SimpleNamespace(CoInitialize=MagicMock(), CoUninitialize=MagicMock())
+    monkeypatch.setattr(excel_utils, "pythoncom", pc)
+    m_sheet = MagicMock()
+    m_sheet.range.return_value = SimpleNamespace(value="v")
+    m_wb = MagicMock()
+    m_wb.sheets = {excel_utils.SCAC_VALIDATION_SHEET: m_sheet}
+    m_app = MagicMock()
+    m_app.api.Ready = True
+    m_app.books.open.return_value = m_wb
+    new_app = MagicMock(return_value=m_app)
+    monkeypatch.setattr(excel_utils, "xw", SimpleNamespace(App=new_app))
+
+    with excel_utils.com_apartment():
+        excel_utils.read_cell(Path("a.xlsm"), "A", "1")
+        excel_utils.read_cell(Path("a.xlsm"), "B", "2")
+        m_app.kill.assert_not_called()
+
+    new_app.assert_called_once()
+    assert m_wb.close.call_count == 2
+    m_app.kill.assert_called_once_with()
+
+
+def test_read_cells_fetches_one_block(monkeypatch):
+    pc = SimpleNamespace(CoInitialize=MagicMock(), CoUninitialize=MagicMock())
+    monkeypatch.setattr(excel_utils, "pythoncom", pc)
+    block = MagicMock()
+    block.resize.return_value.options.return_value.value = [
+        ["B3", None, "D3"],
+        [None, None, None],
+        [None, "C5", None],
+    ]
+    m_sheet = MagicMock()
+    m_sheet.range.return_value = block
+    m_wb = MagicMock()
+    m_wb.sheets = {excel_utils.SCAC_VALIDATION_SHEET: m_sheet}
+    m_app = MagicMock()
+    m_app.books.open.return_value = m_wb
+    monkeypatch.setattr(
+        excel_utils, "xw", SimpleNamespace(App=MagicMock(return_value=m_app))
+    )
+
+    cells = [("D", "3"), ("c", 5), ("B", "3")]
+    values = excel_utils.read_cells(Path("a.xlsm"), cells)
+
+    assert values == ["D3", "C5", "B3"]
+    m_sheet.range.assert_called_once_with((3, 2))
+    block.resize.assert_called_once_with(3, 3)
+    m_app.books.open.assert_called_once_with(
+        "a.xlsm", update_links=False, read_only=True
+    )
+    assert m_app.api.EnableEvents is True
+
+
+def test_copy_template_retries_locked_destination(monkeypatch, tmp_path):
+    src = tmp_path / "template.xlsm"
+    src.write_bytes(b"xlsm")
+    real_copy = excel_utils._fast_copy
+    calls = []
+
+    def _copy(s, d):
+        calls.append(d)
+        if len(calls) == 1:
+            raise PermissionError("locked")
+        real_copy(s, d)
+
+    monkeypatch.setattr(excel_utils, "_fast_copy", _copy)
+    log = SimpleNamespace(warning=lambda *a, **k: None)
+
+    out = str(tmp_path / "out")
+    dst = excel_utils.copy_template(str(src), out, "new.xlsm", log)
+
+    assert dst.read_bytes() == b"xlsm"
+    assert len(calls) == 2
+
+
+def test_fast_copy_reads_template_once(monkeypatch, tmp_path):
+    src = tmp_path / "template.xlsm"
+    src.write_bytes(b"v1")
+    monkeypatch.setattr(excel_utils, "_template_cache", {})
+    reads = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(
+        Path, "read_bytes", lambda self: reads.append(self) or read_bytes(self)
+    )
+
+    excel_utils._fast_copy(src, tmp_path / "a.xlsm")
+    excel_utils._fast_copy(src, tmp_path / "b.xlsm")
+    assert (tmp_path / "b.xlsm").read_bytes() == b"v1"
+    assert reads.count(src) == 1
+
+    src.write_bytes(b"v2-changed")  # new size -> cache entry is stale
+    excel_utils._fast_copy(src, tmp_path / "c.xlsm")
+    assert (tmp_path / "c.xlsm").read_bytes() == b"v2-changed"
+    assert reads.count(src) == 2
+
+
+def test_run_excel_macro_timeout_kills_own_excel(monkeypatch):
+    release = excel_utils.threading.Event()
+    monkeypatch.setattr(excel_utils, "READY_TO", 0.05)
+
+    def _attempts(_p, _a, _l, state, **_k):
+        state["pids"][4242] = 100.0
+        release.wait(5)
+
+    monkeypatch.setattr(excel_utils, "_run_macro_attempts", _attempts)
+    scan = MagicMock()
+    monkeypatch.setattr(excel_utils, "kill_orphan_excels", scan)
+    proc = MagicMock()
+    proc.name.return_value = "EXCEL.EXE"
+    proc.create_time.return_value = 100.0
+    ps = SimpleNamespace(Process=MagicMock(return_value=proc))
+    monkeypatch.setattr(excel_utils, "psutil", ps)
+
+    with pytest.raises(excel_utils.FlowError):
+        excel_utils.run_excel_macro(Path("wb.xlsm"), (), MagicMock())
+    release.set()
+    ps.Process.assert_called_once_with(4242)
+    proc.kill.assert_called_once_with()
+    scan.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "name, started", [("notepad.exe", 100.0), ("EXCEL.EXE", 200.0)]
+)
+def test_kill_pids_skips_reused_pids(monkeypatch, name, started):
+    proc = MagicMock()
+    proc.name.return_value = name
+    proc.create_time.return_value = started
+    ps = SimpleNamespace(Process=MagicMock(return_value=proc))
+    monkeypatch.setattr(excel_utils, "psutil", ps)
+    pids = {4242: 100.0}
+
+    excel_utils._kill_pids(pids)
+
+    proc.kill.assert_not_called()
+    assert pids == {}
+
+
+def test_pump_wait_dispatches_messages_until_deadline(monkeypatch):
+    clock = iter([0.0, 0.1, 0.6])
+    monkeypatch.setattr(excel_utils.time, "time", lambda: next(clock))
+    win32event = SimpleNamespace(
+        WAIT_OBJECT_0=0,
+        QS_ALLINPUT=0xFF,
+        MsgWaitForMultipleObjects=MagicMock(return_value=0),
+    )
+    monkeypatch.setitem(excel_utils.sys.modules, "win32event", win32event)
+    pc = SimpleNamespace(PumpWaitingMessages=MagicMock())
+    monkeypatch.setattr(excel_utils, "pythoncom", pc)
+
+    excel_utils._pump_wait(0.5)
+
+    waits = win32event.MsgWaitForMultipleObjects.call_args_list
+    assert [c.args[2] for c in waits] == [500, 400]
+    assert pc.PumpWaitingMessages.call_count == 2
+
+
+def test_read_ready_flag_caches_name():
+    lookups = []
+    name = SimpleNamespace(refers_to='="OK"')
+
+    class _Names:
+        def __getitem__(self, key):
+            lookups.append(key)
+            return name
+
+    wb = SimpleNamespace(names=_Names())
+    cache = {}
+
+    assert excel_utils._read_ready_flag(wb, cache) == "OK"
+    assert excel_utils._read_ready_flag(wb, cache) == "OK"
+    assert lookups == [excel_utils.READY_NAME]
+
+
+def _validation_book(path, cells):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = excel_utils.SCAC_VALIDATION_SHEET
+    for addr, value in cells.items():
+        ws[addr] = value
+    wb.save(path)
+
+
+def test_read_cells_uses_cached_values_without_excel(monkeypatch, tmp_path):
+    path = tmp_path / "book.xlsx"
+    _validation_book(path, {"B3": "HUMD_VAN", "D5": 7})
+    new_app = MagicMock(side_effect=AssertionError("Excel started"))
+    monkeypatch.setattr(excel_utils, "xw", SimpleNamespace(App=new_app))
+
+    cells = [("B", "3"), ("d", 5)]
+    assert excel_utils.read_cells(path, cells) == ["HUMD_VAN", 7]
+
+
+def test_read_cells_falls_back_to_excel_without_cache(monkeypatch, tmp_path):
+    path = tmp_path / "book.xlsx"
+    _validation_book(path, {"B3": "HUMD_VAN", "D5": "=1+1"})
+    pc = SimpleNamespace(CoInitialize=MagicMock(), CoUninitialize=MagicMock())
+    monkeypatch.setattr(excel_utils, "pythoncom", pc)
+    m_sheet = MagicMock()
+    m_sheet.range.return_value = SimpleNamespace(value=2.0)
+    m_wb = MagicMock()
+    m_wb.sheets = {excel_utils.SCAC_VALIDATION_SHEET: m_sheet}
+    m_app = MagicMock()
+    m_app.books.open.return_value = m_wb
+    monkeypatch.setattr(
+        excel_utils, "xw", SimpleNamespace(App=MagicMock(return_value=m_app))
+    )
+
+    assert excel_utils.read_cells(path, [("D", 5)]) == [2.0]
+    m_app.books.open.assert_called_once()
+
+
+def test_macro_subprocess_reports_worker_error(monkeypatch, tmp_path):
+    if excel_utils._load_xw() is not None:  # pragma: no cover
+        pytest.skip("needs a worker without xlwings")
+    log = excel_utils.logging.getLogger("fm_tool_subprocess_test")
+    handler = excel_utils.logging.FileHandler(tmp_path / "run.log")
+    log.addHandler(handler)
+    try:
+        with pytest.raises(excel_utils.FlowError, match="xlwings"):
+            excel_utils._run_macro_subprocess(Path("wb.xlsm"), ("a",), log)
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+    assert "Macro worker started" in (tmp_path / "run.log").read_text()
+
+
+def test_macro_subprocess_timeout_kills_only_its_excel(monkeypatch):
+    import multiprocessing
+
+    hang, _keep_open = multiprocessing.Pipe(duplex=False)
+    procs = []
+
+    class _Worker:
+        def __init__(self, target, args, daemon):
+            self.conn = args[4]
+            self.sentinel = hang  # never becomes ready
+            self.kill = MagicMock()
+            procs.append(self)
+
+        def start(self):
+            self.conn.send(("pid", 4242, 1.0))
+            # a real worker keeps its own copy of the write end open
+            self.write_end = excel_utils.os.dup(self.conn.fileno())
+
+        def join(self, _timeout=None):
+            pass
+
+    ctx = SimpleNamespace(Pipe=multiprocessing.Pipe, Process=_Worker)
+    monkeypatch.setattr(multiprocessing, "get_context", lambda _m: ctx)
+    monkeypatch.setattr(excel_utils, "_SUBPROCESS_LIMIT", 0.2)
+    killed = []
+    monkeypatch.setattr(excel_utils, "_kill_pids", lambda p: killed.append(p))
+    scan = MagicMock()
+    monkeypatch.setattr(excel_utils, "kill_orphan_excels", scan)
+
+    with pytest.raises(excel_utils.FlowError, match="Timeout"):
+        excel_utils._run_macro_subprocess(Path("wb.xlsm"), (), MagicMock())
+
+    excel_utils.os.close(procs[0].write_end)
+    procs[0].kill.assert_called_once_with()
+    assert killed == [{4242: 1.0}]
+    scan.assert_not_called()
+
+
+def test_com_apartment_mta_falls_back_to_sta(monkeypatch):
+    monkeypatch.setattr(excel_utils, "COM_MTA", True)
+    pc = SimpleNamespace(
+        COINIT_MULTITHREADED=0,
+        CoInitializeEx=MagicMock(side_effect=Exception("changed mode")),
+        CoInitialize=MagicMock(),
+        CoUninitialize=MagicMock(),
+    )
+    monkeypatch.setattr(excel_utils, "pythoncom", pc)
+
+    with excel_utils.com_apartment():
+        pass
+    pc.CoInitializeEx.assert_called_once_with(0)
+    pc.CoInitialize.assert_called_once_with()
+
+    pc.CoInitializeEx.side_effect = None
+    with excel_utils.com_apartment():
+        pass
+    pc.CoInitialize.assert_called_once_with()
+    assert pc.CoUninitialize.call_count == 2
+
+
+def test_run_excel_macro_reads_cells_before_closing(monkeypatch):
+    app = SimpleNamespace(api=SimpleNamespace(Ready=True), kill=MagicMock())
+    wb = SimpleNamespace(close=MagicMock())
+    opener = MagicMock(return_value=(app, wb))
+    monkeypatch.setattr(excel_utils, "_open_excel_with_timeout", opener)
+    run = MagicMock(return_value=["HUMD_VAN"])
+    monkeypatch.setattr(excel_utils, "_run_macro_on", run)
+    pc = SimpleNamespace(CoInitialize=MagicMock(), CoUninitialize=MagicMock())
+    monkeypatch.setattr(excel_utils, "pythoncom", pc)
+
+    values = excel_utils.run_excel_macro(
+        Path("wb.xlsm"), ("a",), MagicMock(), cells=[("B", "3")]
+    )
+
+    assert values == ["HUMD_VAN"]
+    assert run.call_args.args[3] == [(3, 2)]
+    wb.close.assert_called_once_with()
+
+
+def test_recompress_xlsm_keeps_contents_and_vba_part(tmp_path):
+    import zipfile
+
+    path = tmp_path / "book.xlsm"
+    xml = b"<row><c>HUMD_VAN</c></row>" * 5000
+    vba = bytes(range(256)) * 8
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/worksheets/sheet1.xml", xml, zipfile.ZIP_DEFLATED, 1)
+        zf.writestr("xl/vbaProject.bin", vba, zipfile.ZIP_STORED)
+    before = path.stat().st_size
+
+    assert excel_utils.recompress_xlsm(path) is True
+    assert path.stat().st_size < before
+    with zipfile.ZipFile(path) as zf:
+        assert zf.read("xl/worksheets/sheet1.xml") == xml
+        assert zf.read("xl/vbaProject.bin") == vba
+        info = zf.getinfo("xl/vbaProject.bin")
+        assert info.compress_type == zipfile.ZIP_STORED
+    assert list(tmp_path.iterdir()) == [path]  # temp file cleaned up
+
+
+@pytest.mark.parametrize("state, recalcs", [(0, 0), (2, 1)])
+def test_run_macro_on_recalcs_only_when_pending(monkeypatch, state, recalcs):
+    monkeypatch.setattr(excel_utils, "_ready_signals", lambda _wb: None)
+    monkeypatch.setattr(excel_utils, "safe_run_macro", MagicMock())
+    monkeypatch.setattr(excel_utils, "wait_ready", MagicMock())
+    wb = MagicMock()
+    wb.api.Application.CalculationState = state
+
+    excel_utils._run_macro_on(wb, (), MagicMock())
+
+    assert wb.api.Application.CalculateFull.call_count == recalcs
+    wb.save.assert_called_once_with()
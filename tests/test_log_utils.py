@@ -0,0 +1,26 @@
+import logging
+
+from fm_tool_core import log_utils
+
+
+def test_log_formatter_reuses_timestamp_within_second(monkeypatch):
+    fmt = log_utils.LogFormatter()
+    calls = []
+    strftime = log_utils.time.strftime
+    monkeypatch.setattr(
+        log_utils.time,
+        "strftime",
+        lambda *a: calls.append(a) or strftime(*a),
+    )
+
+    def rec(created):
+        r = logging.LogRecord("t", logging.INFO, __file__, 1, "hi", (), None)
+        r.created = created
+        return r
+
+    a = fmt.format(rec(1000.1))
+    b = fmt.format(rec(1000.9))
+    c = fmt.format(rec(1001.0))
+    assert len(calls) == 2
+    assert a.split(" | ")[0] == b.split(" | ")[0] != c.split(" | ")[0]
+    assert a.endswith("| INFO | hi")
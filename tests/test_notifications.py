@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-from types import SimpleNamespace
-from unittest.mock import ANY, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -11,16 +10,6 @@ import fm_tool_core as core
 from fm_tool_core.exceptions import FlowError
 
 
-class _FakeWorkbook:
-    """Minimal stub used by run_flow tests."""
-
-    sheets = [SimpleNamespace(range=lambda _: SimpleNamespace(value="HUMD_VAN"))]
-
-    def save(self): ...
-
-    def close(self): ...
-
-
 @pytest.fixture
 def payload(tmp_path):
     folder = str(tmp_path)
@@ -54,17 +43,16 @@ def test_success_email_sent(monkeypatch, payload):
 
     monkeypatch.setenv("NOTIFY_EMAIL", "notify@example.com")
     with patch(
-        "fm_tool_core.process_fm_tool.run_excel_macro", return_value=_FakeWorkbook()
-    ), patch(
-        "fm_tool_core.process_fm_tool.read_cell", side_effect=["HUMD_VAN", "ok"]
-    ), patch(
-        "fm_tool_core.process_fm_tool.sp_ctx"
-    ), patch(
+        "fm_tool_core.process_fm_tool.run_excel_macro",
+        return_value=["HUMD_VAN", "ok"],
+    ), patch("fm_tool_core.process_fm_tool.sp_ctx"), patch(
         "fm_tool_core.process_fm_tool.sharepoint_file_exists", return_value=False
     ), patch(
         "fm_tool_core.process_fm_tool.sharepoint_upload"
     ), patch(
         "fm_tool_core.process_fm_tool.write_home_fields"
+    ), patch(
+        "fm_tool_core.process_fm_tool.excel_session"
     ), patch(
         "fm_tool_core.process_fm_tool.wait_for_cpu"
     ), patch(
@@ -112,17 +100,16 @@ def test_bid_webhook_called(monkeypatch, payload):
     payload["BID-Payload"] = "guid123"
     payload["item/In_dtInputData"][0]["NOTIFY_EMAIL"] = "notify@example.com"
     with patch(
-        "fm_tool_core.process_fm_tool.run_excel_macro", return_value=_FakeWorkbook()
-    ), patch(
-        "fm_tool_core.process_fm_tool.read_cell", side_effect=["HUMD_VAN", "ok"]
-    ), patch(
-        "fm_tool_core.process_fm_tool.sp_ctx"
-    ), patch(
+        "fm_tool_core.process_fm_tool.run_excel_macro",
+        return_value=["HUMD_VAN", "ok"],
+    ), patch("fm_tool_core.process_fm_tool.sp_ctx"), patch(
         "fm_tool_core.process_fm_tool.sharepoint_file_exists", return_value=False
     ), patch(
         "fm_tool_core.process_fm_tool.sharepoint_upload"
     ), patch(
         "fm_tool_core.process_fm_tool.write_home_fields"
+    ), patch(
+        "fm_tool_core.process_fm_tool.excel_session"
     ), patch(
         "fm_tool_core.process_fm_tool.wait_for_cpu"
     ), patch(
@@ -155,10 +142,7 @@ def test_bid_webhook_spaces_encoded(monkeypatch, payload):
     item["NEW_EXCEL_FILENAME"] = "dummy file.xlsm"
     with patch(
         "fm_tool_core.process_fm_tool.run_excel_macro",
-        return_value=_FakeWorkbook(),
-    ), patch(
-        "fm_tool_core.process_fm_tool.read_cell",
-        side_effect=["HUMD_VAN", "ok"],
+        return_value=["HUMD_VAN", "ok"],
     ), patch(
         "fm_tool_core.process_fm_tool.sp_ctx",
     ), patch(
@@ -168,6 +152,8 @@ def test_bid_webhook_spaces_encoded(monkeypatch, payload):
         "fm_tool_core.process_fm_tool.sharepoint_upload",
     ), patch(
         "fm_tool_core.process_fm_tool.write_home_fields",
+    ), patch(
+        "fm_tool_core.process_fm_tool.excel_session"
     ), patch(
         "fm_tool_core.process_fm_tool.wait_for_cpu",
     ), patch(
@@ -196,17 +182,16 @@ def test_bid_webhook_skipped(monkeypatch, payload, missing):
     else:
         monkeypatch.delenv("NOTIFY_EMAIL", raising=False)
     with patch(
-        "fm_tool_core.process_fm_tool.run_excel_macro", return_value=_FakeWorkbook()
-    ), patch(
-        "fm_tool_core.process_fm_tool.read_cell", side_effect=["HUMD_VAN", "ok"]
-    ), patch(
-        "fm_tool_core.process_fm_tool.sp_ctx"
-    ), patch(
+        "fm_tool_core.process_fm_tool.run_excel_macro",
+        return_value=["HUMD_VAN", "ok"],
+    ), patch("fm_tool_core.process_fm_tool.sp_ctx"), patch(
         "fm_tool_core.process_fm_tool.sharepoint_file_exists", return_value=False
     ), patch(
         "fm_tool_core.process_fm_tool.sharepoint_upload"
     ), patch(
         "fm_tool_core.process_fm_tool.write_home_fields"
+    ), patch(
+        "fm_tool_core.process_fm_tool.excel_session"
     ), patch(
         "fm_tool_core.process_fm_tool.wait_for_cpu"
     ), patch(
@@ -221,3 +206,116 @@ def test_bid_webhook_skipped(monkeypatch, payload, missing):
         core.run_flow(payload)
 
     webhook.assert_not_called()
+
+
+def test_smtp_connection_reused(monkeypatch):
+    import smtplib
+    from email.message import EmailMessage
+
+    from fm_tool_core import notification_utils as nu
+
+    sent = []
+    opened = []
+
+    class _FakeSMTP:
+        def __init__(self, *args, **kwargs):
+            opened.append(self)
+            self.drop_next = False
+
+        def starttls(self): ...
+
+        def login(self, *_a): ...
+
+        def quit(self): ...
+
+        def send_message(self, msg):
+            if self.drop_next:
+                raise smtplib.SMTPServerDisconnected("idle")
+            sent.append(msg)
+
+    monkeypatch.setattr(nu.smtplib, "SMTP", _FakeSMTP)
+    monkeypatch.setattr(nu, "_smtp", None)
+    monkeypatch.setattr(nu, "_smtp_key", None)
+    for var, val in {
+        "SMTP_SERVER": "smtp.example.com",
+        "SMTP_PORT": "587",
+        "SMTP_USERNAME": "u",
+        "SMTP_PASSWORD": "p",
+    }.items():
+        monkeypatch.setenv(var, val)
+
+    nu._send(EmailMessage())
+    nu._send(EmailMessage())
+    assert len(opened) == 1
+
+    opened[0].drop_next = True
+    nu._send(EmailMessage())
+    assert len(opened) == 2
+    assert len(sent) == 3
+
+
+def test_attachment_streamed(tmp_path):
+    from email import message_from_bytes, policy
+    from email.message import EmailMessage
+
+    from fm_tool_core import notification_utils as nu
+
+    data = bytes(range(256)) * 1000
+    path = tmp_path / "run.log"
+    path.write_bytes(data)
+
+    msg = EmailMessage()
+    msg.set_content("body")
+    nu._attach_file(msg, path)
+
+    parsed = message_from_bytes(msg.as_bytes(), policy=policy.default)
+    (att,) = parsed.iter_attachments()
+    assert att.get_filename() == "run.log"
+    assert att.get_content() == data
+    assert parsed.get_body(("plain",)).get_content().strip() == "body"
+
+
+def test_smtp_failures_trip_breaker(monkeypatch):
+    from email.message import EmailMessage
+
+    from fm_tool_core import notification_utils as nu
+
+    connects = []
+
+    def _refuse(*args, **kwargs):
+        connects.append(kwargs["timeout"])
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(nu.smtplib, "SMTP", _refuse)
+    monkeypatch.setattr(nu, "_smtp", None)
+    monkeypatch.setattr(nu, "_smtp_key", None)
+    monkeypatch.setattr(nu, "_smtp_fails", 0)
+    monkeypatch.setattr(nu, "_smtp_skip_until", 0.0)
+    monkeypatch.setenv("SMTP_SERVER", "smtp.example.com")
+    monkeypatch.setenv("SMTP_PORT", "587")
+    monkeypatch.delenv("SMTP_TIMEOUT", raising=False)
+
+    for _ in range(5):
+        nu._send(EmailMessage())
+
+    assert connects == [2.0] * nu._SMTP_MAX_FAILS
+
+
+def test_smtp_send_timeout_outlasts_connect(monkeypatch):
+    from fm_tool_core import notification_utils as nu
+
+    seen = {}
+
+    class _FakeSMTP:
+        def __init__(self, *args, timeout, **kwargs):
+            seen["connect"] = timeout
+            self.sock = MagicMock()
+
+    monkeypatch.setattr(nu.smtplib, "SMTP", _FakeSMTP)
+    monkeypatch.delenv("SMTP_TIMEOUT", raising=False)
+    monkeypatch.setenv("SMTP_SEND_TIMEOUT", "45")
+
+    smtp = nu._connect("smtp.example.com", 587, None, None)
+
+    assert seen["connect"] == 2.0
+    smtp.sock.settimeout.assert_called_once_with(45.0)
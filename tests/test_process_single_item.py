@@ -5,20 +5,11 @@ Mocks heavy external dependencies (Excel & SharePoint) so we can assert that:
   * Validation logic branches correctly
 """
 
-<<<<<<< HEAD
-from types import SimpleNamespace
-from unittest.mock import patch
-
-<<<<<<< HEAD
-import logging
-=======
->>>>>>> 0626e50 (Update VM with current version)
-=======
 import logging
-from types import SimpleNamespace
-from unittest.mock import ANY, patch
+import time
+from pathlib import Path
+from unittest.mock import ANY, MagicMock, patch
 
->>>>>>> refs/remotes/origin/main
 import pytest
 
 import fm_tool_core as core
@@ -31,14 +22,6 @@ def _fake_xlwings_macro(*args, **kwargs):  # noqa: D401
     return None
 
 
-class _FakeWorkbook:
-    sheets = [SimpleNamespace(range=lambda x: SimpleNamespace(value="HUMD_VAN"))]
-
-    def save(self): ...
-
-    def close(self): ...
-
-
 # ------------------------------------------------- #
 
 
@@ -78,64 +61,32 @@ def test_run_flow_success(payload, caplog):
     """All validations pass -> Out_boolWorkcompleted=True"""
     with caplog.at_level(logging.INFO, logger="fm_tool"), patch(
         "fm_tool_core.process_fm_tool.run_excel_macro",
-        return_value=_FakeWorkbook(),
-    ) as macro, patch(
-        "fm_tool_core.process_fm_tool.read_cell",
-        return_value="HUMD_VAN",
-    ), patch(
-        "fm_tool_core.process_fm_tool.sharepoint_upload"
+        return_value=["HUMD_VAN", "HUMD_VAN"],
+    ) as macro, patch("fm_tool_core.process_fm_tool.sharepoint_upload"), patch(
+        "fm_tool_core.process_fm_tool.wait_for_cpu"
     ), patch(
         "fm_tool_core.process_fm_tool.sharepoint_file_exists",
         return_value=False,
     ), patch(
         "fm_tool_core.process_fm_tool._fetch_bid_rows",
-<<<<<<< HEAD
-        return_value=bid_rows,
-    ), patch(
-<<<<<<< HEAD
-        "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
-        return_value={},
-    ), patch(
-=======
-<<<<<<< HEAD
->>>>>>> aa4e400 (resolve merge conflict)
-        "fm_tool_core.process_fm_tool.insert_bid_rows",
-    ):
-=======
-        "fm_tool_core.process_fm_tool.insert_bid_rows"
-    ), patch(
-        "fm_tool_core.process_fm_tool.write_named_cell"
-    ) as write_cell:
->>>>>>> 0626e50 (Update VM with current version)
-=======
     ) as fetch_mock, patch(
         "fm_tool_core.process_fm_tool._fetch_customer_ids",
         return_value=["i1", "i2"],
     ) as cid_mock, patch(
         "fm_tool_core.process_fm_tool.write_home_fields",
     ) as write_mock, patch(
+        "fm_tool_core.process_fm_tool.excel_session"
+    ), patch(
         "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
         return_value={"ADHOC_INFO1": "Origin (Live/Drop)"},
     ) as adhoc_mock, patch(
         "fm_tool_core.process_fm_tool.update_adhoc_headers",
     ) as upd_mock:
->>>>>>> refs/remotes/origin/main
         result = core.run_flow(payload)
     macro.assert_called_once()
     args_tuple = macro.call_args[0][1]
     assert len(args_tuple) == 4
     assert args_tuple[-1] == payload["BID-Payload"]
-<<<<<<< HEAD
-<<<<<<< HEAD
-=======
-    write_cell.assert_called_once()
-    assert write_cell.call_args[0] == (
-        macro.call_args[0][0],
-        "BID",
-        payload["BID-Payload"],
-    )
->>>>>>> 0626e50 (Update VM with current version)
-=======
     fetch_mock.assert_not_called()
     cid_mock.assert_called_once_with(payload["BID-Payload"], ANY)
     write_mock.assert_called_once_with(
@@ -144,149 +95,37 @@ def test_run_flow_success(payload, caplog):
         "ACME",
         ["i1", "i2"],
         {"ADHOC_INFO1": "Origin (Live/Drop)"},
+        session=ANY,
     )
     adhoc_mock.assert_called_once_with(payload["BID-Payload"], ANY)
     upd_mock.assert_called_once_with(
         ANY,
         {"ADHOC_INFO1": "Origin (Live/Drop)"},
         ANY,
+        session=ANY,
     )
     assert "Applying ad-hoc headers" in caplog.text
->>>>>>> refs/remotes/origin/main
     assert result["Out_boolWorkcompleted"] is True
     assert result["Out_strWorkExceptionMessage"] == ""
 
 
-<<<<<<< HEAD
-<<<<<<< HEAD
-def test_run_flow_inserts_bid_rows(payload, caplog):
-=======
-def test_run_flow_inserts_bid_rows(payload):
->>>>>>> 0626e50 (Update VM with current version)
-    """run_flow fetches BID rows and inserts them once"""
-
-    bid_rows = [
-        {"Lane ID": 1, "Orig Zip (5 or 3)": "11111", "Dest Zip (5 or 3)": "22222"}
-    ]
-    with patch(
-        "fm_tool_core.process_fm_tool.run_excel_macro",
-        return_value=_FakeWorkbook(),
-    ) as macro, patch(
-        "fm_tool_core.process_fm_tool.read_cell",
-        return_value="HUMD_VAN",
-    ), patch(
-        "fm_tool_core.process_fm_tool.sharepoint_upload"
-    ), patch(
-        "fm_tool_core.process_fm_tool.sharepoint_file_exists",
-        return_value=False,
-    ), patch(
-        "fm_tool_core.process_fm_tool._fetch_bid_rows",
-        return_value=bid_rows,
-    ), patch(
-        "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
-        return_value={"ADHOC_INFO1": "X1"},
-    ), patch(
-        "fm_tool_core.process_fm_tool.insert_bid_rows"
-<<<<<<< HEAD
-    ) as insert_mock:
-        with caplog.at_level(logging.INFO):
-            result = core.run_flow(payload)
-    insert_mock.assert_called_once()
-    assert insert_mock.call_args[0][3] == {"ADHOC_INFO1": "X1"}
-    macro.assert_called_once()
-    assert len(macro.call_args[0][1]) == 4
-    assert any("Fetched 1 BID rows in" in rec.message for rec in caplog.records)
-    assert any("Batch inserted 1 BID rows in" in rec.message for rec in caplog.records)
-    assert result["Out_boolWorkcompleted"] is True
-
-
-def test_run_flow_skips_insert_when_no_rows(payload, caplog):
-    """insert_bid_rows is not called when no BID rows fetched"""
-
-    with patch(
-        "fm_tool_core.process_fm_tool.run_excel_macro",
-        return_value=_FakeWorkbook(),
-    ) as macro, patch(
-        "fm_tool_core.process_fm_tool.read_cell",
-        return_value="HUMD_VAN",
-    ), patch(
-        "fm_tool_core.process_fm_tool.sharepoint_upload"
-    ), patch(
-        "fm_tool_core.process_fm_tool.sharepoint_file_exists",
-        return_value=False,
-    ), patch(
-        "fm_tool_core.process_fm_tool._fetch_bid_rows",
-        return_value=[],
-    ), patch(
-        "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
-        return_value={},
-    ), patch(
-        "fm_tool_core.process_fm_tool.insert_bid_rows"
-    ) as insert_mock:
-        with caplog.at_level(logging.INFO):
-            core.run_flow(payload)
-    insert_mock.assert_not_called()
-    macro.assert_called_once()
-    assert any("Fetched 0 BID rows in" in rec.message for rec in caplog.records)
-    assert not any("Batch inserted" in rec.message for rec in caplog.records)
-
-
-=======
-    ) as insert_mock, patch(
-        "fm_tool_core.process_fm_tool.write_named_cell"
-    ) as write_cell:
-        result = core.run_flow(payload)
-    insert_mock.assert_called_once()
-    macro.assert_called_once()
-    assert len(macro.call_args[0][1]) == 4
-    write_cell.assert_called_once()
-    assert write_cell.call_args[0] == (
-        macro.call_args[0][0],
-        "BID",
-        payload["BID-Payload"],
-    )
-    assert result["Out_boolWorkcompleted"] is True
-
-
->>>>>>> 0626e50 (Update VM with current version)
-=======
->>>>>>> refs/remotes/origin/main
 def test_run_flow_without_bid_payload(payload):
     """run_excel_macro only receives three args when BID-Payload missing"""
 
     payload.pop("BID-Payload")
-    with patch(
+    with patch("fm_tool_core.process_fm_tool.wait_for_cpu"), patch(
         "fm_tool_core.process_fm_tool.run_excel_macro",
-        return_value=_FakeWorkbook(),
-    ) as macro, patch(
-        "fm_tool_core.process_fm_tool.read_cell",
-        return_value="HUMD_VAN",
-    ), patch(
-        "fm_tool_core.process_fm_tool.sharepoint_upload"
-    ), patch(
+        return_value=["HUMD_VAN", "HUMD_VAN"],
+    ) as macro, patch("fm_tool_core.process_fm_tool.sharepoint_upload"), patch(
         "fm_tool_core.process_fm_tool.sharepoint_file_exists",
         return_value=False,
-<<<<<<< HEAD
-<<<<<<< HEAD
-    ):
-        result = core.run_flow(payload)
-    macro.assert_called_once()
-    assert len(macro.call_args[0][1]) == 3
-=======
-    ), patch(
-        "fm_tool_core.process_fm_tool.write_named_cell"
-    ) as write_cell:
-        result = core.run_flow(payload)
-    macro.assert_called_once()
-    assert len(macro.call_args[0][1]) == 3
-    write_cell.assert_not_called()
->>>>>>> 0626e50 (Update VM with current version)
-=======
     ), patch(
         "fm_tool_core.process_fm_tool._fetch_customer_ids"
     ) as cid_mock, patch(
         "fm_tool_core.process_fm_tool.write_home_fields",
     ) as write_mock, patch(
+        "fm_tool_core.process_fm_tool.excel_session"
+    ), patch(
         "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
     ) as adhoc_mock, patch(
         "fm_tool_core.process_fm_tool.update_adhoc_headers",
@@ -294,11 +133,10 @@ def test_run_flow_without_bid_payload(payload):
         result = core.run_flow(payload)
     macro.assert_called_once()
     assert len(macro.call_args[0][1]) == 3
-    write_mock.assert_called_once_with(ANY, None, "ACME", None, None)
+    write_mock.assert_called_once_with(ANY, None, "ACME", None, None, session=ANY)
     cid_mock.assert_not_called()
     adhoc_mock.assert_not_called()
     upd_mock.assert_not_called()
->>>>>>> refs/remotes/origin/main
     assert result["Out_boolWorkcompleted"] is True
 
 
@@ -306,15 +144,10 @@ def test_run_flow_nit_ignores_bid_payload(payload):
     """BID-Payload is ignored for NIT runs"""
 
     payload["item/In_dtInputData"][0]["FM_TOOL"] = "NIT"
-    with patch(
+    with patch("fm_tool_core.process_fm_tool.wait_for_cpu"), patch(
         "fm_tool_core.process_fm_tool.run_excel_macro",
-        return_value=_FakeWorkbook(),
-    ) as macro, patch(
-        "fm_tool_core.process_fm_tool.read_cell",
-        return_value="HUMD_VAN",
-    ), patch(
-        "fm_tool_core.process_fm_tool.sharepoint_upload"
-    ), patch(
+        return_value=["HUMD_VAN", "HUMD_VAN"],
+    ) as macro, patch("fm_tool_core.process_fm_tool.sharepoint_upload"), patch(
         "fm_tool_core.process_fm_tool.sharepoint_file_exists",
         return_value=False,
     ), patch(
@@ -322,6 +155,8 @@ def test_run_flow_nit_ignores_bid_payload(payload):
     ) as cid_mock, patch(
         "fm_tool_core.process_fm_tool.write_home_fields"
     ) as write_mock, patch(
+        "fm_tool_core.process_fm_tool.excel_session"
+    ), patch(
         "fm_tool_core.process_fm_tool._fetch_adhoc_headers"
     ) as adhoc_mock, patch(
         "fm_tool_core.process_fm_tool.update_adhoc_headers"
@@ -329,7 +164,7 @@ def test_run_flow_nit_ignores_bid_payload(payload):
         result = core.run_flow(payload)
     macro.assert_called_once()
     assert len(macro.call_args[0][1]) == 3
-    write_mock.assert_called_once_with(ANY, None, "ACME", None, None)
+    write_mock.assert_called_once_with(ANY, None, "ACME", None, None, session=ANY)
     cid_mock.assert_not_called()
     adhoc_mock.assert_not_called()
     upd_mock.assert_not_called()
@@ -341,12 +176,9 @@ def test_upload_strips_path_from_filename(payload):
 
     payload["item/In_boolEnableSharePointUpload"] = True
     payload["item/In_dtInputData"][0]["NEW_EXCEL_FILENAME"] = "x/y/dummy.xlsm"
-    with patch(
+    with patch("fm_tool_core.process_fm_tool.wait_for_cpu"), patch(
         "fm_tool_core.process_fm_tool.run_excel_macro",
-        return_value=_FakeWorkbook(),
-    ), patch(
-        "fm_tool_core.process_fm_tool.read_cell",
-        return_value="HUMD_VAN",
+        return_value=["HUMD_VAN", "HUMD_VAN"],
     ), patch(
         "fm_tool_core.process_fm_tool.sp_ctx",
         return_value=object(),
@@ -362,6 +194,8 @@ def test_upload_strips_path_from_filename(payload):
         return_value=["i1"],
     ), patch(
         "fm_tool_core.process_fm_tool.write_home_fields",
+    ), patch(
+        "fm_tool_core.process_fm_tool.excel_session"
     ), patch(
         "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
         return_value={},
@@ -388,3 +222,357 @@ def test_run_flow_raises_last_error_message(payload):
     assert result["Out_boolWorkcompleted"] is False
     msg = result["Out_strWorkExceptionMessage"]
     assert "second" in msg and "first" not in msg
+
+
+def test_uploads_run_on_pool_with_cached_context(payload):
+    """Row uploads go to the upload pool, which authenticates once per site"""
+
+    payload["item/In_boolEnableSharePointUpload"] = True
+    payload["item/In_intUploadParallelism"] = 1
+    second = dict(payload["item/In_dtInputData"][0])
+    second["NEW_EXCEL_FILENAME"] = "second.xlsm"
+    payload["item/In_dtInputData"].append(second)
+    with patch("fm_tool_core.process_fm_tool.wait_for_cpu"), patch(
+        "fm_tool_core.process_fm_tool.run_excel_macro",
+        return_value=["HUMD_VAN", "HUMD_VAN"],
+    ), patch(
+        "fm_tool_core.process_fm_tool.sp_ctx",
+        return_value=object(),
+    ) as ctx_mock, patch(
+        "fm_tool_core.process_fm_tool.sharepoint_file_exists",
+        return_value=False,
+    ), patch(
+        "fm_tool_core.process_fm_tool.sharepoint_upload"
+    ) as upload_mock, patch(
+        "fm_tool_core.process_fm_tool._fetch_customer_ids",
+        return_value=[],
+    ), patch(
+        "fm_tool_core.process_fm_tool.write_home_fields",
+    ), patch(
+        "fm_tool_core.process_fm_tool.excel_session"
+    ), patch(
+        "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
+        return_value={},
+    ), patch(
+        "fm_tool_core.process_fm_tool.update_adhoc_headers",
+    ):
+        result = core.run_flow(payload)
+    assert result["Out_boolWorkcompleted"] is True
+    assert upload_mock.call_count == 2
+    ctx_mock.assert_called_once()
+
+
+def test_pooled_upload_retries_and_fails_run(payload):
+    """A failing pooled upload is retried and the run reports failure"""
+
+    payload["item/In_boolEnableSharePointUpload"] = True
+    payload["item/In_intMaxRetry"] = 3
+    with patch("fm_tool_core.process_fm_tool.wait_for_cpu"), patch(
+        "fm_tool_core.process_fm_tool.run_excel_macro",
+        return_value=["HUMD_VAN", "HUMD_VAN"],
+    ), patch(
+        "fm_tool_core.process_fm_tool.sp_ctx",
+        return_value=object(),
+    ), patch(
+        "fm_tool_core.process_fm_tool.sharepoint_file_exists",
+        return_value=False,
+    ), patch(
+        "fm_tool_core.process_fm_tool.sharepoint_upload",
+        side_effect=RuntimeError("503 transient"),
+    ) as upload_mock, patch(
+        "fm_tool_core.process_fm_tool._fetch_customer_ids",
+        return_value=[],
+    ), patch(
+        "fm_tool_core.process_fm_tool.write_home_fields",
+    ), patch(
+        "fm_tool_core.process_fm_tool.excel_session"
+    ), patch(
+        "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
+        return_value={},
+    ), patch(
+        "fm_tool_core.process_fm_tool.update_adhoc_headers",
+    ), patch(
+        "fm_tool_core.process_fm_tool.time.sleep"
+    ):
+        result = core.run_flow(payload)
+    assert upload_mock.call_count == 3
+    assert result["Out_boolWorkcompleted"] is False
+    assert "503 transient" in result["Out_strWorkExceptionMessage"]
+
+
+def test_wait_for_cpu_backs_off_with_nonblocking_samples(monkeypatch):
+    """Only the first sample blocks; busy checks back off exponentially"""
+
+    from types import SimpleNamespace
+
+    from fm_tool_core import excel_utils
+    from fm_tool_core import process_fm_tool as mod
+
+    samples = iter([95.0, 90.0, 85.0, 10.0])
+    calls = []
+    ps = SimpleNamespace(
+        cpu_percent=lambda interval: calls.append(interval) or next(samples)
+    )
+    sleeps = []
+    monkeypatch.setattr(excel_utils, "psutil", ps)
+    monkeypatch.setattr(mod, "_cpu_last", None)
+    monkeypatch.setattr(mod, "_read_cpu_times", lambda: None)
+    monkeypatch.setattr(mod.time, "sleep", sleeps.append)
+
+    mod.wait_for_cpu(interval=1.0, backoff=3.0)
+
+    assert calls == [1.0, None, None, None]
+    assert sleeps == [1.0, 2.0, 3.0]
+
+    # straight after, the idle sample is reused without asking psutil
+    mod.wait_for_cpu(interval=1.0, backoff=3.0)
+    assert len(calls) == 4
+
+
+def test_direct_cpu_percent_from_counter_deltas(monkeypatch):
+    """Busy share is 1 - idle/total between consecutive counter reads"""
+
+    from fm_tool_core import process_fm_tool as mod
+
+    snaps = iter([(100.0, 200.0), (130.0, 300.0), (130.0, 300.0)])
+    monkeypatch.setattr(mod, "_read_cpu_times", lambda: next(snaps))
+    monkeypatch.setattr(mod, "_cpu_times_prev", None)
+    monkeypatch.setattr(mod.time, "sleep", lambda _s: None)
+
+    assert mod._direct_cpu_percent(0.2) == 70.0  # 30 idle of 100 ticks
+    assert mod._direct_cpu_percent(None) == 0.0  # no ticks elapsed
+
+
+def test_read_cpu_times_linux():
+    from fm_tool_core import process_fm_tool as mod
+
+    if not Path("/proc/stat").exists():
+        pytest.skip("no /proc/stat")
+    idle, total = mod._read_cpu_times()
+    assert 0 < idle <= total
+
+
+def test_fifo_sort_orders_by_timestamp():
+    """Rows sort by timestamp; unparsable ones keep their relative order"""
+
+    from fm_tool_core import process_fm_tool as mod
+
+    rows = [
+        {"QUEUE_TS": "bad", "id": 1},
+        {"QUEUE_TS": "2024-01-02T00:00:00Z", "id": 2},
+        {"QUEUE_TS": "also bad", "id": 3},
+        {"QUEUE_TS": "2024-01-01T00:00:00Z", "id": 4},
+    ]
+    assert [r["id"] for r in mod._fifo_sort(rows)] == [4, 2, 1, 3]
+
+    # the key comes from the first row; rows lacking it sort with the bad ones
+    rows[2] = {"id": 3}
+    assert [r["id"] for r in mod._fifo_sort(rows)] == [4, 2, 1, 3]
+
+
+def test_run_log_flushed_before_return(payload, tmp_path):
+    """Queued log records all reach the run's log file by the time we return"""
+
+    logs = tmp_path / "logs"
+    with patch(
+        "fm_tool_core.process_fm_tool.process_row",
+        side_effect=RuntimeError("boom"),
+    ), patch("fm_tool_core.process_fm_tool.log_dir", return_value=logs):
+        core.run_flow(payload)
+    (log_file,) = logs.glob("*.log")
+    text = log_file.read_text()
+    assert "FM Tool run" in text
+    assert "boom" in text
+    assert text.rstrip().endswith(str(log_file))
+
+
+def test_success_email_attaches_complete_log(payload, tmp_path):
+    """The log attached to the success email already holds SUCCESS"""
+
+    mod = "fm_tool_core.process_fm_tool"
+    logs = tmp_path / "logs"
+    seen = {}
+    emit = logging.FileHandler.emit
+
+    def _slow_emit(self, record):
+        # the run's listener lags behind the notification thread
+        if self.baseFilename.startswith(str(logs)):
+            time.sleep(0.1)
+        emit(self, record)
+
+    def _send(_to, _name, _url, path):
+        seen["text"] = Path(path).read_text()
+
+    payload["item/In_dtInputData"][0]["NOTIFY_EMAIL"] = "ops@example.com"
+    with patch(f"{mod}.process_row", return_value=None), patch(
+        f"{mod}.log_dir", return_value=logs
+    ), patch(f"{mod}.send_success_email", side_effect=_send), patch(
+        f"{mod}.send_bid_webhook"
+    ), patch.object(
+        logging.FileHandler, "emit", _slow_emit
+    ):
+        result = core.run_flow(payload)
+    assert result["Out_boolWorkcompleted"] is True
+    assert "SUCCESS" in seen["text"]
+
+
+def test_orphan_scan_skipped_between_good_rows(payload):
+    """Excel orphans are only hunted at start/end unless a row fails"""
+
+    rows = payload["item/In_dtInputData"]
+    rows.append(dict(rows[0]))
+    with patch(
+        "fm_tool_core.process_fm_tool.run_excel_macro",
+        return_value=["HUMD_VAN", "HUMD_VAN"],
+    ), patch(
+        "fm_tool_core.process_fm_tool._fetch_customer_ids",
+        return_value=[],
+    ), patch(
+        "fm_tool_core.process_fm_tool._fetch_adhoc_headers",
+        return_value={},
+    ), patch(
+        "fm_tool_core.process_fm_tool.write_home_fields",
+    ), patch(
+        "fm_tool_core.process_fm_tool.update_adhoc_headers",
+    ), patch(
+        "fm_tool_core.process_fm_tool.excel_session"
+    ), patch(
+        "fm_tool_core.process_fm_tool.wait_for_cpu"
+    ), patch(
+        "fm_tool_core.process_fm_tool.kill_orphan_excels"
+    ) as kill:
+        result = core.run_flow(payload)
+    assert result["Out_boolWorkcompleted"] is True
+    assert kill.call_count == 2
+
+
+def test_rows_run_in_parallel_when_requested(payload):
+    """In_intRowParallelism spreads rows over worker threads"""
+
+    import threading
+
+    rows = payload["item/In_dtInputData"]
+    rows.append(dict(rows[0], NEW_EXCEL_FILENAME="second.xlsm"))
+    payload["item/In_intRowParallelism"] = 2
+    barrier = threading.Barrier(2, timeout=5)
+    seen = []
+
+    def _row(row, *_args):
+        seen.append(threading.current_thread().name)
+        barrier.wait()  # both rows must be in flight together
+
+    mod = "fm_tool_core.process_fm_tool"
+    with patch(f"{mod}.process_row", side_effect=_row), patch(
+        f"{mod}._row_workers", return_value=2
+    ), patch(f"{mod}.kill_orphan_excels"):
+        result = core.run_flow(payload)
+    assert result["Out_boolWorkcompleted"] is True
+    assert len(set(seen)) == 2
+    assert all(name.startswith("row") for name in seen)
+
+
+def test_remote_exists_lists_folder_once(monkeypatch):
+    """Rows sharing a folder reuse one listing instead of probing each file"""
+
+    from fm_tool_core import process_fm_tool as mod
+
+    listed = []
+    monkeypatch.setattr(mod, "_sp_listing", {})
+    shared = {("site", "/NA"), ("site", "/gone")}
+    monkeypatch.setattr(mod, "_sp_shared", shared)
+    monkeypatch.setattr(
+        mod,
+        "sp_list_files",
+        lambda ctx, folder: listed.append(folder) or {"Old.xlsm"},
+    )
+    with patch("fm_tool_core.process_fm_tool.sharepoint_file_exists") as probe:
+        # SharePoint file names are case-insensitive
+        assert mod._remote_exists(None, "site", "/NA", "old.XLSM") is True
+        assert mod._remote_exists(None, "site", "/NA", "new.xlsm") is False
+    assert listed == ["/NA"]
+    probe.assert_not_called()
+
+    monkeypatch.setattr(mod, "sp_list_files", MagicMock(side_effect=OSError))
+    with patch(
+        "fm_tool_core.process_fm_tool.sharepoint_file_exists",
+        return_value=True,
+    ) as probe:
+        assert mod._remote_exists(None, "site", "/gone", "a.xlsm") is True
+    probe.assert_called_once_with(None, "/gone/a.xlsm")
+
+
+def test_remote_exists_probes_folder_used_by_one_row(monkeypatch):
+    """A folder only one row uploads to gets a probe, not a listing"""
+
+    from fm_tool_core import process_fm_tool as mod
+
+    site = "https://x/sites/a"
+    rows = [
+        {"CLIENT_DEST_SITE": site, "CLIENT_DEST_FOLDER_PATH": p}
+        for p in ("/NA", "NA", "/solo")
+    ]
+    shared = mod._shared_folders(rows)
+    assert shared == {(site, "/sites/a/NA")}
+
+    monkeypatch.setattr(mod, "_sp_listing", {})
+    monkeypatch.setattr(mod, "_sp_shared", shared)
+    lister = MagicMock(return_value=set())
+    monkeypatch.setattr(mod, "sp_list_files", lister)
+    with patch(
+        "fm_tool_core.process_fm_tool.sharepoint_file_exists",
+        return_value=False,
+    ) as probe:
+        assert not mod._remote_exists(None, site, "/sites/a/solo", "f")
+    probe.assert_called_once_with(None, "/sites/a/solo/f")
+    lister.assert_not_called()
+
+
+def test_sequential_rows_share_one_excel(payload, monkeypatch):
+    """The pre-macro sessions of all rows reuse one hidden Excel"""
+
+    from fm_tool_core import excel_utils
+
+    rows = payload["item/In_dtInputData"]
+    rows.append(dict(rows[0], NEW_EXCEL_FILENAME="second.xlsm"))
+    xw = MagicMock()
+    monkeypatch.setattr(excel_utils, "xw", xw)
+    monkeypatch.setattr(excel_utils, "pythoncom", MagicMock())
+    mod = "fm_tool_core.process_fm_tool"
+    ok = ["HUMD_VAN", "HUMD_VAN"]
+    with patch(f"{mod}.run_excel_macro", return_value=ok), patch(
+        f"{mod}._fetch_customer_ids", return_value=[]
+    ), patch(f"{mod}._fetch_adhoc_headers", return_value={}), patch(
+        f"{mod}.write_home_fields"
+    ), patch(
+        f"{mod}.update_adhoc_headers"
+    ), patch(
+        f"{mod}.wait_for_cpu"
+    ), patch(
+        f"{mod}.kill_orphan_excels"
+    ):
+        result = core.run_flow(payload)
+    assert result["Out_boolWorkcompleted"] is True
+    assert xw.App.call_count == 1
+    assert xw.App.return_value.books.open.call_count == 2
+    xw.App.return_value.kill.assert_called_once()
+
+
+def test_overwrite_mode_skips_existence_probe(monkeypatch, tmp_path):
+    """FM_OVERWRITE uploads straight away without asking SharePoint first"""
+
+    from fm_tool_core import process_fm_tool as mod
+
+    monkeypatch.setattr(mod, "ALWAYS_OVERWRITE", True)
+    row = {
+        "NEW_EXCEL_FILENAME": "dummy.xlsm",
+        "CLIENT_DEST_SITE": "https://example.sharepoint.com/sites/x",
+        "CLIENT_DEST_FOLDER_PATH": "/NA",
+    }
+    with patch(f"{mod.__name__}.sp_ctx"), patch(
+        f"{mod.__name__}._remote_exists"
+    ) as probe, patch(f"{mod.__name__}.sharepoint_upload") as upload:
+        mod._upload_row(row, tmp_path / "d.xlsm", logging.getLogger("t"))
+    probe.assert_not_called()
+    upload.assert_called_once_with(
+        ANY, "/sites/x/NA", "dummy.xlsm", tmp_path / "d.xlsm"
+    )
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock, create_autospec
 
 from fm_tool_core.exceptions import FlowError
 from fm_tool_core import sharepoint_utils
@@ -22,3 +22,59 @@ def test_sp_upload_client_request_exception(tmp_path):
         sharepoint_utils.sp_upload(ctx, "/folder", "f.txt", local)
     assert not exc.value.work_completed
     assert "SharePoint upload failed" in str(exc.value)
+
+
+def test_sp_list_files_returns_names():
+    ctx = MagicMock()
+    files = ctx.web.get_folder_by_server_relative_url.return_value.files
+    files.__iter__.return_value = [MagicMock(), MagicMock()]
+    for f, name in zip(files.__iter__.return_value, ("a.xlsm", "b.xlsm")):
+        f.name = name
+    assert sharepoint_utils.sp_list_files(ctx, "/NA") == {"a.xlsm", "b.xlsm"}
+    ctx.web.get_folder_by_server_relative_url.assert_called_once_with("/NA")
+
+
+@pytest.mark.parametrize("data", [b"", b"xlsm" * 1000])
+def test_sp_upload_sends_file_contents(tmp_path, data):
+    local = tmp_path / "f.xlsm"
+    local.write_bytes(data)
+    ctx = MagicMock()
+    tgt = ctx.web.get_folder_by_server_relative_url.return_value
+    sent = []
+
+    def _upload(name, content):
+        sent.append((name, bytes(content)))  # read while the file is open
+        return MagicMock()
+
+    tgt.upload_file.side_effect = _upload
+    sharepoint_utils.sp_upload(ctx, "/folder", "dest.xlsm", local)
+    assert sent == [("dest.xlsm", data)]
+
+
+def test_sp_upload_large_file_uses_upload_session(tmp_path, monkeypatch):
+    local = tmp_path / "f.xlsm"
+    local.write_bytes(b"x" * 20)
+    monkeypatch.setattr(sharepoint_utils, "SP_CHUNK", 8)
+    ctx = MagicMock()
+    tgt = ctx.web.get_folder_by_server_relative_url.return_value
+    sharepoint_utils.sp_upload(ctx, "/folder", "dest.xlsm", local)
+    session = tgt.files.create_upload_session
+    session.assert_called_once_with(ANY, 8, file_name="dest.xlsm")
+    session.return_value.execute_query.assert_called_once_with()
+    tgt.upload_file.assert_not_called()
+
+
+def test_upload_session_call_matches_pinned_office365(tmp_path, monkeypatch):
+    # binds sp_upload's call against the real signature of the pinned
+    # office365-rest-python-client (file, chunk_size, ..., file_name)
+    files = pytest.importorskip("office365.sharepoint.files.collection")
+    local = tmp_path / "f.xlsm"
+    local.write_bytes(b"x" * 20)
+    monkeypatch.setattr(sharepoint_utils, "SP_CHUNK", 8)
+    ctx = MagicMock()
+    tgt = ctx.web.get_folder_by_server_relative_url.return_value
+    tgt.files = create_autospec(files.FileCollection, instance=True)
+    sharepoint_utils.sp_upload(ctx, "/folder", "dest.xlsm", local)
+    tgt.files.create_upload_session.assert_called_once_with(
+        file=ANY, chunk_size=8, file_name="dest.xlsm"
+    )
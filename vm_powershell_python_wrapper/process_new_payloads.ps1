@@ -21,6 +21,7 @@ $LastCleanupDir = Join-Path $TasksRoot 'LastCleanup'
 
 $PythonExe  = 'C:\Tools\Python311\python.exe'
 $Wrapper    = Join-Path $TasksRoot 'PowerShellWrapper\run_payload.py'
+$PackageDir = Join-Path $TasksRoot 'PythonScript\fm-tool-processor'
 
 $EndFlowUrl   = 'https://prod-121.westus.logic.azure.com:443/workflows/33a3296f16a64204b5fe524c5a069d77/triggers/manual/paths/invoke?api-version=2016-06-01&sp=%2Ftriggers%2Fmanual%2Frun&sv=1.0&sig=ynqKDxuJmE0eWwcBeQ59IefV4vT-9uOPHI2_tl40tDY'
 $StartFlowUrl = 'https://prod-33.westus.logic.azure.com:443/workflows/f764275c7b974d62ad48d6a89c078127/triggers/manual/paths/invoke?api-version=2016-06-01&sp=%2Ftriggers%2Fmanual%2Frun&sv=1.0&sig=nignRkxQXZ5TndTCMOZU_Fv5mUEHjRtCxhV9uH1y2JA'
@@ -185,6 +186,12 @@ if ($StartFlowUrl -and $queueFiles.Count -gt 0) {
     } catch { Write-Warning "Failed to trigger startup flow: $_" }
 }
 
+# ---------------- Pre-compile fm_tool_core ----------------
+# Every payload starts a fresh python.exe; compiling once here lets those
+# starts load cached bytecode instead of re-parsing the package sources.
+& $PythonExe -m compileall -q (Join-Path $PackageDir 'fm_tool_core') | Out-Null
+if ($LASTEXITCODE -ne 0) { Write-Warning "compileall failed (exit $LASTEXITCODE)" }
+
 # ---------------- Main processing loop ----------------
 while ((Get-ChildItem $InputDir -Filter 'fm_payload_*.json' -File).Count -gt 0) {
 